@@ -0,0 +1,417 @@
+"""
+AicodeX benchmark suite
+Times the config, hotkey, overlay, template, clipboard history, snippet index and checksum hot paths without a
+display, GPU or network, and compares the results to a JSON baseline
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import stubs
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+FORMAT_VERSION = 1
+
+# Library sizes for the config and overlay benchmarks
+SNIPPET_COUNTS = (10, 1000, 10000, 100000)
+QUICK_SNIPPET_COUNTS = (10, 1000)
+# File sizes in MiB for the checksum benchmark, the larger one is mmapped
+CHECKSUM_SIZES = (1, 64)
+QUICK_CHECKSUM_SIZES = (1, 16)
+
+
+class Suite:
+    """Collects benchmark results and the settings they ran with"""
+
+    def __init__(self, workdir, repeat=5, quick=False, tk='stub'):
+        """Initialize an empty suite writing scratch files to workdir"""
+        self.workdir = workdir
+        self.repeat = repeat
+        self.quick = quick
+        self.tk = tk
+        self.results = {}
+
+    @property
+    def snippet_counts(self):
+        return QUICK_SNIPPET_COUNTS if self.quick else SNIPPET_COUNTS
+
+    def record(self, name, value, unit, better='lower'):
+        """Record one result"""
+        self.results[name] = {'value': round(value, 3), 'unit': unit, 'better': better}
+
+    def time(self, fn, repeat=None, setup=None):
+        """Return the median wall time of fn() in seconds"""
+        samples = []
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        return statistics.median(samples)
+
+    def config_file(self, count):
+        """Write a config file with count snippets and return its path"""
+        path = os.path.join(self.workdir, f"settings_{count}.json")
+        if not os.path.exists(path):
+            from config import Config
+            settings = Config(os.path.join(self.workdir, "missing.json")).get_default_settings()
+            settings['snippets'] = [
+                {'name': f"Snippet {i} {WORDS[i % len(WORDS)]}",
+                 'code': f"def snippet_{i}(value):\n    return value * {i}\n"}
+                for i in range(count)
+            ]
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(settings, f)
+        return path
+
+
+WORDS = ("request", "handler", "parser", "widget", "client", "format", "render", "cache")
+
+
+def bench_config(suite):
+    """Config.load with and without the compiled cache, Config.save and get"""
+    from config import Config
+    for count in suite.snippet_counts:
+        path = suite.config_file(count)
+        repeat = 3 if count >= 100000 else suite.repeat
+        suite.record(f"config.load[{count}]", suite.time(lambda: Config(path), repeat) * 1000, 'ms')
+
+        warm = Config(path, use_cache=True)
+        warm.refresh_cache()
+        warm.cache_thread.join()
+        suite.record(f"config.load_cached[{count}]",
+                     suite.time(lambda: Config(path, use_cache=True), repeat) * 1000, 'ms')
+
+        config = Config(path)
+        values = iter(range(1, 1000000))
+        suite.record(f"config.save[{count}]", suite.time(
+            config.save, repeat, setup=lambda: config.set('window.opacity', next(values) / 1000000)
+        ) * 1000, 'ms')
+
+    config = Config(suite.config_file(suite.snippet_counts[-1]))
+    lookups = 100000
+    def lookup():
+        get = config.get
+        for _ in range(lookups):
+            get('window.opacity')
+    suite.record("config.get_dotted", suite.time(lookup) / lookups * 1e6, 'us')
+
+
+def bench_hotkeys(suite):
+    """Hook cost per typed key and key-down to handler latency of a hotkey"""
+    from config import Config
+    from hotkeys import HotkeyManager
+    keyboard = sys.modules['keyboard']
+    manager = HotkeyManager(Config(os.path.join(suite.workdir, "missing.json")))
+    handled = []
+    manager.set_toggle_callback(lambda: handled.append(time.perf_counter()))
+    manager.register_all()
+    try:
+        keys = "the quick brown fox jumps over the lazy dog"
+        def type_text():
+            for key in keys:
+                keyboard.tap('space' if key == ' ' else key)
+        suite.record("hotkey.keystroke", suite.time(type_text) / len(keys) * 1e6, 'us')
+
+        latencies = []
+        for _ in range(200 if suite.quick else 2000):
+            keyboard.press('ctrl')
+            keyboard.press('shift')
+            started = time.perf_counter()
+            keyboard.press('o')
+            manager.dispatcher.drain()
+            latencies.append(handled[-1] - started)
+            keyboard.release('o')
+            keyboard.release('shift')
+            keyboard.release('ctrl')
+        latencies.sort()
+        suite.record("hotkey.dispatch_p50", latencies[len(latencies) // 2] * 1e6, 'us')
+        suite.record("hotkey.dispatch_p99", latencies[int(len(latencies) * 0.99)] * 1e6, 'us')
+    finally:
+        manager.unregister_all()
+
+
+def bench_overlay(suite):
+    """OverlayWindow construction, and rebuilding its widgets after a low-memory release"""
+    from config import Config
+    from hotkeys import HotkeyManager
+    from overlay import OverlayWindow
+    for count in suite.snippet_counts:
+        config = Config(suite.config_file(count))
+        windows = []
+        def construct():
+            windows.append(OverlayWindow(config, HotkeyManager(config)))
+        def close():
+            while windows:
+                overlay = windows.pop()
+                overlay.tasks.shutdown()
+                overlay.formatter.close()
+                if suite.tk == 'real':
+                    overlay.root.destroy()
+        try:
+            suite.record(f"overlay.construct[{count}]", suite.time(construct, setup=close) * 1000, 'ms')
+        finally:
+            close()
+
+        overlay = OverlayWindow(config, HotkeyManager(config))
+        windows.append(overlay)
+        def release():
+            overlay.visible = False
+            overlay.release_widgets()
+        try:
+            suite.record(f"overlay.rebuild[{count}]", suite.time(overlay.rebuild_widgets, setup=release) * 1000, 'ms')
+        finally:
+            close()
+
+
+def bench_templates(suite):
+    """Snippet template compile and render times for small and large bodies"""
+    from snippet_template import Template, standard_variables
+    variables = standard_variables(clipboard=lambda: "clipboard text", filename=lambda: "module.py")
+    sources = {
+        'small': "def ${1:name}(${2:args}):\n    \"\"\"${3:Docstring} $DATE\"\"\"\n    ${0:pass}\n",
+        'large': "".join(f"value_{i} = ${{{i % 50}:default_{i}}}  # $FILENAME $CLIPBOARD\n" for i in range(500)),
+    }
+    renders = 1000
+    for size, source in sources.items():
+        suite.record(f"template.compile[{size}]", suite.time(lambda: Template(source)) * 1000, 'ms')
+        template = Template(source)
+        def render():
+            for _ in range(renders):
+                template.render(variables=variables)
+        suite.record(f"template.render[{size}]", suite.time(render) / renders * 1e6, 'us')
+
+
+def bench_history(suite):
+    """Clipboard history adds with the log on disk and filtering a full history"""
+    from clipboard_history import ClipboardHistory
+    path = os.path.join(suite.workdir, "clipboard_history")
+    history = ClipboardHistory(path)
+    texts = [f"{WORDS[i % len(WORDS)]} {i}\n" + "    line of copied code\n" * (i % 200) for i in range(2000)]
+    try:
+        suite.record("history.add", suite.time(lambda: [history.add(text) for text in texts], 1) / len(texts) * 1e6, 'us')
+        suite.record("history.filter", suite.time(lambda: history.search("handler 1")) * 1000, 'ms')
+    finally:
+        history.close()
+
+
+def bench_index(suite):
+    """Snippet search before and after the worker-built postings are adopted"""
+    from snippet_index import SnippetIndex
+    for count in suite.snippet_counts:
+        snippets = [{'name': f"Snippet {i} {WORDS[i % len(WORDS)]}",
+                     'code': f"def snippet_{i}(value):\n    return value * {i}\n"}
+                    for i in range(count)]
+        built = []
+        def start():
+            index = SnippetIndex(snippets)
+            built[:] = [index, index.start_build()]
+        suite.record(f"index.first_search[{count}]",
+                     suite.time(lambda: built[0].search("handler"), setup=start) * 1000, 'ms')
+        suite.record(f"index.build[{count}]",
+                     suite.time(lambda: built[0].build_postings(built[1]), setup=start) * 1000, 'ms')
+
+        index, ids = built
+        index.adopt_postings(ids, index.build_postings(ids))
+        searches = iter(range(1000000))
+        suite.record(f"index.search[{count}]",
+                     suite.time(lambda: index.search(f"handler {next(searches) % 10}")) * 1000, 'ms')
+
+
+def bench_checksum(suite):
+    """verify_checksum throughput on fresh files and lookups of cached results"""
+    from utils.checksum import ChecksumCache
+    from utils.handbrake_checker import HandBrakeChecker
+    sizes = QUICK_CHECKSUM_SIZES if suite.quick else CHECKSUM_SIZES
+    for size in sizes:
+        path = os.path.join(suite.workdir, f"installer_{size}.bin")
+        block = os.urandom(1024 * 1024)
+        with open(path, 'wb') as f:
+            for _ in range(size):
+                f.write(block)
+        # Files modified within the last moments are always rehashed
+        past = time.time() - 60
+        os.utime(path, (past, past))
+
+        checker = HandBrakeChecker()
+        def reset():
+            checker.checksum_cache = ChecksumCache()
+        seconds = suite.time(lambda: checker.verify_checksum(path), setup=reset)
+        suite.record(f"checksum.verify[{size}MB]", size / seconds, 'MB/s', better='higher')
+
+    lookups = 1000
+    def cached():
+        for _ in range(lookups):
+            checker.verify_checksum(path)
+    suite.record("checksum.verify_cached", suite.time(cached) / lookups * 1e6, 'us')
+
+
+BENCHMARKS = {
+    'config': bench_config,
+    'hotkeys': bench_hotkeys,
+    'overlay': bench_overlay,
+    'templates': bench_templates,
+    'history': bench_history,
+    'index': bench_index,
+    'checksum': bench_checksum,
+}
+
+
+def compare(baseline, results, threshold):
+    """Compare results to a baseline
+
+    Returns a list of (name, baseline value, current value, slowdown)
+    rows and the names that regressed by more than ``threshold``.  The
+    slowdown is the relative change in the bad direction, so 0.5 means
+    50% slower, or 50% less throughput for higher-is-better results.
+    """
+    rows = []
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, None, result['value'], None))
+            continue
+        before, after = base['value'], result['value']
+        if result['better'] == 'higher':
+            before, after = after, before
+        if before > 0:
+            slowdown = after / before - 1
+        else:
+            # A value rounded to zero can only stay level or get worse
+            slowdown = float('inf') if after > 0 else 0.0
+        rows.append((name, before, after, slowdown))
+        if slowdown > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_results(results, rows=None):
+    """Format results, and optionally a comparison, as a table"""
+    width = max([len(name) for name in results] + [len("benchmark")])
+    lines = [f"{'benchmark':<{width}}  {'value':>12}  unit"]
+    for name, result in sorted(results.items()):
+        lines.append(f"{name:<{width}}  {result['value']:>12.3f}  {result['unit']}")
+    if rows is not None:
+        lines.append("")
+        lines.append(f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  change")
+        for name, before, after, slowdown in rows:
+            if before is None:
+                lines.append(f"{name:<{width}}  {'-':>12}  {after:>12.3f}  new")
+            else:
+                lines.append(f"{name:<{width}}  {before:>12.3f}  {after:>12.3f}  {slowdown:+.1%}")
+    return "\n".join(lines)
+
+
+def load_results(path):
+    """Read a saved run, its results and the settings it ran with"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path} has an unsupported format")
+    return data
+
+
+def settings_mismatch(data, quick, tk):
+    """Describe how a saved run's settings differ from this run's, or return None"""
+    differences = []
+    if data.get('quick') != quick:
+        differences.append(f"quick={data.get('quick')} vs {quick}")
+    if data.get('tk') != tk:
+        differences.append(f"tk={data.get('tk')} vs {tk}")
+    return ", ".join(differences) or None
+
+
+def save_results(path, suite):
+    """Write the results of a run with the settings it ran with"""
+    data = {
+        'format': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tk': suite.tk,
+        'quick': suite.quick,
+        'results': suite.results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    """Run the benchmarks and report, save or compare the results"""
+    parser = argparse.ArgumentParser(description="AicodeX benchmark suite")
+    parser.add_argument("--only", type=str, help=f"Comma-separated groups to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--quick", action="store_true", help="Use small libraries and files")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, the median is kept")
+    parser.add_argument("--tk", choices=('auto', 'stub', 'real'), default='auto',
+                        help="Real Tk needs a display such as Xvfb; auto uses it when DISPLAY is set")
+    parser.add_argument("--output", type=str, help="Write the results to this JSON file")
+    parser.add_argument("--save-baseline", nargs='?', const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Write the results as the baseline")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="Compare against a saved baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before --compare fails (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    groups = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [group for group in groups if group not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark group: {', '.join(unknown)}")
+
+    tk = args.tk
+    if tk == 'auto':
+        tk = 'real' if os.environ.get('DISPLAY') else 'stub'
+    # Check the baseline before spending the time to run the suite
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_results(args.compare)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read baseline {args.compare}: {e}")
+        mismatch = settings_mismatch(baseline, args.quick, tk)
+        if mismatch:
+            parser.error(f"baseline {args.compare} ran with different settings ({mismatch})")
+
+    # The real keyboard module would hook the OS, so it is always simulated
+    stubs.install(stub_tk=tk == 'stub')
+
+    with tempfile.TemporaryDirectory(prefix="aicodex-bench-") as workdir:
+        suite = Suite(workdir, repeat=args.repeat, quick=args.quick, tk=tk)
+        for group in groups:
+            started = time.perf_counter()
+            # Application progress messages would swamp the report
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                BENCHMARKS[group](suite)
+            print(f"{group}: {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    rows = regressions = None
+    if baseline is not None:
+        rows, regressions = compare(baseline['results'], suite.results, args.threshold)
+    print(format_results(suite.results, rows))
+
+    if args.output:
+        save_results(args.output, suite)
+    if args.save_baseline:
+        save_results(args.save_baseline, suite)
+        print(f"Baseline saved to {args.save_baseline}")
+    if regressions:
+        print(f"Regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
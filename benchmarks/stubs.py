@@ -0,0 +1,308 @@
+"""
+Headless stand-ins used by the AicodeX benchmarks
+A simulated keyboard backend and a stub Tk that builds no real widgets
+"""
+
+import itertools
+import sys
+import types
+
+
+class KeyboardEvent:
+    """Key event with the fields HotkeyManager reads"""
+
+    def __init__(self, event_type, name, scan_code=None):
+        self.event_type = event_type
+        self.name = name
+        self.scan_code = scan_code
+
+
+def keyboard_module():
+    """Return a module with the parts of ``keyboard`` AicodeX uses
+
+    ``hook`` stores the callback instead of installing an OS hook, and
+    ``press``/``release``/``tap`` feed events to it synchronously, so a
+    benchmark drives the hook thread's code path from its own thread.
+    Keystrokes AicodeX sends are counted in ``sent``.  Scan codes are
+    handed out per key name as they are first seen.
+    """
+    module = types.ModuleType('keyboard')
+    module.KEY_DOWN = 'down'
+    module.KEY_UP = 'up'
+    module.hooks = []
+    module.sent = []
+    scan_codes = {}
+
+    def key_to_scan_codes(name):
+        return (scan_codes.setdefault(name.lower(), len(scan_codes) + 1),)
+
+    def hook(callback):
+        module.hooks.append(callback)
+        return callback
+
+    def unhook(callback):
+        module.hooks.remove(callback)
+
+    def emit(event_type, name):
+        event = KeyboardEvent(event_type, name, key_to_scan_codes(name)[0])
+        for callback in module.hooks:
+            callback(event)
+
+    def press(name):
+        emit(module.KEY_DOWN, name)
+
+    def release(name):
+        emit(module.KEY_UP, name)
+
+    def tap(name):
+        press(name)
+        release(name)
+
+    def send(hotkey):
+        module.sent.append(hotkey)
+
+    def is_pressed(name):
+        return False
+
+    for function in (hook, unhook, press, release, tap, send, is_pressed, key_to_scan_codes):
+        setattr(module, function.__name__, function)
+    return module
+
+
+class TclError(Exception):
+    """Stub of tkinter.TclError"""
+
+
+_names = itertools.count(1)
+
+
+class Widget:
+    """Stub widget accepting any geometry, binding or configure call
+
+    Bound callbacks are kept in ``bindings`` by event sequence, so tests
+    can fire them.
+    """
+
+    def __init__(self, master=None, *args, **options):
+        self.master = master
+        self.options = dict(options)
+        self.bindings = {}
+        self._name = f"{getattr(master, '_name', '')}.!{type(self).__name__.lower()}{next(_names)}"
+
+    def __str__(self):
+        return self._name
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name.startswith('winfo_'):
+            return lambda *args, **kwargs: 0
+        return _noop
+
+    def cget(self, key):
+        return self.options.get(key, '')
+
+    def configure(self, *args, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def bind(self, sequence=None, func=None, add=None):
+        self.bindings[sequence] = func
+        return f"bind{next(_names)}"
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class Tk(Widget):
+    """Stub root window whose timers are recorded but never run"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(None)
+        self._name = '.'
+        self.timers = {}
+        self.idle = []
+        self.window_state = 'normal'
+
+    def after(self, ms, func=None, *args):
+        timer = f"after#{next(_names)}"
+        self.timers[timer] = (ms, func, args)
+        return timer
+
+    def after_idle(self, func, *args):
+        self.idle.append((func, args))
+        return self.after(0, func, *args)
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def state(self):
+        return self.window_state
+
+    def withdraw(self):
+        self.window_state = 'withdrawn'
+
+    def deiconify(self):
+        self.window_state = 'normal'
+
+    def clipboard_get(self):
+        raise TclError("clipboard is empty")
+
+
+class Toplevel(Tk):
+    """Stub secondary window"""
+
+
+class Notebook(Widget):
+    """Stub notebook that tracks its tabs and selection"""
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self._tabs = []
+        self._selected = ''
+
+    def add(self, child, **options):
+        self._tabs.append(str(child))
+        if not self._selected:
+            self._selected = str(child)
+
+    def tabs(self):
+        return tuple(self._tabs)
+
+    def select(self, tab_id=None):
+        if tab_id is None:
+            return self._selected
+        self._selected = str(tab_id)
+
+
+class Listbox(Widget):
+    """Stub listbox holding its rows"""
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.rows = []
+        self.selection = ()
+
+    def insert(self, index, *items):
+        self.rows.extend(items)
+
+    def delete(self, first, last=None):
+        self.rows = []
+
+    def size(self):
+        return len(self.rows)
+
+    def curselection(self):
+        return self.selection
+
+    def selection_set(self, index):
+        self.selection = (index,)
+
+    def selection_clear(self, first, last=None):
+        self.selection = ()
+
+
+class Variable:
+    """Stub Tk variable with write traces"""
+
+    default = ''
+
+    def __init__(self, master=None, value=None, name=None):
+        self.value = self.default if value is None else value
+        self.traces = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in self.traces:
+            callback('', '', 'write')
+
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+        return f"trace{len(self.traces)}"
+
+
+class StringVar(Variable):
+    default = ''
+
+
+class IntVar(Variable):
+    default = 0
+
+
+class DoubleVar(Variable):
+    default = 0.0
+
+
+class BooleanVar(Variable):
+    default = False
+
+
+class Font:
+    """Stub font with fixed metrics"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def metrics(self, option=None):
+        metrics = {'ascent': 12, 'descent': 3, 'linespace': 15, 'fixed': 0}
+        return metrics if option is None else metrics[option]
+
+    def measure(self, text):
+        return 7 * len(text)
+
+
+def _module(name, **attributes):
+    """Create a stub module that makes up widgets and constants on demand"""
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+
+    def __getattr__(attribute):
+        if attribute.startswith('__'):
+            raise AttributeError(attribute)
+        if attribute.isupper():
+            value = attribute.lower()
+        else:
+            value = type(attribute, (Widget,), {})
+        setattr(module, attribute, value)
+        return value
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+def tk_modules():
+    """Return stub modules for tkinter and the submodules AicodeX imports"""
+    widgets = dict(Widget=Widget, Tk=Tk, Toplevel=Toplevel, Listbox=Listbox, TclError=TclError,
+                   Variable=Variable, StringVar=StringVar, IntVar=IntVar,
+                   DoubleVar=DoubleVar, BooleanVar=BooleanVar)
+    tkinter = _module('tkinter', **widgets)
+    ttk = _module('tkinter.ttk', Notebook=Notebook)
+    scrolledtext = _module('tkinter.scrolledtext')
+    font = _module('tkinter.font', Font=Font, nametofont=lambda name, root=None: Font())
+    messagebox = _module('tkinter.messagebox')
+    tkinter.ttk, tkinter.scrolledtext, tkinter.font, tkinter.messagebox = ttk, scrolledtext, font, messagebox
+    return {
+        'tkinter': tkinter,
+        'tkinter.ttk': ttk,
+        'tkinter.scrolledtext': scrolledtext,
+        'tkinter.font': font,
+        'tkinter.messagebox': messagebox,
+    }
+
+
+def install(stub_tk=True):
+    """Put the simulated keyboard, and optionally the stub Tk, in sys.modules
+
+    Must run before hotkeys or overlay are imported.  Returns the
+    keyboard module.
+    """
+    keyboard = keyboard_module()
+    sys.modules['keyboard'] = keyboard
+    if stub_tk:
+        sys.modules.update(tk_modules())
+    return keyboard
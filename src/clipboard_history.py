@@ -0,0 +1,283 @@
+"""
+Clipboard history for AicodeX
+Byte-capped ring buffer of copied text with deduplication, compression and an append-only log
+"""
+
+import hashlib
+import os
+import struct
+import time
+import zlib
+from collections import OrderedDict
+
+# Record header: data length, data CRC32, kind, content digest, time, compressed flag
+HEADER = struct.Struct('<IIB16sdB')
+ADD = 1
+REMOVE = 2
+
+SEGMENT_SUFFIX = '.log'
+
+
+class Entry:
+    """One history item, stored as UTF-8 or zlib-compressed UTF-8"""
+
+    __slots__ = ('digest', 'data', 'compressed', 'time', 'head', 'segment')
+
+    def __init__(self, digest, data, compressed, when, head, segment=None):
+        self.digest = digest
+        self.data = data
+        self.compressed = compressed
+        self.time = when
+        self.head = head
+        self.segment = segment
+
+    @property
+    def size(self):
+        """Approximate bytes this entry counts against the history's cap"""
+        return len(self.data) + len(self.head)
+
+    def text(self):
+        """Return the entry's text"""
+        data = zlib.decompress(self.data) if self.compressed else self.data
+        return data.decode('utf-8')
+
+    def label(self, width=80):
+        """Return the first non-blank line, shortened to width characters"""
+        for line in self.head.splitlines():
+            line = line.strip()
+            if line:
+                return line if len(line) <= width else line[:width - 1] + "…"
+        return ""
+
+
+class ClipboardHistory:
+    """Clipboard texts, newest last, capped by their total stored size
+
+    Entries are keyed by a hash of their text, so copying something that
+    is already in the history moves it to the newest position instead of
+    storing it twice.  Texts of ``compress_threshold`` bytes or more are
+    kept zlib-compressed.  When the stored bytes exceed ``max_bytes`` the
+    oldest entries are dropped, ring-buffer style; a single text larger
+    than ``max_entry_bytes`` is not recorded at all.  Filtering matches
+    the first ``HEAD_CHARS`` characters of each entry, which are kept
+    uncompressed, so it never has to decompress anything.
+
+    With a ``path`` the history is saved as a directory of append-only
+    log segments.  Every add or removal appends one record to the newest
+    segment and nothing is ever rewritten: a full segment is closed and
+    a new one started, and the oldest segment is deleted once all its
+    entries have been dropped or copied again.  Records carry a CRC, so
+    a record torn by a crash is cut off when the log is replayed.
+    """
+
+    # Characters at the start of each entry kept for labels and filtering
+    HEAD_CHARS = 512
+
+    def __init__(self, path=None, max_bytes=4 * 1024 * 1024, max_entry_bytes=1024 * 1024,
+                 compress_threshold=2048, segment_bytes=None):
+        """Initialize the history, replaying the log in path when given"""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.compress_threshold = compress_threshold
+        self.segment_bytes = segment_bytes or max(64 * 1024, max_bytes // 4)
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.segments = OrderedDict()
+        self.segment = None
+        self.log = None
+        if path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, text, when=None):
+        """Record a copied text and return its entry, or None if it is not kept"""
+        if not text:
+            return None
+        data = text.encode('utf-8')
+        if len(data) > self.max_entry_bytes:
+            return None
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        existing = self.entries.get(digest)
+        if existing is not None and next(reversed(self.entries)) == digest:
+            return existing
+
+        compressed = False
+        if len(data) >= self.compress_threshold:
+            packed = zlib.compress(data)
+            if len(packed) < len(data):
+                data, compressed = packed, True
+        entry = Entry(digest, data, compressed, time.time() if when is None else when,
+                      text[:self.HEAD_CHARS])
+        self._write(ADD, entry)
+        self._insert(entry)
+        self._trim()
+        return entry
+
+    def remove(self, digest):
+        """Drop an entry by digest"""
+        entry = self.entries.get(digest)
+        if entry is None:
+            return
+        self._write(REMOVE, entry)
+        self._discard(digest)
+        self._drop_segments()
+
+    def clear(self):
+        """Drop every entry and delete the saved log"""
+        self.entries.clear()
+        self.total_bytes = 0
+        if self.path is not None:
+            self._close_log()
+            for segment in list(self.segments):
+                self._delete_segment(segment)
+            self.segments.clear()
+            self.segment = None
+
+    def newest(self):
+        """Return the entries, newest first"""
+        return list(reversed(self.entries.values()))
+
+    def search(self, query, limit=None):
+        """Return the entries containing every word of query, newest first"""
+        words = query.lower().split()
+        if not words:
+            entries = self.newest()
+            return entries if limit is None else entries[:limit]
+        results = []
+        for entry in reversed(self.entries.values()):
+            head = entry.head.lower()
+            if all(word in head for word in words):
+                results.append(entry)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def close(self):
+        """Close the log file"""
+        self._close_log()
+
+    def load(self):
+        """Replay the log segments in path"""
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            names = sorted(name for name in os.listdir(self.path) if name.endswith(SEGMENT_SUFFIX))
+        except OSError as e:
+            print(f"Error reading clipboard history: {e}")
+            self.path = None
+            return
+        for name in names:
+            try:
+                segment = int(name[:-len(SEGMENT_SUFFIX)])
+            except ValueError:
+                continue
+            self.segments[segment] = 0
+            self._replay(segment)
+        self._trim()
+
+    def _replay(self, segment):
+        """Apply the records of one segment, cutting off a torn tail"""
+        path = self._segment_path(segment)
+        good = 0
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            while good + HEADER.size <= len(blob):
+                length, crc, kind, digest, when, compressed = HEADER.unpack_from(blob, good)
+                start = good + HEADER.size
+                data = blob[start:start + length]
+                if len(data) < length or zlib.crc32(data) != crc:
+                    break
+                good = start + length
+                if kind == ADD:
+                    text = (zlib.decompress(data) if compressed else data).decode('utf-8')
+                    self._insert(Entry(digest, data, bool(compressed), when,
+                                       text[:self.HEAD_CHARS], segment))
+                elif kind == REMOVE:
+                    self._discard(digest)
+            if good < len(blob):
+                with open(path, 'r+b') as f:
+                    f.truncate(good)
+        except (OSError, ValueError, zlib.error, struct.error) as e:
+            print(f"Error reading clipboard history: {e}")
+
+    def _insert(self, entry):
+        """Put an entry at the newest position, replacing one with the same text"""
+        self._discard(entry.digest)
+        self.entries[entry.digest] = entry
+        self.total_bytes += entry.size
+        if entry.segment is not None:
+            self.segments[entry.segment] = self.segments.get(entry.segment, 0) + 1
+
+    def _discard(self, digest):
+        """Drop an entry from memory and from its segment's live count"""
+        entry = self.entries.pop(digest, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry.size
+        if entry.segment is not None and entry.segment in self.segments:
+            self.segments[entry.segment] -= 1
+
+    def _trim(self):
+        """Drop the oldest entries until the history fits in max_bytes"""
+        while self.total_bytes > self.max_bytes and self.entries:
+            self._discard(next(iter(self.entries)))
+        self._drop_segments()
+
+    def _write(self, kind, entry):
+        """Append one record to the newest segment"""
+        if self.path is None:
+            return
+        data = entry.data if kind == ADD else b''
+        record = HEADER.pack(len(data), zlib.crc32(data), kind, entry.digest, entry.time,
+                             entry.compressed) + data
+        try:
+            if self.log is None or self.log.tell() + len(record) > self.segment_bytes:
+                self._open_segment()
+            self.log.write(record)
+            self.log.flush()
+        except OSError as e:
+            print(f"Error writing clipboard history: {e}")
+            return
+        if kind == ADD:
+            entry.segment = self.segment
+
+    def _open_segment(self):
+        """Close the current segment and start a new one"""
+        self._close_log()
+        self.segment = (next(reversed(self.segments)) if self.segments else 0) + 1
+        self.segments[self.segment] = 0
+        self.log = open(self._segment_path(self.segment), 'ab')
+
+    def _close_log(self):
+        """Close the open segment, if any"""
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def _drop_segments(self):
+        """Delete the oldest segments that no longer hold a live entry
+
+        Segments go strictly oldest first, so removal records always
+        outlive the entries they remove.
+        """
+        while self.segments:
+            segment, live = next(iter(self.segments.items()))
+            if live > 0 or segment == self.segment:
+                return
+            del self.segments[segment]
+            self._delete_segment(segment)
+
+    def _delete_segment(self, segment):
+        """Delete one segment file"""
+        try:
+            os.remove(self._segment_path(segment))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing clipboard history segment: {e}")
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, f"{segment:08d}{SEGMENT_SUFFIX}")
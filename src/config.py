@@ -4,20 +4,138 @@ Loads and manages application settings
 """
 
 import json
+import marshal
 import os
+import tempfile
+import threading
+from collections.abc import Mapping, Sequence
+from config_cache import read_cache, write_cache, source_key
+from config_watcher import ConfigWatcher
+from metrics import metrics
+from snippet_index import SnippetIndex
+
+# Per-project settings file, looked up from the working directory upwards
+PROJECT_CONFIG_NAME = ".aicodex.json"
+
+
+def diff_settings(old, new):
+    """Return the top-level sections that differ between two settings dicts
+    
+    Sections missing from new are reported with a value of None.
+    """
+    changes = {}
+    for key in old.keys() | new.keys():
+        old_value, new_value = old.get(key), new.get(key)
+        if old_value is not new_value and old_value != new_value:
+            changes[key] = new_value
+    return changes
+
+
+def merge_settings(base, override):
+    """Return base deep-merged with override
+    
+    Nested dicts are merged key by key; any other value in override,
+    including lists, replaces the one in base.  Neither input is modified.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(value, Mapping) and isinstance(current, Mapping):
+            merged[key] = merge_settings(current, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def flatten_settings(settings, prefix=''):
+    """Return a dict mapping every section and dotted key path to its value"""
+    flat = {}
+    for key, value in settings.items():
+        path = prefix + key
+        flat[path] = value
+        if isinstance(value, Mapping):
+            flat.update(flatten_settings(value, path + '.'))
+    return flat
+
+
+def find_project_config(start=None):
+    """Return the nearest project settings file in start or its parents, or None"""
+    directory = os.path.abspath(start or os.getcwd())
+    while True:
+        path = os.path.join(directory, PROJECT_CONFIG_NAME)
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _json_default(value):
+    """Serialize cache-backed snippet containers as plain JSON types"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Sequence):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 class Config:
-    """Configuration manager for AicodeX"""
+    """Configuration manager for AicodeX
+    
+    Settings are layered: the built-in defaults, then the user file at
+    ``config_path``, then an optional per-project file, merged deep.
+    ``settings`` holds the user layer, which is what ``set`` changes and
+    ``save`` writes.  Reads go through ``get``, which looks keys up in a
+    flat view of the merged layers, so ``get('window')`` and
+    ``get('window.opacity')`` are both a single dict hit.  The view is
+    rebuilt only after a layer changes, and sections whose merged value
+    did not change keep their identity across rebuilds.
+    """
     
-    def __init__(self, config_path="config/default_settings.json"):
+    def __init__(self, config_path="config/default_settings.json", use_cache=False, project_path=None):
         """Initialize configuration"""
         self.config_path = config_path
+        self.project_path = project_path
+        self.defaults = self.get_default_settings()
+        self.project_settings = {}
+        self.resolved = {}
+        self.view = None
+        self.use_cache = use_cache
+        self.snippet_postings = None
+        self.cached_snippets = None
+        self.cached_postings = None
+        self.cache_stale = False
+        self.cache_thread = None
+        self.cache_rerun = False
         self.settings = {}
-        self.load()
+        self.listeners = []
+        self.lock = threading.RLock()
+        self.save_lock = threading.Lock()
+        self.dirty = False
+        self.last_saved = None
+        self.write_behind_delay = None
+        self.flush_timer = None
+        with metrics.timer('config.load'):
+            self.load()
+        self.watcher = ConfigWatcher(config_path)
+        self.project_watcher = ConfigWatcher(project_path) if project_path else None
         
     def load(self):
-        """Load configuration from file"""
+        """Load configuration from the user and project files"""
+        self.view = None
+        project_settings = self._read_project()
+        if project_settings is not None:
+            self.project_settings = project_settings
+        if self.use_cache:
+            cached = read_cache(self.config_path, SnippetIndex.INDEX_VERSION)
+            if cached is not None:
+                self.settings, self.snippet_postings, self.cached_postings = cached
+                self.cached_snippets = self.settings.get('snippets')
+                print(f"Configuration loaded from cache for {self.config_path}")
+                return
+            self.cache_stale = os.path.exists(self.config_path)
+        
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r', encoding='utf-8') as f:
@@ -32,22 +150,227 @@ class Config:
             self.settings = self.get_default_settings()
             
     def save(self):
-        """Save configuration to file"""
+        """Save configuration to file
+        
+        The file is written to a temporary file in the same directory and
+        renamed over the original, so a crash mid-write leaves the old file
+        intact.  Nothing is written when the content matches the last save.
+        Returns True if the file was written.
+        """
+        with self.save_lock:
+            try:
+                with self.lock:
+                    content = json.dumps(self.settings, indent=2, default=_json_default)
+                    self.dirty = False
+            except Exception as e:
+                print(f"Error saving configuration: {e}")
+                return False
+            if content == self.last_saved:
+                metrics.incr('config.save_skipped')
+                return False
+            with metrics.timer('config.save'):
+                return self._write(content)
+            
+    def _write(self, content):
+        """Atomically replace the config file with content"""
+        directory = os.path.dirname(self.config_path) or '.'
+        temp_path = None
         try:
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2)
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                dir=directory,
+                prefix=f".{os.path.basename(self.config_path)}.",
+                suffix=".tmp"
+            )
+            if os.path.exists(self.config_path):
+                os.chmod(temp_path, os.stat(self.config_path).st_mode & 0o777)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_path)
+            temp_path = None
+            self.last_saved = content
+            self.watcher.acknowledge()
+            self.cache_stale = self.use_cache
             print(f"Configuration saved to {self.config_path}")
+            return True
         except Exception as e:
             print(f"Error saving configuration: {e}")
+            self.dirty = True
+            return False
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+                
+    def enable_write_behind(self, delay=0.5):
+        """Coalesce set() calls into one save after delay seconds of quiet"""
+        self.write_behind_delay = delay
+        
+    def flush(self):
+        """Write any pending changes now"""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            dirty = self.dirty
+        if dirty:
+            self.save()
+            
+    def _write_behind(self):
+        """Flush pending changes and bring the compiled cache up to date"""
+        self.flush()
+        if self.cache_stale:
+            self.refresh_cache()
+            
+    def refresh_cache(self):
+        """Rebuild the compiled config cache in a background thread"""
+        if not self.use_cache:
+            return
+        with self.lock:
+            if self.cache_thread is not None and self.cache_thread.is_alive():
+                self.cache_rerun = True
+                return
+            self.cache_thread = threading.Thread(target=self._write_cache, daemon=True)
+            self.cache_thread.start()
+            
+    def _write_cache(self):
+        """Write the cache, repeating if settings changed while writing"""
+        while True:
+            with self.save_lock, self.lock:
+                self.cache_rerun = False
+                if self.dirty:
+                    return
+                settings = dict(self.settings)
+                key = source_key(self.config_path)
+            snippets = settings.get('snippets')
+            if not snippets:
+                index_bytes = b''
+            elif snippets is self.cached_snippets:
+                index_bytes = self.cached_postings()
+            else:
+                index_bytes = marshal.dumps(SnippetIndex(snippets).postings_state())
+            if write_cache(key, settings, index_bytes, SnippetIndex.INDEX_VERSION):
+                self.cache_stale = False
+            with self.lock:
+                if not self.cache_rerun:
+                    return
             
+    def _schedule_flush(self):
+        """Restart the write-behind timer"""
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+        self.flush_timer = threading.Timer(self.write_behind_delay, self._write_behind)
+        self.flush_timer.daemon = True
+        self.flush_timer.start()
+        
+    def add_listener(self, callback):
+        """Register a callback receiving the changed sections on reload"""
+        self.listeners.append(callback)
+        
+    def _read_project(self):
+        """Read the project settings file, or return None if it cannot be read"""
+        if not self.project_path:
+            return None
+        try:
+            with open(self.project_path, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+            print(f"Project configuration loaded from {self.project_path}")
+            return settings
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading project configuration: {e}")
+            return None
+        
+    def reload(self):
+        """Reload the config files and apply only the changed sections
+        
+        Returns the top-level sections whose merged value changed, mapped
+        to their new value, and passes the same dict to the listeners.
+        """
+        try:
+            with metrics.timer('config.reload'), open(self.config_path, 'r', encoding='utf-8') as f:
+                new_settings = json.load(f)
+        except Exception as e:
+            print(f"Error reloading configuration: {e}")
+            metrics.incr('config.reload_errors')
+            return {}
+        project_settings = self._read_project()
+        
+        with self.lock:
+            self._view()
+            old_resolved = self.resolved
+            for key, value in diff_settings(self.settings, new_settings).items():
+                if value is None:
+                    self.settings.pop(key, None)
+                else:
+                    self.settings[key] = value
+            if project_settings is not None:
+                self.project_settings = project_settings
+            self.view = None
+            self._view()
+            changes = diff_settings(old_resolved, self.resolved)
+        
+        if changes:
+            print(f"Configuration reloaded: {', '.join(sorted(changes))} changed")
+            if 'snippets' in changes:
+                self.snippet_postings = None
+            self.cache_stale = self.use_cache
+            self.refresh_cache()
+            for listener in self.listeners:
+                try:
+                    listener(changes)
+                except Exception as e:
+                    print(f"Error applying configuration change: {e}")
+        return changes
+        
+    def poll(self):
+        """Reload configuration if a config file changed since the last poll"""
+        changed = self.watcher.poll()
+        if self.project_watcher is not None and self.project_watcher.poll():
+            changed = True
+        if changed:
+            return self.reload()
+        return {}
+        
     def get(self, key, default=None):
-        """Get configuration value"""
-        return self.settings.get(key, default)
+        """Get a configuration value by section or dotted key path"""
+        view = self.view
+        if view is None:
+            view = self._view()
+        return view.get(key, default)
+        
+    def _view(self):
+        """Return the flat view of the merged layers, rebuilding it if stale"""
+        with self.lock:
+            if self.view is None:
+                resolved = merge_settings(merge_settings(self.defaults, self.settings), self.project_settings)
+                # Unchanged sections keep their identity for callers comparing them
+                for key, value in resolved.items():
+                    previous = self.resolved.get(key)
+                    if value is not previous and value == previous:
+                        resolved[key] = previous
+                self.resolved = resolved
+                self.view = flatten_settings(resolved)
+            return self.view
         
     def set(self, key, value):
-        """Set configuration value"""
-        self.settings[key] = value
+        """Set a value in the user layer by section or dotted key path"""
+        with self.lock:
+            *parents, leaf = key.split('.')
+            target = self.settings
+            for part in parents:
+                # Copy sections on write, readers may hold the old ones
+                section = target.get(part)
+                section = dict(section) if isinstance(section, Mapping) else {}
+                target[part] = section
+                target = section
+            target[leaf] = value
+            self.view = None
+            self.dirty = True
+            if self.write_behind_delay is not None:
+                self._schedule_flush()
         
     def get_default_settings(self):
         """Get default configuration settings"""
@@ -57,7 +380,8 @@ class Config:
                 "height": 600,
                 "x_position": 100,
                 "y_position": 100,
-                "opacity": 0.95
+                "opacity": 0.95,
+                "low_memory_after": 300
             },
             "hotkeys": {
                 "toggle_overlay": "ctrl+shift+o",
@@ -67,13 +391,19 @@ class Config:
             "snippets": [
                 {
                     "name": "Python Function",
-                    "code": "def function_name(param):\n    \"\"\"Docstring\"\"\"\n    pass"
+                    "code": "def ${1:function_name}(${2:param}):\n    \"\"\"${3:Docstring}\"\"\"\n    ${0:pass}",
+                    "template": True
                 },
                 {
                     "name": "JavaScript Function",
-                    "code": "function functionName(param) {\n    // Comment\n    return value;\n}"
+                    "code": "function ${1:functionName}(${2:param}) {\n    // ${3:Comment}\n    return ${0:value};\n}",
+                    "template": True
                 }
             ],
+            "clipboard_history": {
+                "enabled": False,
+                "max_kb": 4096
+            },
             "theme": {
                 "background": "#2b2b2b",
                 "foreground": "#ffffff",
@@ -0,0 +1,206 @@
+"""
+Compiled configuration cache for AicodeX
+Stores parsed settings and a pre-built snippet index in a binary file
+next to the config, so a warm start skips JSON parsing
+"""
+
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+from array import array
+
+MAGIC = b'AXCACHE1'
+CACHE_VERSION = 1
+_HEADER_SIZE = struct.Struct('<Q')
+
+
+def cache_path_for(config_path):
+    """Return the cache file path for a config file"""
+    directory, name = os.path.split(os.path.abspath(config_path))
+    return os.path.join(directory, f".{name}.cache")
+
+
+def source_key(config_path):
+    """Return the (path, size, mtime_ns) key of a config file, or None"""
+    try:
+        stat = os.stat(config_path)
+    except OSError:
+        return None
+    return (os.path.abspath(config_path), stat.st_size, stat.st_mtime_ns)
+
+
+class LazySnippet(Mapping):
+    """Snippet mapping whose code is decoded from the cache on first access"""
+
+    __slots__ = ('meta', 'source', 'start', 'end', '_code')
+
+    def __init__(self, meta, source, start, end):
+        self.meta = meta
+        self.source = source
+        self.start = start
+        self.end = end
+        self._code = None
+
+    def __getitem__(self, key):
+        if key == 'code':
+            if self._code is None:
+                self._code = self.source[self.start:self.end].decode('utf-8')
+            return self._code
+        return self.meta[key]
+
+    def __iter__(self):
+        yield from self.meta
+        yield 'code'
+
+    def __len__(self):
+        return len(self.meta) + 1
+
+
+class LazySnippets(Sequence):
+    """Read-only snippet list backed by a memory-mapped cache"""
+
+    def __init__(self, metas, offsets, source, base):
+        self.metas = metas
+        self.offsets = offsets
+        self.source = source
+        self.base = base
+        self.items = [None] * len(metas)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        snippet = self.items[index]
+        if snippet is None:
+            index = range(len(self))[index]
+            start = self.base + self.offsets[index]
+            end = self.base + self.offsets[index + 1]
+            snippet = self.items[index] = LazySnippet(self.metas[index], self.source, start, end)
+        return snippet
+
+    def __len__(self):
+        return len(self.metas)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazySnippets)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+
+def write_cache(key, settings, index_bytes, index_version):
+    """Write settings and marshalled snippet index postings to a cache file
+
+    ``key`` is the ``source_key`` of the config file at the moment the
+    settings were taken, so a cache never claims to match a newer file.
+    Layout: magic, header length, marshalled header, marshalled postings,
+    then the UTF-8 snippet bodies back to back.  The header holds the
+    source key, the settings without snippets, snippet metadata and the
+    body offsets.  Returns True if the cache was written.
+    """
+    if key is None:
+        return False
+
+    snippets = settings.get('snippets')
+    other = {k: v for k, v in settings.items() if k != 'snippets'}
+    metas = []
+    offsets = array('Q', [0])
+    bodies = bytearray()
+    for snippet in snippets or []:
+        metas.append({k: v for k, v in snippet.items() if k != 'code'})
+        bodies += snippet.get('code', '').encode('utf-8')
+        offsets.append(len(bodies))
+
+    header = marshal.dumps({
+        'version': CACHE_VERSION,
+        'index_version': index_version,
+        'key': key,
+        'settings': other,
+        'has_snippets': snippets is not None,
+        'snippets': metas,
+        'offsets': offsets.tobytes(),
+        'index_length': len(index_bytes),
+    })
+
+    cache_path = cache_path_for(key[0])
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path),
+            prefix=f"{os.path.basename(cache_path)}.",
+            suffix=".tmp"
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_SIZE.pack(len(header)))
+            f.write(header)
+            f.write(index_bytes)
+            f.write(bodies)
+        # Fails on Windows while this process still maps the old cache;
+        # the next start then sees a stale key and rebuilds it
+        os.replace(temp_path, cache_path)
+        temp_path = None
+        return True
+    except Exception as e:
+        print(f"Error writing configuration cache: {e}")
+        return False
+    finally:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_cache(config_path, index_version):
+    """Load settings from the config's cache if it matches the source
+
+    Returns (settings, load_postings, raw_postings) or None when the cache
+    is missing or stale.  Snippet bodies and index postings stay in the
+    memory map until they are first used; ``raw_postings`` returns the
+    marshalled postings so an unchanged index can be copied into a new
+    cache without decoding it.
+    """
+    key = source_key(config_path)
+    if key is None:
+        return None
+    try:
+        with open(cache_path_for(config_path), 'rb') as f:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        if source[:len(MAGIC)] != MAGIC:
+            raise ValueError("bad magic")
+        header_start = len(MAGIC) + _HEADER_SIZE.size
+        (header_length,) = _HEADER_SIZE.unpack_from(source, len(MAGIC))
+        header = marshal.loads(source[header_start:header_start + header_length])
+        if (header['version'] != CACHE_VERSION
+                or header['index_version'] != index_version
+                or tuple(header['key']) != key):
+            raise ValueError("stale cache")
+    except Exception:
+        source.close()
+        return None
+
+    index_start = header_start + header_length
+    index_end = index_start + header['index_length']
+
+    settings = header['settings']
+    if header['has_snippets']:
+        offsets = array('Q')
+        offsets.frombytes(header['offsets'])
+        settings['snippets'] = LazySnippets(header['snippets'], offsets, source, index_end)
+
+    def raw_postings():
+        """Return the marshalled snippet index postings"""
+        return source[index_start:index_end]
+
+    def load_postings():
+        """Decode the pre-built snippet index postings"""
+        if index_start == index_end:
+            return None
+        return marshal.loads(raw_postings())
+
+    return settings, load_postings, raw_postings
@@ -0,0 +1,51 @@
+"""
+Configuration file watcher for AicodeX
+Detects changes to the settings file by polling its mtime and size
+"""
+
+import os
+import time
+
+
+def file_signature(path):
+    """Return (mtime_ns, size) for a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ConfigWatcher:
+    """Polls a file and reports a change once it has settled
+
+    Editors often write a file in several steps, so a change is only
+    reported after the signature has stayed the same for ``debounce``
+    seconds.  The watcher does no scheduling of its own; the caller
+    decides how often to ``poll``.
+    """
+
+    def __init__(self, path, debounce=0.3):
+        """Initialize the watcher with the file's current signature"""
+        self.path = path
+        self.debounce = debounce
+        self.signature = file_signature(path)
+        self.changed_at = None
+
+    def acknowledge(self):
+        """Treat the file's current state as seen, e.g. after our own write"""
+        self.signature = file_signature(self.path)
+        self.changed_at = None
+
+    def poll(self, now=None):
+        """Return True once a change has been stable for the debounce period"""
+        now = time.monotonic() if now is None else now
+        signature = file_signature(self.path)
+        if signature != self.signature:
+            self.signature = signature
+            self.changed_at = now
+            return False
+        if self.changed_at is not None and now - self.changed_at >= self.debounce:
+            self.changed_at = None
+            return True
+        return False
@@ -0,0 +1,137 @@
+"""
+Hotkey dispatch for AicodeX
+Moves hotkey events from the keyboard hook thread onto the Tk main loop
+"""
+
+import time
+from collections import deque
+from metrics import metrics
+
+
+class LatencyRecorder:
+    """Keeps recent latency samples and reports percentiles"""
+
+    def __init__(self, max_samples=1000):
+        """Initialize the recorder with a bounded sample window"""
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+
+    def record(self, seconds):
+        """Record one latency sample in seconds"""
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, points=(50, 90, 99)):
+        """Return {percentile: milliseconds} over the recent samples"""
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {p: ordered[min(last, round(p / 100 * last))] * 1000 for p in points}
+
+    def summary(self):
+        """Format the percentiles as a single line"""
+        values = self.percentiles()
+        if not values:
+            return "no samples"
+        parts = ", ".join(f"p{p} {ms:.2f} ms" for p, ms in values.items())
+        return f"{parts} ({self.count} events)"
+
+
+class HotkeyDispatcher:
+    """Queue of hotkey events drained on the Tk thread
+
+    ``post`` is the only method meant to be called from the keyboard hook
+    thread; it appends to a deque, which is safe without a lock.  ``drain``
+    runs on the Tk thread from an ``after`` pump, so handlers can touch
+    widgets.  Events queued since the last drain are coalesced per action:
+    ``toggle`` actions run once if posted an odd number of times and not
+    at all if even, ``last`` actions run once with the latest arguments,
+    and ``none`` actions run once per event, in order, which is what
+    actions whose arguments matter such as snippet inserts need.
+    While a handler runs, ``posted_at`` holds the time its latest event was
+    posted, so handlers can measure latency from the key press.
+
+    Only events posted with ``hotkey=True``, i.e. from a key binding, are
+    counted in ``latency`` and ``hotkey.latency``; other posts such as
+    suggestion updates, formatter results and forwarded commands are
+    observed as ``dispatch.<action>``.
+    """
+
+    COALESCE_LAST = 'last'
+    COALESCE_TOGGLE = 'toggle'
+    COALESCE_NONE = 'none'
+
+    def __init__(self, interval_ms=15):
+        """Initialize the dispatcher"""
+        self.interval_ms = interval_ms
+        self.events = deque()
+        self.handlers = {}
+        self.latency = LatencyRecorder()
+        self.root = None
+        self.posted_at = None
+
+    def register(self, action, handler, coalesce=COALESCE_LAST):
+        """Register the handler run on the Tk thread for an action"""
+        self.handlers[action] = (handler, coalesce)
+
+    def post(self, action, *args, hotkey=False):
+        """Queue an action from any thread, hotkey marks a key binding"""
+        self.events.append((action, args, time.perf_counter(), hotkey))
+
+    def drain(self):
+        """Run handlers for all queued events, coalescing repeats"""
+        batch = {}
+        sequence = 0
+        while self.events:
+            action, args, posted, hotkey = self.events.popleft()
+            coalesce = self.handlers.get(action, (None, None))[1]
+            key = (action, sequence) if coalesce == self.COALESCE_NONE else action
+            sequence += 1
+            entry = batch.get(key)
+            if entry is None:
+                batch[key] = [action, args, [posted], [hotkey]]
+            else:
+                entry[1] = args
+                entry[2].append(posted)
+                entry[3].append(hotkey)
+
+        for action, args, posted, hotkeys in batch.values():
+            handler, coalesce = self.handlers.get(action, (None, None))
+            if handler is None:
+                print(f"No handler registered for {action}")
+                continue
+            if coalesce != self.COALESCE_TOGGLE or len(posted) % 2:
+                self.posted_at = posted[-1]
+                started = time.perf_counter()
+                try:
+                    handler(*args)
+                except Exception as e:
+                    print(f"Error handling {action}: {e}")
+                    metrics.incr('hotkey.errors')
+                self.posted_at = None
+                if metrics.enabled:
+                    metrics.observe(f"handler.{action}", time.perf_counter() - started)
+            done = time.perf_counter()
+            for posted_at, hotkey in zip(posted, hotkeys):
+                if hotkey:
+                    self.latency.record(done - posted_at)
+                    metrics.observe('hotkey.latency', done - posted_at)
+                else:
+                    metrics.observe(f"dispatch.{action}", done - posted_at)
+            key_events = sum(hotkeys)
+            if key_events:
+                metrics.incr('hotkey.events', key_events)
+            if key_events < len(posted):
+                metrics.incr('dispatch.events', len(posted) - key_events)
+        return len(batch)
+
+    def start(self, root):
+        """Start draining the queue from root's event loop"""
+        self.root = root
+        self._pump()
+
+    def _pump(self):
+        """Drain the queue and schedule the next pump"""
+        self.drain()
+        self.root.after(self.interval_ms, self._pump)
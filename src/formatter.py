@@ -0,0 +1,185 @@
+"""
+Code formatting for AicodeX
+Runs a warm formatter in a background worker process with a result cache
+"""
+
+import hashlib
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# The worker starts after the hook, server and pool threads are running;
+# forking a multithreaded process can deadlock the child on a held lock
+_context = multiprocessing.get_context('spawn')
+
+
+class FormatError(Exception):
+    """Raised when code cannot be formatted"""
+
+
+def format_with_black(code, options):
+    """Format Python code with black using black.Mode options"""
+    import black
+    return black.format_str(code, mode=black.Mode(**options))
+
+
+def _worker(conn, formatter, options):
+    """Worker process loop: format each (code, options) request it receives"""
+    # Pay the formatter's import cost before the first real request
+    try:
+        formatter('', options)
+    except Exception:
+        pass
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        code, request_options = request
+        try:
+            conn.send((formatter(code, request_options), None))
+        except Exception as e:
+            conn.send((None, f"{type(e).__name__}: {e}"))
+
+
+class FormatEngine:
+    """Formats code in a long-lived worker process
+
+    The worker imports the formatter once and then serves requests over a
+    pipe, so a format costs only the formatting itself.  Results are
+    cached by a hash of the code and the options, so formatting the same
+    text again does not reach the worker at all.  A request that takes
+    longer than ``timeout`` seconds, or is cancelled, kills the worker;
+    a new one is started for the next request.
+
+    ``formatter`` is a picklable ``(code, options) -> str`` callable run
+    in the worker, which is spawned rather than forked.  ``submit`` runs requests one at a time on a
+    background thread and never blocks the caller.
+    """
+
+    def __init__(self, formatter=format_with_black, options=None, timeout=5.0, cache_size=128):
+        """Initialize the engine; the worker starts on first use"""
+        self.formatter = formatter
+        self.options = dict(options or {})
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.process = None
+        self.conn = None
+        self.busy = False
+        self.cancelled = False
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='format')
+
+    def start(self):
+        """Start and warm the worker process if it is not running"""
+        with self.lock:
+            self._ensure_worker()
+
+    def format(self, code, options=None):
+        """Format code, blocking until done; raises FormatError on failure"""
+        options = dict(self.options, **(options or {}))
+        key = self._cache_key(code, options)
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+            self._ensure_worker()
+            self.busy = True
+            self.cancelled = False
+            try:
+                self.conn.send((code, options))
+                if not self.conn.poll(self.timeout):
+                    self._stop_worker()
+                    raise FormatError(f"Formatting timed out after {self.timeout:g} s")
+                result, error = self.conn.recv()
+            except (EOFError, OSError):
+                self._stop_worker()
+                if self.cancelled:
+                    raise FormatError("Formatting cancelled")
+                raise FormatError("Formatter process exited")
+            finally:
+                self.busy = False
+
+            if error is not None:
+                raise FormatError(error)
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return result
+
+    def submit(self, code, callback, options=None):
+        """Format code in the background and call callback(result, error)
+
+        The callback runs on the engine's thread, callers that touch
+        widgets must hand the result over to the Tk thread themselves.
+        """
+        def run():
+            try:
+                result = self.format(code, options)
+            except FormatError as e:
+                callback(None, str(e))
+            else:
+                callback(result, None)
+        return self.executor.submit(run)
+
+    def cancel(self):
+        """Abort the request currently being formatted, if any"""
+        process = self.process
+        if self.busy and process is not None:
+            self.cancelled = True
+            process.terminate()
+
+    def close(self):
+        """Stop the worker process"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.cancel()
+        with self.lock:
+            if self.conn is not None:
+                try:
+                    self.conn.send(None)
+                except (OSError, ValueError):
+                    pass
+            self._stop_worker()
+
+    def _cache_key(self, code, options):
+        """Key a result by the code's hash and the formatter options"""
+        digest = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        return digest, json.dumps(options, sort_keys=True)
+
+    def _ensure_worker(self):
+        """Start the worker process unless it is alive"""
+        if self.process is not None and self.process.is_alive():
+            return
+        self._stop_worker()
+        parent, child = _context.Pipe()
+        self.process = _context.Process(
+            target=_worker,
+            args=(child, self.formatter, self.options),
+            name='aicodex-formatter',
+            daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def _stop_worker(self):
+        """Kill the worker process and drop its pipe"""
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process.join(1)
+            self.process = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
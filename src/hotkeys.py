@@ -5,63 +5,165 @@ Handles global hotkey registration and callbacks
 
 import keyboard
 import threading
+from dispatch import HotkeyDispatcher
+from keymap import ActionRegistry, ChordMatcher, ChordTrie, KeyNames, is_modifier, make_stroke, normalize_key
+from metrics import metrics
 
 
 class HotkeyManager:
-    """Manages global hotkeys for the application"""
+    """Manages global hotkeys for the application
+    
+    Actions are registered by the config key they are bound under in the
+    "hotkeys" section.  All bindings, including multi-stroke chords and
+    per-snippet shortcuts, are resolved by a single keyboard hook walking
+    a chord trie, so the per-keystroke cost does not grow with the number
+    of bindings.
+    """
     
     def __init__(self, config):
         """Initialize hotkey manager"""
         self.config = config
         self.hotkeys = config.get('hotkeys', {})
-        self.registered_hotkeys = []
         self.toggle_callback = None
+        self.snippet_callback = None
+        self.format_callback = None
+        self.snippet_store = None
         self.lock = threading.Lock()
+        self.hook = None
+        self.modifiers = set()
+        self.key_listeners = []
+        self.matcher = ChordMatcher(ChordTrie())
+        self.key_names = KeyNames(keyboard.key_to_scan_codes)
+        
+        # Hook-thread callbacks only enqueue, handlers run on the Tk thread
+        self.dispatcher = HotkeyDispatcher()
+        self.registry = ActionRegistry()
+        self.register_action('toggle_overlay', self._on_toggle, 'ctrl+shift+o', "Toggle Overlay",
+                             coalesce=HotkeyDispatcher.COALESCE_TOGGLE)
+        # Inserts carry a snippet name, so two in one drain must both run
+        self.register_action('insert_snippet', self._on_snippet, 'ctrl+shift+s', "Insert Snippet",
+                             coalesce=HotkeyDispatcher.COALESCE_NONE)
+        self.register_action('format_code', self._on_format, 'ctrl+shift+f', "Format Code")
         
     def set_toggle_callback(self, callback):
         """Set the callback for toggle hotkey"""
         self.toggle_callback = callback
         
+    def set_snippet_callback(self, callback):
+        """Set the callback for insert snippet hotkeys, called with a name or None"""
+        self.snippet_callback = callback
+        
+    def set_format_callback(self, callback):
+        """Set the callback for the format code hotkey"""
+        self.format_callback = callback
+        
+    def set_snippet_store(self, store):
+        """Read per-snippet hotkeys from an SQLite snippet store instead of config"""
+        with self.lock:
+            self.snippet_store = store
+            self._load_keymap()
+        
+    def add_key_listener(self, listener):
+        """Call listener(key, modifiers) on the hook thread for key presses
+        
+        Keys that complete a hotkey binding are not passed on.  Listeners
+        run for each keystroke typed anywhere, so they must return within
+        microseconds and hand real work to the dispatcher.
+        """
+        if listener not in self.key_listeners:
+            self.key_listeners = self.key_listeners + [listener]
+            
+    def remove_key_listener(self, listener):
+        """Stop calling a key listener"""
+        self.key_listeners = [l for l in self.key_listeners if l is not listener]
+        
+    def register_action(self, name, callback, default=None, label=None,
+                        coalesce=HotkeyDispatcher.COALESCE_LAST):
+        """Register an action that can be bound under its name in config"""
+        self.registry.register(name, callback, default, label)
+        self.dispatcher.register(name, callback, coalesce)
+        
+    def build_keymap(self, hotkeys):
+        """Build a chord trie from hotkey bindings and snippet shortcuts
+        
+        Returns the trie and a list of conflicting or shadowed bindings.
+        """
+        trie = ChordTrie(self.key_names)
+        problems = []
+        for action, binding in self.registry.bindings(hotkeys).items():
+            label = self.registry.get(action)[2]
+            problems.append(trie.add(binding, (action, ()), label))
+        if self.snippet_store is not None:
+            shortcuts = self.snippet_store.hotkeys()
+        else:
+            shortcuts = [(snippet.get('name', 'Unnamed'), snippet.get('hotkey'))
+                         for snippet in self.config.get('snippets') or []]
+        for name, binding in shortcuts:
+            if binding:
+                problems.append(trie.add(binding, ('insert_snippet', (name,)), f"Snippet '{name}'"))
+        return trie, [problem for problem in problems if problem]
+        
     def register_all(self):
         """Register all hotkeys from configuration"""
         with self.lock:
-            # Register toggle visibility hotkey
-            toggle_key = self.hotkeys.get('toggle_overlay', 'ctrl+shift+o')
-            try:
-                keyboard.add_hotkey(toggle_key, self._on_toggle)
-                self.registered_hotkeys.append(toggle_key)
-                print(f"Registered hotkey: {toggle_key} (Toggle Overlay)")
-            except Exception as e:
-                print(f"Failed to register hotkey {toggle_key}: {e}")
-            
-            # Register snippet hotkey
-            snippet_key = self.hotkeys.get('insert_snippet', 'ctrl+shift+s')
-            try:
-                keyboard.add_hotkey(snippet_key, self._on_snippet)
-                self.registered_hotkeys.append(snippet_key)
-                print(f"Registered hotkey: {snippet_key} (Insert Snippet)")
-            except Exception as e:
-                print(f"Failed to register hotkey {snippet_key}: {e}")
+            self._load_keymap()
+            if self.hook is None:
+                try:
+                    self.hook = keyboard.hook(self._on_key_event)
+                except Exception as e:
+                    print(f"Failed to install keyboard hook: {e}")
+                    
+    def update_hotkeys(self, hotkeys):
+        """Rebind hotkeys after the configuration changed"""
+        with self.lock:
+            self.hotkeys = hotkeys or {}
+            self._load_keymap()
             
-            # Register format hotkey
-            format_key = self.hotkeys.get('format_code', 'ctrl+shift+f')
-            try:
-                keyboard.add_hotkey(format_key, self._on_format)
-                self.registered_hotkeys.append(format_key)
-                print(f"Registered hotkey: {format_key} (Format Code)")
-            except Exception as e:
-                print(f"Failed to register hotkey {format_key}: {e}")
-                
+    def _load_keymap(self):
+        """Rebuild the chord trie and swap it in for the hook thread"""
+        trie, problems = self.build_keymap(self.hotkeys)
+        for problem in problems:
+            print(f"Hotkey conflict: {problem}")
+        self.matcher = ChordMatcher(trie)
+        print(f"Registered {trie.size} hotkeys")
+        
     def unregister_all(self):
         """Unregister all hotkeys"""
         with self.lock:
-            for hotkey in self.registered_hotkeys:
+            if self.hook is not None:
                 try:
-                    keyboard.remove_hotkey(hotkey)
-                    print(f"Unregistered hotkey: {hotkey}")
+                    keyboard.unhook(self.hook)
+                    print("Unregistered hotkeys")
                 except Exception as e:
-                    print(f"Failed to unregister hotkey {hotkey}: {e}")
-            self.registered_hotkeys.clear()
+                    print(f"Failed to unregister hotkeys: {e}")
+                self.hook = None
+            self.modifiers.clear()
+            
+    def _on_key_event(self, event):
+        """Feed key events from the keyboard hook thread to the chord matcher"""
+        if not event.name:
+            return
+        key = normalize_key(event.name)
+        if is_modifier(key):
+            if event.event_type == keyboard.KEY_DOWN:
+                self.modifiers.add(key)
+            else:
+                self.modifiers.discard(key)
+            return
+        if event.event_type != keyboard.KEY_DOWN:
+            return
+        if metrics.enabled:
+            metrics.incr('keyboard.keys')
+        
+        # Match by scan code so e.g. shift+1 arriving as '!' still matches
+        stroke_key = self.key_names.event_key(event.name, event.scan_code)
+        match = self.matcher.feed(make_stroke(self.modifiers, stroke_key))
+        if match is not None:
+            action, args = match
+            self.dispatcher.post(action, *args, hotkey=True)
+            return
+        for listener in self.key_listeners:
+            listener(key, self.modifiers)
             
     def _on_toggle(self):
         """Handle toggle overlay hotkey"""
@@ -70,12 +172,46 @@ class HotkeyManager:
         else:
             print("Toggle overlay callback not set")
             
-    def _on_snippet(self):
+    def send_paste(self):
+        """Send the paste keystroke to the focused application"""
+        self._send_clean('ctrl+v')
+        
+    def send_backspace(self, count):
+        """Erase characters before the cursor in the focused application"""
+        for _ in range(count):
+            self._send_clean('backspace')
+            
+    def send_cursor(self, back, select=0):
+        """Move the cursor back by some characters, then select forward"""
+        for _ in range(back):
+            self._send_clean('left')
+        for _ in range(select):
+            self._send_clean('shift+right')
+            
+    def send_copy(self):
+        """Send the copy keystroke to the focused application"""
+        self._send_clean('ctrl+c')
+        
+    def _send_clean(self, hotkey):
+        """Send a hotkey after releasing modifiers still held
+        
+        Without this the target would see e.g. ctrl+shift+v instead of
+        ctrl+v while the triggering hotkey is still held down.
+        """
+        for key in list(self.modifiers):
+            keyboard.release(key)
+        keyboard.send(hotkey)
+        
+    def _on_snippet(self, name=None):
         """Handle insert snippet hotkey"""
-        print("Snippet hotkey triggered")
-        # Implement snippet insertion logic here
+        if self.snippet_callback:
+            self.snippet_callback(name)
+        else:
+            print("Insert snippet callback not set")
         
     def _on_format(self):
         """Handle format code hotkey"""
-        print("Format code hotkey triggered")
-        # Implement code formatting logic here
+        if self.format_callback:
+            self.format_callback()
+        else:
+            print("Format code callback not set")
@@ -0,0 +1,314 @@
+"""
+Single-instance control for AicodeX
+The running overlay listens on a local socket and later launches forward
+their command to it.  This module must not import tkinter or keyboard,
+so that forwarding a command takes milliseconds.
+"""
+
+import getpass
+import json
+import os
+import secrets
+import socket
+import stat
+import tempfile
+import threading
+import time
+
+# Command name -> (dispatcher action, number of arguments)
+COMMANDS = {
+    'show': ('show_overlay', 0),
+    'toggle': ('toggle_overlay', 0),
+    'insert': ('insert_snippet', 1),
+    'reload': ('reload_config', 0),
+}
+
+# Unix sockets are protected by file permissions; elsewhere a localhost
+# port is used and requests must carry the token from the port file
+USE_UNIX_SOCKET = hasattr(socket, 'AF_UNIX') and os.name != 'nt'
+
+# A lock file without an owner pid this old was left by a crash mid-write
+LOCK_GRACE_SECONDS = 10.0
+
+
+def runtime_dir():
+    """Return the private per-user directory for the socket, port and lock files
+
+    The directory is created with mode 0700 under ``AICODEX_RUNTIME_DIR``,
+    ``XDG_RUNTIME_DIR`` or the temporary directory.  On POSIX it must be
+    a real directory owned by the current user that nobody else can
+    open, otherwise another local user could have created it to lock the
+    user out or to receive the forwarded commands; OSError is raised.
+    """
+    base = (os.environ.get('AICODEX_RUNTIME_DIR') or os.environ.get('XDG_RUNTIME_DIR')
+            or tempfile.gettempdir())
+    directory = os.path.join(base, f"aicodex-{getpass.getuser()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    if os.name != 'nt':
+        info = os.lstat(directory)
+        if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+                or info.st_mode & 0o077):
+            raise PermissionError(f"{directory} is not a private directory owned by this user")
+    return directory
+
+
+def runtime_path(suffix):
+    """Return the path of the socket, port or lock file"""
+    return os.path.join(runtime_dir(), f"aicodex.{suffix}")
+
+
+def _read_line(sock, limit=65536):
+    """Read one newline-terminated message from a socket"""
+    data = b''
+    while not data.endswith(b'\n') and len(data) < limit:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode('utf-8')
+
+
+def _connect(timeout):
+    """Connect to the running instance, returning (socket, token)"""
+    if USE_UNIX_SOCKET:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(runtime_path('sock'))
+        except OSError:
+            sock.close()
+            raise
+        return sock, None
+    with open(runtime_path('port'), 'r') as f:
+        info = json.load(f)
+    return socket.create_connection(('127.0.0.1', info['port']), timeout=timeout), info['token']
+
+
+def send_command(command, *args, timeout=5.0):
+    """Send a command to the running instance
+
+    Returns the reply, a dict with ``ok`` and possibly ``error``, or None
+    if no instance is listening.  An instance that accepts the connection
+    but does not answer, e.g. because it is still starting, counts as
+    running.
+    """
+    try:
+        sock, token = _connect(timeout)
+    except (OSError, ValueError, KeyError):
+        return None
+    try:
+        with sock:
+            request = {'token': token, 'command': command, 'args': list(args)}
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            reply = json.loads(_read_line(sock))
+    except (OSError, ValueError) as e:
+        return {'ok': False, 'error': f"no reply from running instance: {e}"}
+    if not isinstance(reply, dict):
+        return {'ok': False, 'error': "invalid reply from running instance"}
+    return reply
+
+
+def _pid_running(pid):
+    """Check whether a process with this pid exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _remove_stale_lock(path):
+    """Remove a lock file whose owner has exited; returns False if it is held"""
+    if os.name != 'nt':
+        try:
+            with open(path, 'r') as f:
+                owner = f.read().strip()
+            age = time.time() - os.path.getmtime(path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+        if owner.isdigit():
+            if _pid_running(int(owner)):
+                return False
+        elif age < LOCK_GRACE_SECONDS:
+            # Created by a launch that has not written its pid yet
+            return False
+    try:
+        # On Windows this fails while the owner still has the file open
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return False
+    return True
+
+
+class InstanceServer:
+    """Accepts commands from later launches and posts them to the dispatcher
+
+    ``bind`` claims the instance as early as possible, before the heavy
+    imports; connections made before ``serve`` is called wait in the
+    listen backlog.  Commands are handed to ``post(action, *args)``,
+    which must be safe to call from the server thread, and are
+    acknowledged without waiting for them to run.
+
+    Only the launch that creates the lock file, with O_CREAT|O_EXCL, may
+    clean up a stale socket or write the port file, so two launches
+    starting together cannot both claim the instance.  The lock holds
+    the owner's pid and is replaced once that process has exited; on
+    Windows the open lock file cannot be deleted while its owner runs.
+    """
+
+    def __init__(self):
+        """Initialize an unbound server"""
+        self.post = None
+        self.sock = None
+        self.path = None
+        self.token = None
+        self.thread = None
+        self.lock_fd = None
+        self.lock_path = None
+
+    def bind(self):
+        """Start listening; returns False if another instance is running
+
+        Raises OSError if the runtime directory is not private.
+        """
+        if send_command('ping') is not None:
+            return False
+        if not self._acquire_lock():
+            return False
+        try:
+            bound = self._bind()
+        except OSError:
+            bound = False
+        if not bound:
+            self._release_lock()
+        return bound
+
+    def _bind(self):
+        """Listen on the socket or port while holding the lock"""
+        if USE_UNIX_SOCKET:
+            self.path = runtime_path('sock')
+            if os.path.exists(self.path):
+                # Nobody answered, so the socket was left by a crashed instance
+                os.remove(self.path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            umask = os.umask(0o177)
+            try:
+                sock.bind(self.path)
+            except OSError:
+                sock.close()
+                return False
+            finally:
+                os.umask(umask)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.bind(('127.0.0.1', 0))
+                self.token = secrets.token_hex(16)
+                self.path = runtime_path('port')
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({'port': sock.getsockname()[1], 'token': self.token}, f)
+            except OSError:
+                sock.close()
+                raise
+        sock.listen(8)
+        self.sock = sock
+        return True
+
+    def _acquire_lock(self):
+        """Create the lock file, replacing one left by an exited instance"""
+        path = runtime_path('lock')
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                if not _remove_stale_lock(path):
+                    return False
+                continue
+            except OSError:
+                return False
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            self.lock_fd = fd
+            self.lock_path = path
+            return True
+        return False
+
+    def _release_lock(self):
+        """Close and remove the lock file"""
+        if self.lock_fd is None:
+            return
+        os.close(self.lock_fd)
+        self.lock_fd = None
+        try:
+            os.remove(self.lock_path)
+        except OSError:
+            pass
+
+    def serve(self, post):
+        """Start answering commands on a background thread"""
+        self.post = post
+        self.thread = threading.Thread(target=self._serve, name='instance-server', daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Stop listening and remove the socket or port file"""
+        if self.sock is None:
+            self._release_lock()
+            return
+        try:
+            # Wakes the accept() blocked in the server thread
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self.sock = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self._release_lock()
+
+    def handle(self, request):
+        """Validate a request and queue its action; returns the reply"""
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "invalid request"}
+        if self.token is not None and request.get('token') != self.token:
+            return {'ok': False, 'error': "invalid token"}
+        command = request.get('command')
+        args = request.get('args') or []
+        if command == 'ping':
+            return {'ok': True}
+        if command not in COMMANDS:
+            return {'ok': False, 'error': f"unknown command: {command}"}
+        action, arg_count = COMMANDS[command]
+        if len(args) != arg_count or not all(isinstance(arg, str) for arg in args):
+            return {'ok': False, 'error': f"{command} takes {arg_count} argument(s)"}
+        self.post(action, *args)
+        return {'ok': True}
+
+    def _serve(self):
+        """Answer one request per connection until closed"""
+        sock = self.sock
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    conn.settimeout(1.0)
+                    reply = self.handle(json.loads(_read_line(conn)))
+                    conn.sendall(json.dumps(reply).encode('utf-8') + b'\n')
+                except (OSError, ValueError):
+                    pass
@@ -0,0 +1,298 @@
+"""
+Key bindings for AicodeX
+Action registry and prefix-trie matching of multi-stroke chords
+"""
+
+import time
+
+# Canonical modifier order within a stroke
+MODIFIERS = ('ctrl', 'alt', 'shift', 'win')
+
+_ALIASES = {
+    'control': 'ctrl',
+    'option': 'alt',
+    'alt gr': 'alt',
+    'windows': 'win',
+    'command': 'win',
+    'cmd': 'win',
+    'super': 'win',
+    'meta': 'win',
+    'comma': ',',
+}
+
+# Key names containing a space, kept together when a binding is split
+# into strokes; the keyboard backend's scan codes extend this when present
+MULTIWORD_KEYS = frozenset((
+    'page up', 'page down', 'print screen', 'scroll lock', 'caps lock', 'num lock',
+    'left ctrl', 'right ctrl', 'left control', 'right control', 'left alt', 'right alt',
+    'alt gr', 'left shift', 'right shift', 'left windows', 'right windows', 'left win',
+    'right win', 'left cmd', 'right cmd', 'left command', 'right command',
+    'play/pause media', 'next track', 'previous track', 'prev track', 'stop media',
+    'volume up', 'volume down', 'volume mute', 'browser back', 'browser forward',
+    'browser refresh', 'browser home', 'browser search', 'browser favorites',
+    'browser stop', 'select media', 'start mail', 'start application 1',
+    'start application 2', 'num 0', 'num 1', 'num 2', 'num 3', 'num 4', 'num 5',
+    'num 6', 'num 7', 'num 8', 'num 9',
+))
+
+
+def normalize_key(name):
+    """Normalize a key name, folding left/right variants and aliases"""
+    name = name.strip().lower()
+    for side in ('left ', 'right '):
+        if name.startswith(side):
+            name = name[len(side):]
+    return _ALIASES.get(name, name)
+
+
+def is_modifier(name):
+    """Check whether a normalized key name is a modifier"""
+    return name in MODIFIERS
+
+
+def make_stroke(modifiers, key):
+    """Build a canonical stroke string from held modifiers and a key"""
+    held = [m for m in MODIFIERS if m in modifiers]
+    return '+'.join(held + [key])
+
+
+class KeyNames:
+    """Canonical key names shared by bindings and key events
+
+    Keyboard backends name a key event after the character it produced,
+    so with shift held the 1 key arrives as '!' and would never match a
+    'ctrl+shift+1' binding.  Given the backend's name-to-scan-code lookup,
+    each bound key is resolved to its scan codes and events are named by
+    scan code, so every name for the same physical key matches.  Without
+    a lookup names are only normalized.
+    """
+
+    def __init__(self, scan_codes=None):
+        """Initialize with a callable returning the scan codes for a key name"""
+        self.scan_codes = scan_codes
+        self.names = {}
+
+    def _codes(self, name):
+        """Return the scan codes for a key name, empty if unknown"""
+        if self.scan_codes is None:
+            return ()
+        try:
+            return tuple(self.scan_codes(name))
+        except (ValueError, KeyError):
+            return ()
+
+    def is_key(self, name):
+        """Check whether a key name is known to the backend or MULTIWORD_KEYS"""
+        return name in MULTIWORD_KEYS or bool(self._codes(name))
+
+    def canonical(self, name):
+        """Normalize a key name in a binding, registering its scan codes"""
+        name = normalize_key(name)
+        if is_modifier(name):
+            return name
+        codes = self._codes(name)
+        if not codes:
+            return name
+        name = self.names.get(codes[0], name)
+        for code in codes:
+            self.names.setdefault(code, name)
+        return name
+
+    def event_key(self, name, scan_code=None):
+        """Return the canonical name for a key event"""
+        return self.names.get(scan_code) or normalize_key(name)
+
+
+def parse_stroke(text, keys=None):
+    """Parse a stroke such as 'Shift+Ctrl+O' into canonical form"""
+    canonical = keys.canonical if keys is not None else normalize_key
+    keys = [canonical(part) for part in text.split('+') if part.strip()]
+    if not keys:
+        raise ValueError(f"Empty key stroke in {text!r}")
+    modifiers = {key for key in keys if is_modifier(key)}
+    others = [key for key in keys if not is_modifier(key)]
+    if len(others) > 1:
+        raise ValueError(f"More than one non-modifier key in {text!r}")
+    if not others:
+        # A bare modifier binding such as 'shift'
+        return make_stroke(modifiers - {keys[-1]}, keys[-1])
+    return make_stroke(modifiers, others[0])
+
+
+def split_sequence(binding, keys=None):
+    """Split 'ctrl+k ctrl+s' or 'ctrl+k, ctrl+s' into stroke strings
+
+    Whitespace separates strokes except around a ``+`` and inside
+    multi-word key names, so 'ctrl + page up' is one stroke.  A comma
+    right after a stroke separates it from the next one, while a comma
+    after ``+`` or on its own is the comma key, as in 'ctrl+,'.
+    """
+    is_key = keys.is_key if keys is not None else MULTIWORD_KEYS.__contains__
+    strokes = []
+    current = ''
+    for word in binding.split():
+        separator = False
+        if word == ',' and current and not current.endswith('+'):
+            strokes.append(current)
+            current = ''
+            continue
+        if len(word) > 1 and word.endswith(',') and not word.endswith('+,'):
+            word, separator = word[:-1], True
+        if not current:
+            current = word
+        elif current.endswith('+') or word.startswith('+'):
+            current += word
+        elif is_key(f"{current.rsplit('+', 1)[-1]} {word.split('+', 1)[0]}".lower()):
+            current += ' ' + word
+        else:
+            strokes.append(current)
+            current = word
+        if separator:
+            strokes.append(current)
+            current = ''
+    if current:
+        strokes.append(current)
+    return strokes
+
+
+def parse_sequence(binding, keys=None):
+    """Parse 'ctrl+k ctrl+s' or 'ctrl+k, ctrl+s' into a tuple of strokes
+
+    ``keys`` is a KeyNames resolving key names through scan codes.
+    """
+    parts = split_sequence(binding, keys)
+    if not parts:
+        raise ValueError("Empty key binding")
+    return tuple(parse_stroke(part, keys) for part in parts)
+
+
+class ActionRegistry:
+    """Maps action names used as config keys to their callables"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.actions = {}
+
+    def register(self, name, callback, default=None, label=None):
+        """Register an action with its default binding and display label"""
+        self.actions[name] = (callback, default, label or name)
+
+    def get(self, name):
+        """Return (callback, default, label) for an action, or None"""
+        return self.actions.get(name)
+
+    def items(self):
+        """Iterate over (name, (callback, default, label)) pairs"""
+        return self.actions.items()
+
+    def bindings(self, hotkeys):
+        """Resolve each action's binding from config, falling back to defaults"""
+        resolved = {}
+        for name, (_, default, _) in self.actions.items():
+            binding = hotkeys.get(name, default)
+            if binding:
+                resolved[name] = binding
+        return resolved
+
+
+class _Node:
+    """Trie node keyed by stroke"""
+
+    __slots__ = ('children', 'value', 'label')
+
+    def __init__(self):
+        self.children = {}
+        self.value = None
+        self.label = None
+
+
+class ChordTrie:
+    """Prefix trie of stroke sequences
+
+    A binding that is a prefix of another would fire before the longer
+    one could be typed, so such pairs are reported as shadowing each
+    other.  In every conflict the binding added first wins and the later
+    one is ignored.  ``add`` returns a description of the problem instead
+    of raising so that all problems can be reported at load time.
+    """
+
+    def __init__(self, keys=None):
+        """Initialize an empty trie, resolving key names with a KeyNames"""
+        self.root = _Node()
+        self.size = 0
+        self.keys = keys
+
+    def add(self, binding, value, label):
+        """Add a binding, returning a problem description or None"""
+        try:
+            sequence = parse_sequence(binding, self.keys)
+        except ValueError as e:
+            return f"Invalid binding {binding!r} for {label}: {e}"
+
+        node = self.root
+        for stroke in sequence:
+            if node.value is not None:
+                return f"{label} ({binding}) is shadowed by {node.label}"
+            node = node.children.get(stroke)
+            if node is None:
+                break
+        else:
+            if node.value is not None:
+                return f"{label} ({binding}) conflicts with {node.label}"
+            shadowed = ", ".join(sorted(self._labels(node)))
+            return f"{label} ({binding}) would shadow {shadowed}"
+
+        node = self.root
+        for stroke in sequence:
+            node = node.children.setdefault(stroke, _Node())
+        node.value = value
+        node.label = label
+        self.size += 1
+        return None
+
+    def _labels(self, node):
+        """Collect the labels bound at or below a node"""
+        labels = [node.label] if node.value is not None else []
+        for child in node.children.values():
+            labels.extend(self._labels(child))
+        return labels
+
+
+class ChordMatcher:
+    """Walks a ChordTrie one stroke at a time
+
+    Each ``feed`` is a single dict lookup, so the cost per keystroke does
+    not depend on how many bindings exist.  A partially typed chord is
+    abandoned after ``timeout`` seconds or on a stroke that does not
+    continue it, in which case that stroke is tried as a new chord.
+    """
+
+    def __init__(self, trie, timeout=1.0):
+        """Initialize the matcher at the root of the trie"""
+        self.trie = trie
+        self.timeout = timeout
+        self.node = trie.root
+        self.last_stroke = 0.0
+
+    def reset(self):
+        """Abandon any partially typed chord"""
+        self.node = self.trie.root
+
+    def feed(self, stroke, now=None):
+        """Advance by one stroke and return the bound value when complete"""
+        now = time.monotonic() if now is None else now
+        if self.node is not self.trie.root and now - self.last_stroke > self.timeout:
+            self.node = self.trie.root
+        self.last_stroke = now
+
+        child = self.node.children.get(stroke)
+        if child is None and self.node is not self.trie.root:
+            child = self.trie.root.children.get(stroke)
+        if child is None:
+            self.node = self.trie.root
+            return None
+        if child.value is not None:
+            self.node = self.trie.root
+            return child.value
+        self.node = child
+        return None
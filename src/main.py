@@ -3,14 +3,23 @@ AicodeX - Companion Overlay Code Engine
 Main entry point for the application
 """
 
+import time
+
+_IMPORTS_STARTED = time.perf_counter()
+
+import os
 import sys
 import argparse
-from overlay import OverlayWindow
-from config import Config
-from hotkeys import HotkeyManager
+import multiprocessing
+from instance import InstanceServer, send_command
+
+_IMPORTS_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 
 __version__ = "1.0.0"
 
+# Interval between hotkey latency reports in --debug mode
+DEBUG_REPORT_MS = 30000
+
 
 def main():
     """Main application entry point"""
@@ -28,29 +37,170 @@ def main():
         default="config/default_settings.json",
         help="Path to configuration file"
     )
+    parser.add_argument(
+        "--project-config",
+        type=str,
+        default=None,
+        help="Path to a per-project configuration file layered over --config "
+             "(default: the nearest .aicodex.json from the working directory up)"
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
-        help="Enable debug mode"
+        help="Enable debug mode: runtime metrics, a Debug tab and metrics snapshots"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="JSONL file receiving metrics snapshots in debug mode "
+             "(default: metrics.jsonl next to the configuration file)"
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between metrics snapshots"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report startup phase timings after the first frame and exit"
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=500,
+        help="Startup time budget in milliseconds for --profile-startup"
+    )
+    parser.add_argument(
+        "--toggle",
+        action="store_true",
+        help="Toggle the overlay of the running instance"
+    )
+    parser.add_argument(
+        "--insert",
+        type=str,
+        metavar="NAME",
+        help="Insert a snippet by name through the running instance"
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Reload the configuration of the running instance"
     )
     
     args = parser.parse_args()
     
+    # Forward to a running instance before importing tkinter or keyboard
+    if args.toggle:
+        command = ('toggle',)
+    elif args.insert is not None:
+        command = ('insert', args.insert)
+    elif args.reload:
+        command = ('reload',)
+    else:
+        command = None
+    server = None
+    if not args.profile_startup:
+        reply = send_command(*(command or ('show',)))
+        if reply is not None:
+            if not reply.get('ok'):
+                print(f"Error: {reply.get('error')}")
+                sys.exit(1)
+            return
+        if command is not None:
+            print("AicodeX is not running")
+            sys.exit(1)
+        server = InstanceServer()
+        try:
+            bound = server.bind()
+        except OSError as e:
+            print(f"Error claiming the AicodeX instance: {e}")
+            sys.exit(1)
+        if not bound:
+            print("Another AicodeX instance is starting")
+            sys.exit(1)
+    
+    # Release the socket or port file even if startup fails
+    try:
+        run(args, server)
+    finally:
+        if server is not None:
+            server.close()
+
+
+def run(args, server):
+    """Start the overlay and run it until it is closed"""
+    imports_started = time.perf_counter()
+    from overlay import OverlayWindow
+    from config import Config, find_project_config
+    from hotkeys import HotkeyManager
+    from startup_profiler import StartupProfiler
+    from metrics import metrics
+    imports_seconds = _IMPORTS_SECONDS + time.perf_counter() - imports_started
+    
+    profiler = StartupProfiler(budget_ms=args.startup_budget, started=_IMPORTS_STARTED)
+    profiler.record("imports", imports_seconds)
+    
+    # Metrics stay no-ops unless debugging
+    if args.debug:
+        metrics.enable()
+        metrics_file = args.metrics_file or os.path.join(
+            os.path.dirname(os.path.abspath(args.config)), "metrics.jsonl")
+        metrics.start_writer(metrics_file, args.metrics_interval)
+    
     # Load configuration
-    config = Config(args.config)
+    with profiler.phase("Config.load"):
+        config = Config(args.config, use_cache=True,
+                        project_path=args.project_config or find_project_config())
+    config.enable_write_behind()
     
     # Initialize hotkey manager
     hotkey_manager = HotkeyManager(config)
     
     # Create and run overlay window
-    overlay = OverlayWindow(config, hotkey_manager)
+    with profiler.phase("widget creation"):
+        overlay = OverlayWindow(config, hotkey_manager)
     
     print(f"AicodeX {__version__} starting...")
     print(f"Configuration loaded from: {args.config}")
+    if config.project_path:
+        print(f"Project configuration: {config.project_path}")
     print(f"Debug mode: {args.debug}")
+    if args.debug:
+        print(f"Metrics snapshots: {metrics_file}")
     
     # Register global hotkeys
-    hotkey_manager.register_all()
+    with profiler.phase("HotkeyManager.register_all"):
+        hotkey_manager.register_all()
+    
+    # Commands from later launches run on the Tk loop like hotkeys
+    if server is not None:
+        server.serve(hotkey_manager.dispatcher.post)
+    
+    # Compile the config cache for the next start once the window is up
+    if config.cache_stale:
+        overlay.after_first_frame(config.refresh_cache)
+    
+    if args.debug:
+        latency = hotkey_manager.dispatcher.latency
+        reported = [0]
+        def report_latency():
+            if latency.count != reported[0]:
+                reported[0] = latency.count
+                print(f"Hotkey latency: {latency.summary()}")
+                print(f"Snippet insert latency: {overlay.inserter.summary()}")
+            print(f"UI updates: {overlay.ui.stats()}")
+            overlay.root.after(DEBUG_REPORT_MS, report_latency)
+        overlay.after_first_frame(report_latency)
+    
+    if args.profile_startup:
+        def report_startup():
+            profiler.finish(overlay.first_frame_time)
+            print(profiler.report())
+            overlay.root.quit()
+        overlay.after_first_frame(report_startup)
     
     # Start the overlay application
     try:
@@ -59,8 +209,26 @@ def main():
         print("\nShutting down AicodeX...")
     finally:
         hotkey_manager.unregister_all()
+        overlay.tasks.shutdown()
+        overlay.formatter.close()
+        if overlay.snippet_store is not None:
+            overlay.snippet_store.close()
+        if overlay.clipboard_history is not None:
+            overlay.clipboard_history.close()
+        config.flush()
+        metrics.stop_writer()
+        if args.debug:
+            print(f"Hotkey latency: {hotkey_manager.dispatcher.latency.summary()}")
+            print(f"Snippet insert latency: {overlay.inserter.summary()}")
+            print(f"UI updates: {overlay.ui.stats()}")
         print("AicodeX stopped.")
+    
+    if profiler.over_budget():
+        sys.exit(1)
 
 
 if __name__ == "__main__":
+    # The frozen executable must hand formatter worker processes over
+    # to multiprocessing instead of starting another AicodeX
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,265 @@
+"""
+Runtime metrics for AicodeX
+Counters and latency histograms that cost next to nothing while disabled
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+# Histogram bucket upper bounds in seconds, roughly three per decade
+BUCKETS = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets
+
+    Memory and recording cost are constant however many samples arrive.
+    Percentiles are estimated as the upper bound of the bucket holding
+    them, so they are accurate to the bucket width; ``max`` is exact.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram"""
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        """Record one sample in seconds"""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Return the estimated p-th percentile in seconds"""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self):
+        """Return count, mean, p50, p90, p99 and max, times in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class _NullTimer:
+    """Context manager returned by ``timer`` while metrics are off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Context manager that observes the duration of its block"""
+
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Metrics:
+    """Named counters and latency histograms shared by the whole process
+
+    Everything is a no-op until ``enable`` is called: ``incr`` and
+    ``observe`` return after one attribute check and ``timer`` hands out
+    a shared do-nothing context manager.  Code on the hottest paths, such
+    as the keyboard hook, can check ``enabled`` itself to skip even the
+    call.  Recording takes a lock, since samples arrive from the hook
+    thread, worker threads and the Tk loop.
+    """
+
+    def __init__(self):
+        """Initialize disabled metrics"""
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.started = time.time()
+        self.writer = None
+        self.stop_event = threading.Event()
+
+    def enable(self):
+        """Start collecting metrics"""
+        self.enabled = True
+
+    def incr(self, name, amount=1):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """Record a latency sample in seconds"""
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def gauge(self, name, value):
+        """Set a gauge to its latest value"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.gauges[name] = value
+
+    def timer(self, name):
+        """Return a context manager observing its block's duration under name"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def reset(self):
+        """Drop all recorded values"""
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.gauges.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Return the current values as a JSON-serializable dict"""
+        with self.lock:
+            return {
+                'time': time.time(),
+                'uptime_s': time.time() - self.started,
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'histograms': {name: h.snapshot() for name, h in self.histograms.items()},
+            }
+
+    def write_snapshot(self, path):
+        """Append one snapshot as a JSON line to path"""
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.snapshot(), sort_keys=True) + "\n")
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+    def start_writer(self, path, interval=10.0):
+        """Append a snapshot to path every interval seconds on a background thread"""
+        def run():
+            while not self.stop_event.wait(interval):
+                self.write_snapshot(path)
+        self.stop_event.clear()
+        self.writer = (threading.Thread(target=run, name='metrics', daemon=True), path)
+        self.writer[0].start()
+
+    def stop_writer(self):
+        """Stop the snapshot thread after writing a final snapshot"""
+        if self.writer is None:
+            return
+        thread, path = self.writer
+        self.writer = None
+        self.stop_event.set()
+        thread.join()
+        self.write_snapshot(path)
+
+
+def format_snapshot(snapshot, previous=None):
+    """Format a snapshot as text, with counter rates since a previous one"""
+    elapsed = snapshot['time'] - previous['time'] if previous is not None else 0
+    lines = [f"Uptime: {snapshot['uptime_s']:.0f} s", "", "Counters:"]
+    for name, value in sorted(snapshot['counters'].items()):
+        line = f"  {name:<28}{value:>10}"
+        if elapsed > 0:
+            rate = (value - previous['counters'].get(name, 0)) / elapsed
+            line += f"  {rate:8.1f}/s"
+        lines.append(line)
+    if snapshot.get('gauges'):
+        lines += ["", "Gauges:"]
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f"  {name:<28}{value:>10.1f}")
+    lines += ["", f"  {'Latency (ms)':<28}{'count':>10}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"]
+    for name, h in sorted(snapshot['histograms'].items()):
+        lines.append(f"  {name:<28}{h['count']:>10}{h['p50_ms']:>9.2f}{h['p90_ms']:>9.2f}"
+                     f"{h['p99_ms']:>9.2f}{h['max_ms']:>9.2f}")
+    return "\n".join(lines)
+
+
+def resident_memory():
+    """Return the resident set size of this process in bytes, or None
+
+    Reads ``/proc`` on Linux and the working set on Windows; other
+    platforms only expose the peak, which cannot show memory being
+    released, so they report None.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+# Process-wide metrics, enabled by --debug
+metrics = Metrics()
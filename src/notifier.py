@@ -0,0 +1,136 @@
+"""
+Notifications for AicodeX
+One reusable message window with a bounded, coalescing queue
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+
+class NotificationQueue:
+    """Bounded queue of messages that merges duplicates
+
+    A message equal to the one on screen or to one already waiting only
+    raises that entry's count.  When ``max_pending`` messages are
+    waiting, the oldest is dropped to make room.
+    """
+
+    def __init__(self, max_pending=10):
+        """Initialize an empty queue"""
+        self.max_pending = max_pending
+        self.pending = OrderedDict()
+        self.current = None
+        self.count = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def push(self, message):
+        """Queue a message; returns True if the message on screen changed"""
+        if message == self.current:
+            self.count += 1
+            self.coalesced += 1
+            return True
+        if message in self.pending:
+            self.pending[message] += 1
+            self.coalesced += 1
+            return False
+        if self.current is None:
+            self.current, self.count = message, 1
+            return True
+        if len(self.pending) >= self.max_pending:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self.pending[message] = 1
+        return False
+
+    def advance(self):
+        """Move to the next waiting message; returns it, or None when empty"""
+        if self.pending:
+            self.current, self.count = self.pending.popitem(last=False)
+        else:
+            self.current, self.count = None, 0
+        return self.current
+
+
+class Notifier:
+    """Shows messages one at a time in a single reused window
+
+    The window and its widgets are created on the first message and then
+    only shown, refilled and hidden, so the number of Tk objects does not
+    grow with the number of messages.  Each message stays up for
+    ``duration_ms``, restarted when a duplicate arrives, or until
+    dismissed, and then the next waiting message is shown.  The window's
+    buttons go through the UIScheduler ``ui``.
+    """
+
+    def __init__(self, root, ui, duration_ms=4000, max_pending=10, width=300):
+        """Initialize the notifier; the window is built on first use"""
+        self.root = root
+        self.ui = ui
+        self.duration_ms = duration_ms
+        self.width = width
+        self.queue = NotificationQueue(max_pending)
+        self.window = None
+        self.dismiss_job = None
+
+    def show(self, message):
+        """Queue a message for display"""
+        if self.queue.push(message):
+            self._render()
+        elif self.window is not None and self.queue.current is not None:
+            # Queued behind the visible message, only the count changed
+            self._render_detail()
+
+    def dismiss(self):
+        """Hide the current message and show the next one"""
+        if self.dismiss_job is not None:
+            self.root.after_cancel(self.dismiss_job)
+            self.dismiss_job = None
+        if self.queue.advance() is None:
+            if self.window is not None:
+                self.window.withdraw()
+        else:
+            self._render()
+
+    def _build(self):
+        """Create the notification window and its widgets"""
+        self.window = tk.Toplevel(self.root)
+        self.window.withdraw()
+        self.window.title("AicodeX")
+        self.window.attributes('-topmost', True)
+        dismiss = self.ui.wrap('notification_dismiss', self.dismiss)
+        self.window.protocol('WM_DELETE_WINDOW', dismiss)
+
+        self.message_var = tk.StringVar()
+        self.detail_var = tk.StringVar()
+        ttk.Label(self.window, textvariable=self.message_var, wraplength=self.width - 20).pack(padx=10, pady=(15, 5))
+        ttk.Label(self.window, textvariable=self.detail_var).pack()
+        ttk.Button(self.window, text="OK", command=dismiss).pack(pady=(5, 10))
+
+    def _render(self):
+        """Show the current message and restart its timer"""
+        if self.window is None:
+            self._build()
+        self.message_var.set(self.queue.current)
+        self._render_detail()
+
+        if self.window.state() == 'withdrawn':
+            x = self.root.winfo_rootx() + 20
+            y = self.root.winfo_rooty() + 60
+            self.window.geometry(f"{self.width}x120+{x}+{y}")
+            self.window.deiconify()
+
+        if self.dismiss_job is not None:
+            self.root.after_cancel(self.dismiss_job)
+        self.dismiss_job = self.root.after(self.duration_ms, self.dismiss)
+
+    def _render_detail(self):
+        """Show the repeat count and the number of waiting messages"""
+        queue = self.queue
+        details = []
+        if queue.count > 1:
+            details.append(f"x{queue.count}")
+        if queue.pending:
+            details.append(f"{len(queue.pending)} more")
+        self.detail_var.set(", ".join(details))
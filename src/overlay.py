@@ -5,18 +5,69 @@ Creates a transparent overlay that stays on top of other windows
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import gc
+import os
 import platform
+import threading
+import time
+from clipboard_history import ClipboardHistory
+from formatter import FormatEngine
+from metrics import metrics, format_snapshot, resident_memory
+from notifier import Notifier
+from snippet_index import SnippetIndex
+from snippet_insert import (SnippetInserter, activate_window, clipboard_is_sensitive, clipboard_sequence,
+                            foreground_window, window_title)
+from snippet_picker import SnippetPicker
+from snippet_store import SnippetStore, fts5_available
+from snippet_template import expand_snippet, filename_from_title, standard_variables
+from suggestion_popup import SuggestionPopup
+from suggestions import SuggestionEngine, TriggerTrie
+from tasks import Task, TaskExecutor
+from ui_scheduler import UIScheduler
+from snippet_view import VirtualSnippetList
 
 
 class OverlayWindow:
     """Main overlay window for AicodeX"""
     
+    # Maximum number of snippets shown for a search query
+    SNIPPET_SEARCH_LIMIT = 200
+    # Interval between config file checks
+    CONFIG_POLL_MS = 1000
+    # Time the target application gets to copy a selection for formatting
+    COPY_DELAY_MS = 60
+    # Interval between Debug tab refreshes
+    DEBUG_REFRESH_MS = 1000
+    # Interval between clipboard checks for the history
+    CLIPBOARD_POLL_MS = 500
+    # Attributes that only exist while their tab is built, dropped with the widgets
+    TAB_WIDGETS = (
+        'snippet_query', 'snippet_list',
+        'history_query', 'history_list',
+        'task_status', 'task_progress', 'task_cancel',
+        'opacity_var', 'hotkeys_text',
+        'debug_tab', 'debug_text', 'debug_snapshot',
+    )
+    
     def __init__(self, config, hotkey_manager):
         """Initialize the overlay window"""
         self.config = config
         self.hotkey_manager = hotkey_manager
         self.root = tk.Tk()
         self.visible = True
+        self.first_frame_done = False
+        self.first_frame_time = None
+        self.first_frame_callbacks = []
+        self.root.bind('<Map>', self._on_map, add='+')
+        # Widget callbacks go through the scheduler, at most one per frame per key
+        self.ui = UIScheduler(self.root)
+        self.notifier = Notifier(self.root, self.ui)
+        # Low-memory mode: the widget tree is destroyed after a while hidden
+        # and rebuilt from saved_ui on the next show
+        self.widgets_released = False
+        self.release_job = None
+        self.debug_job = None
+        self.saved_ui = {}
         self.setup_window()
         self.create_widgets()
         
@@ -24,19 +75,10 @@ class OverlayWindow:
         """Configure the main window properties"""
         self.root.title("AicodeX - Code Companion")
         
-        # Get window settings from config
-        settings = self.config.get('window', {})
-        width = settings.get('width', 400)
-        height = settings.get('height', 600)
-        x_pos = settings.get('x_position', 100)
-        y_pos = settings.get('y_position', 100)
-        
-        self.root.geometry(f"{width}x{height}+{x_pos}+{y_pos}")
-        
-        # Set window properties for overlay
-        opacity = settings.get('opacity', 0.95)
-        self.root.attributes('-alpha', opacity)
+        # Size, position and opacity come from config
+        self.apply_window_settings()
         self.root.attributes('-topmost', True)
+        self.apply_theme()
         
         # Set window style (Windows-specific)
         if platform.system() == 'Windows':
@@ -45,13 +87,87 @@ class OverlayWindow:
             except tk.TclError:
                 pass
         
-        # Bind hotkey manager callbacks
+        # Bind hotkey manager callbacks, dispatched from the Tk loop
         self.hotkey_manager.set_toggle_callback(self.toggle_visibility)
+        self.hotkey_manager.set_snippet_callback(self.insert_snippet)
+        self.inserter = SnippetInserter(self.root, self.hotkey_manager.send_paste,
+                                        send_cursor=self.hotkey_manager.send_cursor)
+        self.template_variables = standard_variables(
+            clipboard=self.inserter.user_clipboard,
+            filename=lambda: filename_from_title(window_title(foreground_window()))
+        )
+        self.snippet_picker = None
+        self.snippet_store = None
+        self.handbrake_checker = None
+        
+        # Copied text is recorded by polling, the History tab shows it
+        self.clipboard_history = self.open_clipboard_history()
+        self.clipboard_seen = None
+        self.clipboard_sequence = None
+        if self.clipboard_history is not None:
+            self.after_first_frame(self.poll_clipboard)
+        
+        # Actions run on a worker pool and report back on the Tk loop
+        self.tasks = TaskExecutor()
+        self.tasks.add_listener(lambda task: self.ui.schedule('task_status', self.show_task_status, task))
+        self.tasks.start(self.root)
+        
+        # Warm formatter worker, results come back through the dispatcher
+        self.formatter = FormatEngine(
+            options=self.config.get('formatter.options', {}),
+            timeout=self.config.get('formatter.timeout', 5.0)
+        )
+        self.hotkey_manager.set_format_callback(self.format_selection)
+        dispatcher = self.hotkey_manager.dispatcher
+        dispatcher.register('format_result', self.on_format_result, dispatcher.COALESCE_NONE)
+        dispatcher.register('snippet_postings', self.adopt_snippet_postings, dispatcher.COALESCE_NONE)
+        self.after_first_frame(self.formatter.start)
+        
+        # Snippet suggestions follow the key stream when enabled in features
+        self.suggestions = SuggestionEngine()
+        self.suggestion_popup = None
+        self.hotkey_manager.dispatcher.register(
+            'suggestions', lambda snippet_ids: self.ui.schedule('suggestions', self.show_suggestions, snippet_ids))
+        self.hotkey_manager.register_action(
+            'accept_suggestion', self.accept_suggestion, 'ctrl+shift+space', "Accept Suggestion")
+        self.after_first_frame(self.update_suggestions)
+        self.hotkey_manager.dispatcher.start(self.root)
+        
+        # Apply config file edits live, starting once the window is up
+        self.config.add_listener(self.apply_config_changes)
+        self.hotkey_manager.dispatcher.register('reload_config', self.reload_config)
+        self.hotkey_manager.dispatcher.register('show_overlay', self.show)
+        self.after_first_frame(self.poll_config)
+        
+    def apply_window_settings(self):
+        """Apply window geometry and opacity from config"""
+        # Get window settings from config
+        width = self.config.get('window.width', 400)
+        height = self.config.get('window.height', 600)
+        x_pos = self.config.get('window.x_position', 100)
+        y_pos = self.config.get('window.y_position', 100)
         
-    def create_widgets(self):
-        """Create the UI widgets"""
+        self.root.geometry(f"{width}x{height}+{x_pos}+{y_pos}")
+        
+        # Set window properties for overlay
+        opacity = self.config.get('window.opacity', 0.95)
+        self.root.attributes('-alpha', opacity)
+        
+    def apply_theme(self):
+        """Apply theme colors from config"""
+        background = self.config.get('theme.background', '#2b2b2b')
+        foreground = self.config.get('theme.foreground', '#ffffff')
+        accent = self.config.get('theme.accent', '#007acc')
+        
+        style = ttk.Style(self.root)
+        style.configure('.', background=background, foreground=foreground)
+        style.map('TNotebook.Tab', background=[('selected', accent)])
+        self.root.configure(background=background)
+        
+    def create_widgets(self, selected_tab=0):
+        """Create the UI widgets with the tab at index selected_tab shown"""
         # Main frame
-        main_frame = ttk.Frame(self.root, padding="10")
+        self.main_frame = main_frame = ttk.Frame(self.root, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Title label
@@ -62,24 +178,23 @@ class OverlayWindow:
         )
         title_label.grid(row=0, column=0, pady=(0, 10), sticky=tk.W)
         
-        # Notebook for tabs
-        notebook = ttk.Notebook(main_frame)
-        notebook.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Code snippets tab
-        snippets_frame = ttk.Frame(notebook, padding="5")
-        notebook.add(snippets_frame, text="Snippets")
-        self.create_snippets_tab(snippets_frame)
-        
-        # Quick actions tab
-        actions_frame = ttk.Frame(notebook, padding="5")
-        notebook.add(actions_frame, text="Actions")
-        self.create_actions_tab(actions_frame)
-        
-        # Settings tab
-        settings_frame = ttk.Frame(notebook, padding="5")
-        notebook.add(settings_frame, text="Settings")
-        self.create_settings_tab(settings_frame)
+        # Notebook for tabs, each tab is built the first time it is selected
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.tab_builders = {}
+        self.add_tab("Snippets", self.create_snippets_tab)
+        if self.clipboard_history is not None:
+            self.add_tab("History", self.create_history_tab)
+        self.add_tab("Actions", self.create_actions_tab)
+        self.add_tab("Settings", self.create_settings_tab)
+        if metrics.enabled:
+            self.debug_tab = self.add_tab("Debug", self.create_debug_tab)
+        tabs = self.notebook.tabs()
+        if 0 < selected_tab < len(tabs):
+            self.notebook.select(tabs[selected_tab])
+        self.notebook.bind('<<NotebookTabChanged>>', self.ui.wrap('tab', lambda e: self.build_tab(self.notebook.select())))
+        self.build_tab(self.notebook.select())
         
         # Configure grid weights for resizing
         self.root.columnconfigure(0, weight=1)
@@ -87,36 +202,230 @@ class OverlayWindow:
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(1, weight=1)
         
+    def add_tab(self, title, builder):
+        """Add a notebook tab whose contents are built on first selection"""
+        frame = ttk.Frame(self.notebook, padding="5")
+        self.notebook.add(frame, text=title)
+        self.tab_builders[str(frame)] = (frame, builder)
+        return frame
+        
+    def build_tab(self, tab_id):
+        """Build a tab's widgets if they have not been built yet"""
+        entry = self.tab_builders.pop(tab_id, None)
+        if entry is not None:
+            frame, builder = entry
+            builder(frame)
+            
+    def after_first_frame(self, callback):
+        """Run a callback once the window has been mapped and drawn"""
+        if self.first_frame_done:
+            self.root.after_idle(callback)
+        else:
+            self.first_frame_callbacks.append(callback)
+        
+    def _on_map(self, event):
+        """Run deferred work after the first frame is on screen"""
+        if event.widget is not self.root or self.first_frame_done:
+            return
+        self.first_frame_done = True
+        self.first_frame_time = time.perf_counter()
+        self.root.after_idle(self._run_first_frame_callbacks)
+        
+    def _run_first_frame_callbacks(self):
+        """Run and clear the callbacks waiting for the first frame"""
+        callbacks, self.first_frame_callbacks = self.first_frame_callbacks, []
+        for callback in callbacks:
+            callback()
+            
     def create_snippets_tab(self, parent):
         """Create the code snippets tab"""
         # Snippet list
         list_frame = ttk.Frame(parent)
         list_frame.pack(fill=tk.BOTH, expand=True)
         
-        snippets = self.config.get('snippets', [])
+        self.ensure_snippet_index()
         
         ttk.Label(list_frame, text="Code Snippets:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(0, 5))
         
-        # Scrolled text for displaying snippets
-        snippet_text = scrolledtext.ScrolledText(list_frame, height=15, wrap=tk.WORD)
-        snippet_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Add default snippets
-        if not snippets:
-            snippet_text.insert(tk.END, "# Python Function Template\n")
-            snippet_text.insert(tk.END, "def function_name(param):\n")
-            snippet_text.insert(tk.END, "    \"\"\"Docstring\"\"\"\n")
-            snippet_text.insert(tk.END, "    pass\n\n")
-            
-            snippet_text.insert(tk.END, "# JavaScript Function Template\n")
-            snippet_text.insert(tk.END, "function functionName(param) {\n")
-            snippet_text.insert(tk.END, "    // Comment\n")
-            snippet_text.insert(tk.END, "    return value;\n")
-            snippet_text.insert(tk.END, "}\n")
+        # Search box, re-queried on every keystroke
+        restore = self.saved_ui.pop('snippets', None)
+        self.snippet_query = tk.StringVar(value=restore['query'] if restore else '')
+        search_entry = ttk.Entry(list_frame, textvariable=self.snippet_query)
+        search_entry.pack(fill=tk.X, pady=(0, 5))
+        self.snippet_query.trace_add('write', self.ui.wrap('snippet_search', lambda *args: self.refresh_snippets()))
+        
+        # Virtualized list, only the visible rows are ever filled
+        self.snippet_list = VirtualSnippetList(
+            list_frame,
+            label=lambda snippet_id: self.snippet_index.get(snippet_id).get('name', 'Unnamed'),
+            load_body=lambda snippet_id: self.expand_snippet(self.snippet_index.get(snippet_id)),
+            ui=self.ui,
+            key='snippet_list'
+        )
+        self.refresh_snippets()
+        if restore:
+            self.snippet_list.restore_view(restore['view'])
+        
+    def ensure_snippet_index(self):
+        """Create the snippet index shared by the Snippets tab and the picker"""
+        if hasattr(self, 'snippet_index'):
+            return self.snippet_index
+        # A configured SQLite store replaces the in-memory index entirely
+        self.snippet_store = self.open_snippet_store()
+        if self.snippet_store is not None:
+            self.snippet_index = self.snippet_store
+            self.hotkey_manager.set_snippet_store(self.snippet_store)
+            return self.snippet_index
+        snippets = self.config.get('snippets', [])
+        if snippets:
+            # Reuse the index postings compiled into the config cache, which
+            # only cover the user file's snippets
+            postings = self.config.snippet_postings if snippets is self.config.settings.get('snippets') else None
+            self.snippet_index = SnippetIndex(snippets, postings=postings)
         else:
-            for snippet in snippets:
-                snippet_text.insert(tk.END, f"# {snippet.get('name', 'Unnamed')}\n")
-                snippet_text.insert(tk.END, f"{snippet.get('code', '')}\n\n")
+            self.snippet_index = SnippetIndex(self.config.get_default_settings()['snippets'])
+        # Search postings are not needed to draw the list, build them on a
+        # worker once the window is up so no keystroke waits for them
+        self.after_first_frame(self.index_snippets)
+        return self.snippet_index
+        
+    def index_snippets(self):
+        """Build the snippet search postings off the Tk thread"""
+        index = self.snippet_index
+        ids = index.start_build()
+        if ids is None:
+            return
+        def build():
+            postings = index.build_postings(ids)
+            self.hotkey_manager.dispatcher.post('snippet_postings', index, ids, postings)
+        threading.Thread(target=build, name='snippet-index', daemon=True).start()
+        
+    def adopt_snippet_postings(self, index, ids, postings):
+        """Swap in built postings and redo a search made while they were missing"""
+        if index is self.snippet_index and index.adopt_postings(ids, postings):
+            if hasattr(self, 'snippet_list') and self.snippet_query.get().strip():
+                self.refresh_snippets()
+        
+    def open_snippet_store(self):
+        """Open the snippet store configured under snippet_store, if any
+        
+        A new store is filled once from the config snippets; after that
+        the store is the snippet library and config edits to snippets no
+        longer reach the overlay's lists or the snippet hotkeys.
+        """
+        path = self.config.get('snippet_store.path')
+        if not path:
+            return None
+        if not fts5_available():
+            print("Snippet store needs SQLite with FTS5, using config snippets")
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(self.config.config_path)), path)
+        try:
+            store = SnippetStore(path)
+            imported = store.import_initial(self.config.get('snippets') or [])
+            if imported is not None:
+                print(f"Imported {imported} snippets into {path}")
+        except Exception as e:
+            print(f"Error opening snippet store: {e}")
+            return None
+        return store
+        
+    def refresh_snippets(self):
+        """Show the snippets matching the current search query"""
+        if not hasattr(self, 'snippet_list'):
+            return
+        query = self.snippet_query.get()
+        if query.strip():
+            snippet_ids = self.snippet_index.search(query, limit=self.SNIPPET_SEARCH_LIMIT)
+        else:
+            snippet_ids = self.snippet_index.ids()
+        self.snippet_list.set_items(snippet_ids)
+        
+    def open_clipboard_history(self):
+        """Create the clipboard history, saved under clipboard_history.path if set"""
+        if not self.config.get('clipboard_history.enabled', False):
+            return None
+        max_bytes = int(self.config.get('clipboard_history.max_kb', 4096) * 1024)
+        path = self.config.get('clipboard_history.path')
+        if path and not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(self.config.config_path)), path)
+        return ClipboardHistory(path or None, max_bytes=max_bytes, max_entry_bytes=min(max_bytes, 1024 * 1024))
+        
+    def create_history_tab(self, parent):
+        """Create the clipboard history tab"""
+        ttk.Label(parent, text="Clipboard History:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(0, 5))
+        
+        # Filter box, re-applied on every keystroke
+        restore = self.saved_ui.pop('history', None)
+        self.history_query = tk.StringVar(value=restore['query'] if restore else '')
+        ttk.Entry(parent, textvariable=self.history_query).pack(fill=tk.X, pady=(0, 5))
+        self.history_query.trace_add('write', self.ui.wrap('history_search', lambda *args: self.refresh_history()))
+        
+        buttons = ttk.Frame(parent)
+        buttons.pack(fill=tk.X, side=tk.BOTTOM, pady=(5, 0))
+        for label, command in (("Copy", self.copy_history_entry),
+                               ("Delete", self.delete_history_entry),
+                               ("Clear", self.clear_history)):
+            ttk.Button(buttons, text=label, command=self.ui.wrap(f"history_{label}", command)).pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.history_list = VirtualSnippetList(parent, label=lambda entry: entry.label(), load_body=lambda entry: entry.text(),
+                                               ui=self.ui, key='history_list', on_activate=self.copy_history_entry)
+        self.refresh_history()
+        if restore:
+            self.history_list.restore_view(restore['view'])
+        
+    def refresh_history(self):
+        """Show the clipboard history entries matching the filter"""
+        if not hasattr(self, 'history_list'):
+            return
+        self.history_list.set_items(self.clipboard_history.search(self.history_query.get()))
+        
+    def poll_clipboard(self):
+        """Record new clipboard text in the history and schedule the next check"""
+        self.root.after(self.CLIPBOARD_POLL_MS, self.poll_clipboard)
+        # The inserter has a snippet or a copied selection on the clipboard
+        if self.inserter.holding:
+            return
+        sequence = clipboard_sequence()
+        if sequence is not None and sequence == self.clipboard_sequence:
+            return
+        self.clipboard_sequence = sequence
+        # Password managers mark secrets so that histories skip them
+        if clipboard_is_sensitive(self.root):
+            return
+        text = self.inserter.read_clipboard()
+        if not text or text == self.clipboard_seen:
+            return
+        self.clipboard_seen = text
+        if self.clipboard_history.add(text) is not None:
+            metrics.gauge('clipboard.history_kb', self.clipboard_history.total_bytes / 1024)
+            self.refresh_history()
+            
+    def copy_history_entry(self):
+        """Put the selected history entry back on the clipboard"""
+        entry = self.history_list.selected_item()
+        if entry is None:
+            return
+        text = entry.text()
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        self.clipboard_seen = text
+        self.clipboard_history.add(text)
+        self.refresh_history()
+        self.show_message("Copied to clipboard")
+        
+    def delete_history_entry(self):
+        """Remove the selected entry from the clipboard history"""
+        entry = self.history_list.selected_item()
+        if entry is not None:
+            self.clipboard_history.remove(entry.digest)
+            self.refresh_history()
+            
+    def clear_history(self):
+        """Remove every clipboard history entry"""
+        self.clipboard_history.clear()
+        self.refresh_history()
         
     def create_actions_tab(self, parent):
         """Create the quick actions tab"""
@@ -125,18 +434,69 @@ class OverlayWindow:
         
         ttk.Label(actions_frame, text="Quick Actions:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(0, 10))
         
-        # Add action buttons
+        # Add action buttons, each runs in the background
         actions = [
             ("Check HandBrake Version", self.check_handbrake),
-            ("Format Code", lambda: self.show_message("Format code action")),
-            ("Generate Docstring", lambda: self.show_message("Generate docstring action")),
-            ("Refactor Selection", lambda: self.show_message("Refactor action")),
+            ("Download HandBrake", self.download_handbrake),
+            ("Format Code", self.format_clipboard),
+            ("Generate Docstring", lambda: self.run_action("Generate Docstring", lambda task: "Generate docstring action")),
+            ("Refactor Selection", lambda: self.run_action("Refactor Selection", lambda task: "Refactor action")),
         ]
         
         for action_name, action_func in actions:
-            btn = ttk.Button(actions_frame, text=action_name, command=action_func)
+            btn = ttk.Button(actions_frame, text=action_name, command=self.ui.wrap(action_name, action_func))
             btn.pack(fill=tk.X, pady=2)
             
+        # Status area for background actions
+        status_frame = ttk.Frame(actions_frame)
+        status_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=(10, 0))
+        self.task_status = tk.StringVar(value="Ready")
+        ttk.Label(status_frame, textvariable=self.task_status, wraplength=360).pack(anchor=tk.W)
+        self.task_progress = ttk.Progressbar(status_frame, maximum=100)
+        self.task_progress.pack(fill=tk.X, pady=2)
+        self.task_cancel = ttk.Button(status_frame, text="Cancel", command=self.ui.wrap('task_cancel', self.tasks.cancel_all), state=tk.DISABLED)
+        self.task_cancel.pack(anchor=tk.E)
+        
+    def run_action(self, label, fn, *args, on_done=None, on_error=None):
+        """Run an action in the background, one at a time per action"""
+        task = self.tasks.submit(
+            label, fn, *args,
+            on_done=on_done or self.show_message,
+            on_error=on_error or (lambda e: self.show_message(f"{label} failed: {e}"))
+        )
+        if task is None and hasattr(self, 'task_status'):
+            self.task_status.set(f"{label} is already running")
+        return task
+        
+    def show_task_status(self, task):
+        """Show background action progress in the Actions tab"""
+        if not hasattr(self, 'task_status'):
+            return
+        running = self.tasks.running()
+        if not running:
+            if task.state == Task.FAILED:
+                self.task_status.set(f"{task.label} failed: {task.error}")
+            else:
+                self.task_status.set(f"{task.label}: {task.state}")
+            self.task_progress.stop()
+            self.task_progress.config(mode='determinate', value=0)
+            self.task_cancel.config(state=tk.DISABLED)
+            return
+        
+        current = running[-1] if task.finished else task
+        text = f"{current.label}: {current.message}" if current.message else f"{current.label}..."
+        if len(running) > 1:
+            text += f" (+{len(running) - 1} more)"
+        self.task_status.set(text)
+        if current.progress is None:
+            if str(self.task_progress.cget('mode')) != 'indeterminate':
+                self.task_progress.config(mode='indeterminate')
+                self.task_progress.start(20)
+        else:
+            self.task_progress.stop()
+            self.task_progress.config(mode='determinate', value=current.progress * 100)
+        self.task_cancel.config(state=tk.NORMAL)
+        
     def create_settings_tab(self, parent):
         """Create the settings tab"""
         settings_frame = ttk.Frame(parent)
@@ -149,58 +509,331 @@ class OverlayWindow:
         opacity_frame.pack(fill=tk.X, pady=5)
         ttk.Label(opacity_frame, text="Opacity:").pack(side=tk.LEFT)
         
-        opacity_var = tk.DoubleVar(value=self.config.get('window', {}).get('opacity', 0.95) * 100)
+        self.opacity_var = tk.DoubleVar(value=self.config.get('window.opacity', 0.95) * 100)
         opacity_scale = ttk.Scale(
             opacity_frame,
             from_=50,
             to=100,
-            variable=opacity_var,
+            variable=self.opacity_var,
             orient=tk.HORIZONTAL,
-            command=lambda v: self.set_opacity(float(v) / 100)
+            command=self.ui.wrap('opacity', lambda v: self.set_opacity(float(v) / 100))
         )
         opacity_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
         # Hotkeys display
         ttk.Label(settings_frame, text="Hotkeys:", font=("Arial", 9, "bold")).pack(anchor=tk.W, pady=(10, 5))
         
+        self.hotkeys_text = scrolledtext.ScrolledText(settings_frame, height=8, wrap=tk.WORD)
+        self.hotkeys_text.pack(fill=tk.BOTH, expand=True)
+        self.refresh_hotkeys_text()
+        
+    def create_debug_tab(self, parent):
+        """Create the debug tab showing live runtime metrics"""
+        ttk.Label(parent, text="Runtime Metrics:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(0, 5))
+        self.debug_text = scrolledtext.ScrolledText(parent, wrap=tk.NONE, font=("Courier", 9))
+        self.debug_text.pack(fill=tk.BOTH, expand=True)
+        self.debug_snapshot = None
+        self.refresh_debug_tab()
+        
+    def refresh_debug_tab(self):
+        """Redraw the metrics while the debug tab is shown"""
+        self.debug_job = None
+        if not hasattr(self, 'debug_text'):
+            return
+        if self.visible and self.notebook.select() == str(self.debug_tab):
+            snapshot = metrics.snapshot()
+            self.debug_text.config(state=tk.NORMAL)
+            self.debug_text.delete('1.0', tk.END)
+            self.debug_text.insert(tk.END, format_snapshot(snapshot, self.debug_snapshot))
+            self.debug_text.config(state=tk.DISABLED)
+            self.debug_snapshot = snapshot
+        self.debug_job = self.root.after(self.DEBUG_REFRESH_MS, self.refresh_debug_tab)
+        
+    def refresh_hotkeys_text(self):
+        """Show the configured hotkeys in the settings tab"""
         hotkeys = self.config.get('hotkeys', {})
-        hotkeys_text = scrolledtext.ScrolledText(settings_frame, height=8, wrap=tk.WORD)
-        hotkeys_text.pack(fill=tk.BOTH, expand=True)
+        self.hotkeys_text.config(state=tk.NORMAL)
+        self.hotkeys_text.delete('1.0', tk.END)
         
         for action, hotkey in hotkeys.items():
-            hotkeys_text.insert(tk.END, f"{action}: {hotkey}\n")
+            self.hotkeys_text.insert(tk.END, f"{action}: {hotkey}\n")
+        
+        self.hotkeys_text.config(state=tk.DISABLED)
+        
+    def reload_config(self):
+        """Reload the config file on request"""
+        changes = self.config.reload()
+        self.show_message("Configuration reloaded" if changes else "Configuration unchanged")
+        
+    def poll_config(self):
+        """Check the config file for changes and schedule the next check"""
+        self.config.poll()
+        self.root.after(self.CONFIG_POLL_MS, self.poll_config)
+        
+    def apply_config_changes(self, changes):
+        """Apply reloaded config sections without rebuilding the overlay"""
+        if 'window' in changes:
+            self.apply_window_settings()
+            if hasattr(self, 'opacity_var'):
+                self.opacity_var.set(self.config.get('window.opacity', 0.95) * 100)
+        if 'theme' in changes:
+            self.apply_theme()
+        if 'hotkeys' in changes or 'snippets' in changes:
+            self.hotkey_manager.update_hotkeys(self.config.get('hotkeys', {}))
+            if hasattr(self, 'hotkeys_text'):
+                self.refresh_hotkeys_text()
+        if 'snippets' in changes and hasattr(self, 'snippet_index') and self.snippet_store is None:
+            self.snippet_index.sync(changes['snippets'] or self.config.get_default_settings()['snippets'])
+            self.refresh_snippets()
+        if 'features' in changes or 'snippets' in changes:
+            self.update_suggestions()
+        
+    def insert_snippet(self, name=None):
+        """Insert a snippet by name, or open the picker when no name is given"""
+        index = self.ensure_snippet_index()
+        if name is None:
+            if self.snippet_picker is None:
+                self.snippet_picker = SnippetPicker(self.root, index, self.paste_snippet, self.ui)
+            self.snippet_picker.show()
+            return
+        snippet_id = index.find(name)
+        if snippet_id is None:
+            print(f"Snippet not found: {name}")
+            return
+        self.paste_snippet(index.get(snippet_id), self.hotkey_manager.dispatcher.posted_at)
+        
+    def expand_snippet(self, snippet):
+        """Expand a snippet's code, filling template placeholders and variables"""
+        return expand_snippet(snippet, self.config.get('templates.values'), self.template_variables)
+        
+    def paste_snippet(self, snippet, started=None):
+        """Paste a snippet's code into the focused application, selecting its first tab stop"""
+        expansion = self.expand_snippet(snippet)
+        self.inserter.insert(expansion.text, started, expansion.stops[0] if expansion.stops else None)
+        if self.snippet_store is not None and 'id' in snippet:
+            self.snippet_store.record_use(snippet['id'])
+        
+    def update_suggestions(self):
+        """Start, stop or rebuild snippet suggestions to match the config"""
+        if not self.config.get('features.snippet_suggestions', True):
+            self.hotkey_manager.remove_key_listener(self._on_suggestion_key)
+            self.suggestions.reset()
+            if self.suggestion_popup is not None:
+                self.suggestion_popup.hide()
+            return
+        
+        # Snapshot on the Tk thread, the trie is built off it for large libraries
+        items = self.ensure_snippet_index().items()
+        def build():
+            self.suggestions.set_trie(TriggerTrie.from_snippets(items))
+            self.hotkey_manager.add_key_listener(self._on_suggestion_key)
+        threading.Thread(target=build, name='suggestions', daemon=True).start()
+        
+    def _on_suggestion_key(self, key, modifiers):
+        """Feed a key press to the suggestion engine on the hook thread"""
+        if self.suggestions.feed(key, modifiers):
+            self.hotkey_manager.dispatcher.post('suggestions', self.suggestions.matches)
+            
+    def show_suggestions(self, snippet_ids):
+        """Show or hide the suggestion popup on the Tk thread"""
+        if self.suggestion_popup is None:
+            if not snippet_ids:
+                return
+            self.suggestion_popup = SuggestionPopup(
+                self.root,
+                label=lambda snippet_id: self.snippet_index.get(snippet_id).get('name', 'Unnamed'),
+                on_pick=self.accept_suggestion,
+                ui=self.ui
+            )
+        # Drop ids of snippets removed since the suggestion was made
+        self.suggestion_popup.show([i for i in snippet_ids if self.snippet_index.get(i) is not None])
+        
+    def accept_suggestion(self, snippet_id=None):
+        """Replace the typed word with the chosen or first suggested snippet"""
+        popup = self.suggestion_popup
+        if popup is None or not popup.visible:
+            return
+        snippet_id = popup.selected() if snippet_id is None else snippet_id
+        snippet = self.snippet_index.get(snippet_id) if snippet_id is not None else None
+        if snippet is None:
+            return
+        typed = len(self.suggestions.chars)
+        popup.hide()
+        activate_window(popup.target_window)
+        self.hotkey_manager.send_backspace(typed)
+        self.paste_snippet(snippet, self.hotkey_manager.dispatcher.posted_at)
+        
+    def format_selection(self):
+        """Copy the selection in the focused application and format it"""
+        self.inserter.save()
+        self.root.clipboard_clear()
+        self.hotkey_manager.send_copy()
+        self.root.after(self.COPY_DELAY_MS, self._format_copied)
+        
+    def _format_copied(self):
+        """Send the copied selection to the formatter"""
+        code = self.inserter.read_clipboard()
+        if not code:
+            self.inserter.restore()
+            return
+        self.formatter.submit(code, lambda result, error: self.hotkey_manager.dispatcher.post(
+            'format_result', result, error, 'selection'))
+        
+    def format_clipboard(self):
+        """Format the code on the clipboard in place"""
+        code = self.inserter.read_clipboard()
+        if not code:
+            self.show_message("Copy some code to the clipboard to format it")
+            return
+        def run(task):
+            task.on_cancel(self.formatter.cancel)
+            return self.formatter.format(code)
+        self.run_action(
+            "Format Code", run,
+            on_done=lambda result: self.on_format_result(result, None, 'clipboard'),
+            on_error=lambda error: self.on_format_result(None, str(error), 'clipboard')
+        )
         
-        hotkeys_text.config(state=tk.DISABLED)
+    def on_format_result(self, result, error, target):
+        """Apply a formatting result on the Tk thread"""
+        if error is not None:
+            if target == 'selection':
+                self.inserter.restore()
+            self.show_message(f"Format failed: {error}")
+        elif target == 'selection':
+            self.inserter.insert(result)
+        else:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(result)
+            self.show_message("Formatted code copied to clipboard")
+        
+    def show(self):
+        """Show the overlay and bring it to the front"""
+        if self.release_job is not None:
+            self.root.after_cancel(self.release_job)
+            self.release_job = None
+        if self.widgets_released:
+            self.rebuild_widgets()
+        self.root.deiconify()
+        self.root.lift()
+        self.visible = True
+        
+    def hide(self):
+        """Hide the overlay, releasing its widgets if it stays hidden"""
+        self.root.withdraw()
+        self.visible = False
+        # window.low_memory_after is in seconds, 0 keeps the widgets
+        delay = self.config.get('window.low_memory_after', 300)
+        if delay and not self.widgets_released and self.release_job is None:
+            self.release_job = self.root.after(int(delay * 1000), self.release_widgets)
         
     def toggle_visibility(self):
         """Toggle overlay visibility"""
         if self.visible:
-            self.root.withdraw()
-            self.visible = False
+            self.hide()
         else:
-            self.root.deiconify()
-            self.visible = True
+            self.show()
+            
+    def capture_ui_state(self):
+        """Return the selected tab, search queries and list positions as a small dict"""
+        tabs = self.notebook.tabs()
+        selected = self.notebook.select()
+        state = {'tab': tabs.index(selected) if selected in tabs else 0}
+        if hasattr(self, 'snippet_list'):
+            state['snippets'] = {'query': self.snippet_query.get(), 'view': self.snippet_list.view_state()}
+        elif 'snippets' in self.saved_ui:
+            # Released again before the Snippets tab was rebuilt
+            state['snippets'] = self.saved_ui['snippets']
+        if hasattr(self, 'history_list'):
+            state['history'] = {'query': self.history_query.get(), 'view': self.history_list.view_state()}
+        elif 'history' in self.saved_ui:
+            state['history'] = self.saved_ui['history']
+        return state
+        
+    def release_widgets(self):
+        """Destroy the notebook and its tabs while hidden, keeping only the UI state
+        
+        Snippet data, the picker, popups and background workers are kept,
+        so hotkeys keep working; only the overlay's own widget tree goes.
+        """
+        self.release_job = None
+        if self.visible or self.widgets_released:
+            return
+        before = resident_memory()
+        self.saved_ui = self.capture_ui_state()
+        if self.debug_job is not None:
+            self.root.after_cancel(self.debug_job)
+            self.debug_job = None
+        self.main_frame.destroy()
+        for name in self.TAB_WIDGETS:
+            self.__dict__.pop(name, None)
+        self.main_frame = self.notebook = None
+        self.tab_builders = {}
+        self.widgets_released = True
+        # Widget callbacks hold reference cycles back to the overlay
+        gc.collect()
+        after = resident_memory()
+        if after is not None:
+            metrics.gauge('memory.hidden_mb', after / (1024 * 1024))
+            print(f"Overlay widgets released: resident memory {before / (1024 * 1024):.1f} MB"
+                  f" -> {after / (1024 * 1024):.1f} MB")
+        
+    def rebuild_widgets(self):
+        """Recreate the widget tree released while hidden and restore its state"""
+        with metrics.timer('overlay.rebuild'):
+            self.widgets_released = False
+            self.create_widgets(self.saved_ui.get('tab', 0))
+        rss = resident_memory()
+        if rss is not None:
+            metrics.gauge('memory.visible_mb', rss / (1024 * 1024))
+            print(f"Overlay widgets rebuilt: resident memory {rss / (1024 * 1024):.1f} MB")
             
     def set_opacity(self, value):
-        """Set window opacity"""
+        """Set window opacity and persist it"""
         self.root.attributes('-alpha', value)
+        self.config.set('window.opacity', round(value, 2))
+        
+    def get_handbrake_checker(self):
+        """Create the HandBrake checker on first use"""
+        if self.handbrake_checker is None:
+            from utils.handbrake_checker import HandBrakeChecker
+            from utils.release_metadata import ReleaseMetadataProvider
+            # Release info comes from handbrake.metadata_url when configured
+            metadata = ReleaseMetadataProvider(
+                url=self.config.get('handbrake.metadata_url'),
+                cache_path=os.path.join(os.path.dirname(os.path.abspath(self.config.config_path)),
+                                        '.handbrake_release.cache'),
+                ttl=self.config.get('handbrake.metadata_ttl', 3600)
+            )
+            self.handbrake_checker = HandBrakeChecker(metadata=metadata)
+        return self.handbrake_checker
         
     def check_handbrake(self):
         """Check HandBrake version"""
-        from utils.handbrake_checker import HandBrakeChecker
-        checker = HandBrakeChecker()
-        result = checker.check_version()
-        self.show_message(result)
+        checker = self.get_handbrake_checker()
+        self.run_action("Check HandBrake Version", lambda task: checker.check_version())
+        
+    def download_handbrake(self):
+        """Download the HandBrake installer to the Downloads folder"""
+        checker = self.get_handbrake_checker()
+        downloads = os.path.join(os.path.expanduser('~'), 'Downloads')
+        directory = downloads if os.path.isdir(downloads) else os.getcwd()
+        
+        def run(task):
+            def progress(done, total):
+                task.check()
+                task.report(done / total if total else None, f"{done / (1024 * 1024):.1f} MB")
+            info = checker.get_info()
+            destination = os.path.join(directory, f"HandBrake-{info['version']}-x86_64-Win_GUI.exe")
+            if checker.download(destination, progress=progress):
+                return f"HandBrake {info['version']} downloaded to {destination}"
+            task.check()
+            return "HandBrake download failed, try again to resume it"
+        self.run_action("Download HandBrake", run)
         
     def show_message(self, message):
-        """Show a message dialog"""
-        msg_window = tk.Toplevel(self.root)
-        msg_window.title("AicodeX")
-        msg_window.geometry("300x100")
-        msg_window.attributes('-topmost', True)
-        
-        ttk.Label(msg_window, text=message, wraplength=280).pack(pady=20)
-        ttk.Button(msg_window, text="OK", command=msg_window.destroy).pack()
+        """Show a message in the notification window"""
+        self.notifier.show(message)
         
     def run(self):
         """Start the overlay application"""
@@ -0,0 +1,436 @@
+"""
+Snippet search index for AicodeX
+Trigram index over snippet names and code with ranked fuzzy matching
+"""
+
+from itertools import combinations
+
+
+def _trigrams(text):
+    """Return the set of trigrams in a lowercased string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _short_grams(text):
+    """Return the set of one and two character substrings of a string"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def _prefixes(text):
+    """Return the one to three character prefixes of a string"""
+    return {text[:n] for n in range(1, min(len(text), 3) + 1)}
+
+
+def _is_subsequence(query, text):
+    """Check whether all characters of query appear in order in text"""
+    it = iter(text)
+    return all(ch in it for ch in query)
+
+
+class SnippetIndex:
+    """In-memory trigram index over snippet names and code
+
+    Snippets are identified by integer ids handed out by ``add``.  Name and
+    code grams live in separate posting maps so name hits rank above code
+    hits, and results are pulled lazily from the postings until ``limit``
+    is reached, so a keystroke costs roughly O(limit) rather than O(library
+    size).  Adding and removing a snippet only touches its own postings.
+
+    Postings are filled in on the first search rather than in ``add``, so
+    building an index for a large library that is never searched only
+    costs the name lookups the snippet list needs anyway.  ``postings``
+    may be a callable returning pre-built postings for the initial
+    snippets, as produced by ``postings_state``.
+
+    A large library can be indexed off the Tk thread: ``start_build``
+    hands out the pending ids, ``build_postings`` fills new posting maps
+    on a worker thread and ``adopt_postings`` swaps them in.  Searches
+    made meanwhile scan at most ``SCAN_BUDGET`` names instead of
+    building the postings themselves.
+    """
+
+    # Bumped whenever the posting layout changes, invalidating caches
+    INDEX_VERSION = 1
+
+    # Rarest query trigrams paired up by the fuzzy matcher
+    FUZZY_GRAMS = 4
+    # Names scanned per requested result by the abbreviation fallback
+    FUZZY_SCAN_FACTOR = 8
+    # Names scanned by a search made while the postings are being built
+    SCAN_BUDGET = 2000
+
+    def __init__(self, snippets=None, cache_size=64, postings=None):
+        """Initialize the index, optionally with an initial snippet list"""
+        self.snippets = {}
+        self.names = {}
+        self.prefix_postings = {}
+        self.short_postings = {}
+        self.name_postings = {}
+        self.code_postings = {}
+        self.next_id = 0
+        self.pending = {}
+        self.building = None
+        self.built_removed = []
+        self.cache_size = cache_size
+        self._cache = {}
+        for snippet in snippets or []:
+            self.add(snippet)
+        self.postings_loader = postings
+        self.preindexed = self.next_id if postings is not None else 0
+
+    def __len__(self):
+        return len(self.snippets)
+
+    def add(self, snippet):
+        """Add a snippet dict and return its id"""
+        snippet_id = self.next_id
+        self.next_id += 1
+
+        self.snippets[snippet_id] = snippet
+        self.names[snippet_id] = snippet.get('name', '').lower()
+        self.pending[snippet_id] = None
+
+        self._cache.clear()
+        return snippet_id
+
+    def remove(self, snippet_id):
+        """Remove a snippet by id, returning the removed snippet or None"""
+        snippet = self.snippets.pop(snippet_id, None)
+        if snippet is None:
+            return None
+
+        if self.building is not None and snippet_id in self.building:
+            # Its postings are being built, drop them when they are adopted
+            self.built_removed.append((snippet_id, self.names[snippet_id], snippet.get('code', '')))
+        elif snippet_id < self.preindexed and self.postings_loader is not None:
+            self.index_pending()
+
+        name = self.names.pop(snippet_id)
+
+        self._cache.clear()
+        if snippet_id in self.pending:
+            del self.pending[snippet_id]
+            return snippet
+
+        self._discard(self.prefix_postings, _prefixes(name), snippet_id)
+        self._discard(self.short_postings, _short_grams(name), snippet_id)
+        self._discard(self.name_postings, _trigrams(name), snippet_id)
+        self._discard(self.code_postings, _trigrams(snippet.get('code', '').lower()), snippet_id)
+        return snippet
+
+    def sync(self, snippets):
+        """Update the index to match a new snippet list
+
+        Snippets are matched by name and code, so unchanged entries keep
+        their ids and postings.  A matched entry still takes the new dict,
+        so edits to other fields such as ``trigger`` or ``template`` are
+        picked up, and ids follow the order of the new list.  Returns the
+        lists of added and removed ids.
+        """
+        existing = {}
+        for snippet_id, snippet in self.snippets.items():
+            key = (snippet.get('name', ''), snippet.get('code', ''))
+            existing.setdefault(key, []).append(snippet_id)
+
+        order = []
+        new_snippets = []
+        for snippet in snippets:
+            ids = existing.get((snippet.get('name', ''), snippet.get('code', '')))
+            if ids:
+                snippet_id = ids.pop(0)
+                self.snippets[snippet_id] = snippet
+                order.append(snippet_id)
+            else:
+                new_snippets.append(snippet)
+                order.append(None)
+
+        removed = [snippet_id for ids in existing.values() for snippet_id in ids]
+        for snippet_id in removed:
+            self.remove(snippet_id)
+        added = [self.add(snippet) for snippet in new_snippets]
+
+        new_ids = iter(added)
+        order = [next(new_ids) if snippet_id is None else snippet_id for snippet_id in order]
+        self.snippets = {snippet_id: self.snippets[snippet_id] for snippet_id in order}
+        self.names = {snippet_id: self.names[snippet_id] for snippet_id in order}
+        self._cache.clear()
+        return added, removed
+
+    def get(self, snippet_id):
+        """Get a snippet by id"""
+        return self.snippets.get(snippet_id)
+
+    def find(self, name):
+        """Return the id of the snippet with this name, ignoring case, or None"""
+        name = name.strip().lower()
+        for snippet_id, snippet_name in self.names.items():
+            if snippet_name == name:
+                return snippet_id
+        return None
+
+    def ids(self):
+        """Return all snippet ids in list order"""
+        return list(self.snippets)
+
+    def items(self):
+        """Return (id, snippet) pairs in list order"""
+        return list(self.snippets.items())
+
+    def search(self, query, limit=50):
+        """Return up to ``limit`` snippet ids ranked by match quality
+
+        Name prefix matches come first, then name substring matches, then
+        fuzzy name matches, then snippets whose code contains the query.
+        An empty query returns snippets in list order.
+        """
+        query = query.strip().lower()
+        cache_key = (query, limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if query and self.building is not None:
+            # Partial results until the built postings are adopted
+            return self._scan(query, limit)
+        if query:
+            if self.pending:
+                self.index_pending()
+            results = self._search(query, limit)
+        else:
+            results = self._take(self.snippets, limit)
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[cache_key] = results
+        return results
+
+    def index_pending(self):
+        """Fill in the postings of snippets added since the last search"""
+        # Indexing everything here makes a running background build moot
+        self.building = None
+        self.built_removed = []
+        if self.postings_loader is not None:
+            self._load_postings()
+        for snippet_id in self.pending:
+            name = self.names[snippet_id]
+            self._insert(self.prefix_postings, _prefixes(name), snippet_id)
+            self._insert(self.short_postings, _short_grams(name), snippet_id)
+            self._insert(self.name_postings, _trigrams(name), snippet_id)
+            code = self.snippets[snippet_id].get('code', '')
+            self._insert(self.code_postings, _trigrams(code.lower()), snippet_id)
+        self.pending.clear()
+
+    def start_build(self):
+        """Take the pending ids for a background build, or None if there are none"""
+        if not self.pending or self.building is not None:
+            return None
+        self.building = frozenset(self.pending)
+        self.built_removed = []
+        return self.building
+
+    def build_postings(self, ids):
+        """Return new posting maps covering ids; safe to run on a worker thread"""
+        maps = None
+        if self.postings_loader is not None:
+            maps = self.postings_loader()
+        if maps is None:
+            maps = ({}, {}, {}, {})
+        else:
+            ids = [snippet_id for snippet_id in ids if snippet_id >= self.preindexed]
+        prefix_postings, short_postings, name_postings, code_postings = maps
+        for snippet_id in ids:
+            name = self.names.get(snippet_id)
+            snippet = self.snippets.get(snippet_id)
+            if name is None or snippet is None:
+                continue
+            self._insert(prefix_postings, _prefixes(name), snippet_id)
+            self._insert(short_postings, _short_grams(name), snippet_id)
+            self._insert(name_postings, _trigrams(name), snippet_id)
+            self._insert(code_postings, _trigrams(snippet.get('code', '').lower()), snippet_id)
+        return maps
+
+    def adopt_postings(self, ids, maps):
+        """Swap in postings from ``build_postings``; returns False if they are stale"""
+        if self.building is not ids:
+            return False
+        removed = self.built_removed
+        self.building = None
+        self.built_removed = []
+        self.postings_loader = None
+        current = (self.prefix_postings, self.short_postings, self.name_postings, self.code_postings)
+        if any(current):
+            # Snippets indexed meanwhile, merge rather than replace
+            for postings, built in zip(current, maps):
+                for gram, built_ids in built.items():
+                    postings.setdefault(gram, set()).update(built_ids)
+        else:
+            (self.prefix_postings, self.short_postings,
+             self.name_postings, self.code_postings) = maps
+        for snippet_id, name, code in removed:
+            self._discard(self.prefix_postings, _prefixes(name), snippet_id)
+            self._discard(self.short_postings, _short_grams(name), snippet_id)
+            self._discard(self.name_postings, _trigrams(name), snippet_id)
+            self._discard(self.code_postings, _trigrams(code.lower()), snippet_id)
+        for snippet_id in ids:
+            self.pending.pop(snippet_id, None)
+        self._cache.clear()
+        return True
+
+    def _scan(self, query, limit):
+        """Match names by substring, prefixes first, over a bounded number of names"""
+        prefix = []
+        substring = []
+        budget = self.SCAN_BUDGET
+        for snippet_id, name in self.names.items():
+            if name.startswith(query):
+                prefix.append(snippet_id)
+                if len(prefix) >= limit:
+                    break
+            elif query in name:
+                substring.append(snippet_id)
+            budget -= 1
+            if budget <= 0:
+                break
+        return (prefix + substring)[:limit]
+
+    def _load_postings(self):
+        """Adopt pre-built postings covering the initial snippets"""
+        loader, self.postings_loader = self.postings_loader, None
+        state = loader()
+        if state is None:
+            return
+        (self.prefix_postings, self.short_postings,
+         self.name_postings, self.code_postings) = state
+        for snippet_id in range(self.preindexed):
+            self.pending.pop(snippet_id, None)
+
+    def postings_state(self):
+        """Return the posting maps in a form accepted by ``postings``"""
+        self.index_pending()
+        return (self.prefix_postings, self.short_postings,
+                self.name_postings, self.code_postings)
+
+    def _search(self, query, limit):
+        """Collect ranked results bucket by bucket until the limit is hit"""
+        names = self.names
+        results = []
+        seen = set()
+
+        # Name prefix matches
+        for snippet_id in self.prefix_postings.get(query[:3], ()):
+            if names[snippet_id].startswith(query):
+                results.append(snippet_id)
+                seen.add(snippet_id)
+                if len(results) >= limit:
+                    return results
+
+        # Name substring matches
+        if len(query) < 3:
+            candidates = self.short_postings.get(query, ())
+        else:
+            candidates = self._iter_intersection(self.name_postings, _trigrams(query))
+        for snippet_id in candidates:
+            if snippet_id not in seen and query in names[snippet_id]:
+                results.append(snippet_id)
+                seen.add(snippet_id)
+                if len(results) >= limit:
+                    return results
+
+        if len(query) < 3:
+            return results
+
+        grams = _trigrams(query)
+        if not results:
+            for snippet_id in self._fuzzy_names(query, grams, limit):
+                results.append(snippet_id)
+                seen.add(snippet_id)
+
+        # Code matches
+        for snippet_id in self._iter_intersection(self.code_postings, grams):
+            if len(results) >= limit:
+                break
+            if snippet_id not in seen:
+                results.append(snippet_id)
+        return results
+
+    def _fuzzy_names(self, query, grams, limit):
+        """Return names sharing two or more trigrams with the query
+
+        Pairs of the rarest query trigrams are intersected first, which
+        tolerates a typo anywhere in the query while keeping the work
+        proportional to the smallest posting sets.
+        """
+        postings = self.name_postings
+        rarest = sorted((postings[gram] for gram in grams if gram in postings), key=len)
+        matches = []
+        seen = set()
+        for first, second in combinations(rarest[:self.FUZZY_GRAMS], 2):
+            for snippet_id in first:
+                if snippet_id in second and snippet_id not in seen:
+                    matches.append(snippet_id)
+                    seen.add(snippet_id)
+                    if len(matches) >= limit:
+                        return matches
+        if matches:
+            return matches
+
+        # Abbreviations such as "pyfn" share no trigrams with their target,
+        # so scan a bounded number of names starting with the same letter
+        names = self.names
+        budget = limit * self.FUZZY_SCAN_FACTOR
+        for snippet_id in self.prefix_postings.get(query[0], ()):
+            if _is_subsequence(query, names[snippet_id]):
+                matches.append(snippet_id)
+                if len(matches) >= limit:
+                    break
+            budget -= 1
+            if budget <= 0:
+                break
+        return matches
+
+    @staticmethod
+    def _iter_intersection(postings, grams):
+        """Lazily yield ids present in every posting set, smallest set first"""
+        sets = []
+        for gram in grams:
+            ids = postings.get(gram)
+            if not ids:
+                return
+            sets.append(ids)
+        sets.sort(key=len)
+        first, rest = sets[0], sets[1:]
+        for snippet_id in first:
+            if all(snippet_id in ids for ids in rest):
+                yield snippet_id
+
+    @staticmethod
+    def _insert(postings, grams, snippet_id):
+        """Add an id to the posting sets of the given grams"""
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {snippet_id}
+            else:
+                ids.add(snippet_id)
+
+    @staticmethod
+    def _discard(postings, grams, snippet_id):
+        """Remove an id from posting sets and drop empty sets"""
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(snippet_id)
+                if not ids:
+                    del postings[gram]
+
+    @staticmethod
+    def _take(ids, limit):
+        """Return the first ``limit`` ids of an iterable"""
+        results = []
+        for snippet_id in ids:
+            if len(results) >= limit:
+                break
+            results.append(snippet_id)
+        return results
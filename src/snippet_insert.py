@@ -0,0 +1,183 @@
+"""
+Snippet insertion for AicodeX
+Pastes snippet text into the focused application through the clipboard
+"""
+
+import ctypes
+import platform
+import time
+import tkinter as tk
+from dispatch import LatencyRecorder
+from metrics import metrics
+
+
+def foreground_window():
+    """Return a handle to the focused top-level window, or None"""
+    if platform.system() != 'Windows':
+        return None
+    try:
+        return ctypes.windll.user32.GetForegroundWindow() or None
+    except Exception:
+        return None
+
+
+def clipboard_sequence():
+    """Return a counter that changes with every clipboard change, or None where unavailable"""
+    if platform.system() != 'Windows':
+        return None
+    try:
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+    except Exception:
+        return None
+
+
+# Clipboard formats and X11 targets password managers add to secrets
+SENSITIVE_FORMATS = ('ExcludeClipboardContentFromMonitorProcessing', 'Clipboard Viewer Ignore')
+SENSITIVE_TARGETS = ('x-kde-passwordManagerHint',)
+
+
+def clipboard_is_sensitive(root):
+    """Check whether the copying application marked the clipboard as secret"""
+    if platform.system() == 'Windows':
+        try:
+            user32 = ctypes.windll.user32
+            return any(user32.IsClipboardFormatAvailable(user32.RegisterClipboardFormatW(name))
+                       for name in SENSITIVE_FORMATS)
+        except Exception:
+            return False
+    try:
+        targets = root.clipboard_get(type='TARGETS')
+    except tk.TclError:
+        return False
+    if isinstance(targets, str):
+        targets = targets.split()
+    return any(target in SENSITIVE_TARGETS for target in targets)
+
+
+def window_title(handle):
+    """Return the title of a window returned by ``foreground_window``, or None"""
+    if handle is None:
+        return None
+    try:
+        length = ctypes.windll.user32.GetWindowTextLengthW(handle)
+        buffer = ctypes.create_unicode_buffer(length + 1)
+        ctypes.windll.user32.GetWindowTextW(handle, buffer, length + 1)
+        return buffer.value
+    except Exception:
+        return None
+
+
+def activate_window(handle):
+    """Give focus back to a window returned by ``foreground_window``"""
+    if handle is None:
+        return
+    try:
+        ctypes.windll.user32.SetForegroundWindow(handle)
+    except Exception:
+        pass
+
+
+class SnippetInserter:
+    """Inserts text at the cursor of the focused application
+
+    The whole snippet is put on the clipboard and pasted with a single
+    ``send_paste`` keystroke, so a long snippet lands in one operation
+    instead of being typed character by character.  The user's clipboard
+    text is saved first and put back after ``restore_delay_ms``, which
+    gives the target application time to read the pasted text.  Only
+    text can be saved; other clipboard contents are lost.
+
+    Latency is recorded from ``started`` (normally the moment the hotkey
+    was pressed) to the paste being sent and compared to ``target_ms``.
+
+    When ``send_cursor`` is given, a template's first tab stop can be
+    selected after the paste by stepping the cursor back over the text
+    after it.  Stops further back than ``MAX_CURSOR_MOVES`` keystrokes
+    are skipped, leaving the cursor at the end.
+    """
+
+    # Most cursor keystrokes sent to reach a tab stop
+    MAX_CURSOR_MOVES = 400
+
+    def __init__(self, root, send_paste, restore_delay_ms=200, target_ms=50, send_cursor=None):
+        """Initialize the inserter with a Tk root and a paste keystroke sender"""
+        self.root = root
+        self.send_paste = send_paste
+        self.send_cursor = send_cursor
+        self.restore_delay_ms = restore_delay_ms
+        self.target_ms = target_ms
+        self.latency = LatencyRecorder()
+        self.over_target = 0
+        self.saved = None
+        self.holding = False
+        self.restore_job = None
+
+    def save(self):
+        """Save the clipboard text unless it is already saved
+
+        Callers that put something of their own on the clipboard before
+        inserting, such as a copied selection, call this first so that
+        the user's text is what gets restored.
+        """
+        if self.restore_job is not None:
+            # An earlier paste is still pending, keep the user's original text
+            self.root.after_cancel(self.restore_job)
+            self.restore_job = None
+        elif not self.holding:
+            self.saved = self.read_clipboard()
+        self.holding = True
+
+    def insert(self, text, started=None, selection=None):
+        """Paste text into the focused application and return the latency in ms
+
+        ``selection`` is a (start, end) range of text to select after
+        the paste, such as a template tab stop.
+        """
+        started = time.perf_counter() if started is None else started
+        self.save()
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        self.root.update_idletasks()
+        try:
+            self.send_paste()
+        except Exception as e:
+            print(f"Error pasting snippet: {e}")
+            self.restore()
+            return None
+
+        elapsed = time.perf_counter() - started
+        self.latency.record(elapsed)
+        metrics.observe('snippet.insert', elapsed)
+        if elapsed * 1000 > self.target_ms:
+            self.over_target += 1
+        if selection is not None and self.send_cursor is not None:
+            start, end = selection
+            back = len(text) - start
+            if back + end - start <= self.MAX_CURSOR_MOVES:
+                self.send_cursor(back, end - start)
+        self.restore_job = self.root.after(self.restore_delay_ms, self.restore)
+        return elapsed * 1000
+
+    def user_clipboard(self):
+        """Return the user's clipboard text, even while a paste holds the clipboard"""
+        return self.saved if self.holding else self.read_clipboard()
+
+    def read_clipboard(self):
+        """Return the current clipboard text, or None if it holds none"""
+        try:
+            return self.root.clipboard_get()
+        except tk.TclError:
+            return None
+
+    def restore(self):
+        """Put the saved clipboard text back"""
+        self.restore_job = None
+        self.holding = False
+        self.root.clipboard_clear()
+        if self.saved is not None:
+            self.root.clipboard_append(self.saved)
+        self.saved = None
+
+    def summary(self):
+        """Format insertion latency against the target as a single line"""
+        return f"{self.latency.summary()}, {self.over_target} over {self.target_ms} ms target"
@@ -0,0 +1,114 @@
+"""
+Snippet picker for AicodeX
+Small search popup opened by the insert snippet hotkey
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from snippet_insert import activate_window, foreground_window
+
+
+class SnippetPicker:
+    """Borderless search popup that picks a snippet from the index
+
+    The window is built once and only shown and hidden afterwards, so
+    opening it from the hotkey does not create any widgets.  The window
+    that had focus when the picker opened is activated again before
+    ``on_pick`` runs, so the paste lands where the user was typing.
+    Searches and picks go through the UIScheduler ``ui``; the arrow keys
+    move the selection at once and repaint it through the scheduler.
+    """
+
+    def __init__(self, root, index, on_pick, ui, limit=20, width=360):
+        """Initialize the hidden picker"""
+        self.root = root
+        self.index = index
+        self.on_pick = on_pick
+        self.ui = ui
+        self.limit = limit
+        self.width = width
+        self.results = []
+        self.searched = None
+        self.selected = 0
+        self.target_window = None
+
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.attributes('-topmost', True)
+
+        self.query = tk.StringVar()
+        self.entry = ttk.Entry(self.window, textvariable=self.query)
+        self.entry.pack(fill=tk.X, padx=2, pady=2)
+        self.listbox = tk.Listbox(self.window, height=limit // 2, activestyle=tk.NONE, exportselection=False)
+        self.listbox.pack(fill=tk.BOTH, expand=True, padx=2, pady=(0, 2))
+
+        self.query.trace_add('write', ui.wrap('picker_search', lambda *args: self.refresh()))
+        pick = ui.wrap('picker_pick', lambda e: self.pick(), 'break')
+        for widget in (self.entry, self.listbox):
+            widget.bind('<Return>', pick)
+            widget.bind('<Escape>', ui.wrap('picker_hide', lambda e: self.hide(), 'break'))
+            widget.bind('<Up>', lambda e: self.move_selection(-1))
+            widget.bind('<Down>', lambda e: self.move_selection(1))
+        self.listbox.bind('<ButtonRelease-1>', ui.wrap('picker_click', self.on_click))
+        self.listbox.bind('<Double-Button-1>', pick)
+
+    def show(self):
+        """Open the picker next to the mouse pointer"""
+        self.target_window = foreground_window()
+        x, y = self.root.winfo_pointerxy()
+        self.window.geometry(f"{self.width}x240+{x}+{y}")
+        self.query.set('')
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_force()
+
+    def hide(self):
+        """Close the picker without picking"""
+        self.window.withdraw()
+        activate_window(self.target_window)
+        return 'break'
+
+    def refresh(self):
+        """Show the snippets matching the query"""
+        self.searched = self.query.get()
+        self.results = self.index.search(self.searched, limit=self.limit)
+        self.listbox.delete(0, tk.END)
+        for snippet_id in self.results:
+            self.listbox.insert(tk.END, self.index.get(snippet_id).get('name', 'Unnamed'))
+        self.selected = 0
+        if self.results:
+            self.listbox.selection_set(0)
+
+    def move_selection(self, step):
+        """Move the highlighted result up or down"""
+        if not self.results:
+            return 'break'
+        self.selected = min(max(self.selected + step, 0), len(self.results) - 1)
+        self.ui.schedule('picker_selection', self.show_selection)
+        return 'break'
+
+    def show_selection(self):
+        """Highlight the selected result in the listbox"""
+        self.listbox.selection_clear(0, tk.END)
+        if self.results:
+            self.listbox.selection_set(self.selected)
+            self.listbox.see(self.selected)
+
+    def on_click(self, event):
+        """Select the clicked result"""
+        current = self.listbox.curselection()
+        if current:
+            self.selected = current[0]
+
+    def pick(self):
+        """Insert the highlighted snippet into the window that had focus"""
+        if self.query.get() != self.searched:
+            # The search for the last keystroke is still held for the next frame
+            self.refresh()
+        if not self.results:
+            return 'break'
+        snippet = self.index.get(self.results[self.selected])
+        self.hide()
+        self.on_pick(snippet)
+        return 'break'
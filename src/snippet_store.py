@@ -0,0 +1,313 @@
+"""
+SQLite snippet store for AicodeX
+Full-text searchable snippet library ranked by how often snippets are used
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snippets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    code TEXT NOT NULL DEFAULT '',
+    trigger TEXT,
+    hotkey TEXT,
+    extra TEXT,
+    uses INTEGER NOT NULL DEFAULT 0,
+    last_used REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS snippets_usage ON snippets (uses DESC, last_used DESC, id);
+CREATE INDEX IF NOT EXISTS snippets_name ON snippets (name COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(
+    name, code, content='snippets', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS snippets_ai AFTER INSERT ON snippets BEGIN
+    INSERT INTO snippets_fts (rowid, name, code) VALUES (new.id, new.name, new.code);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_ad AFTER DELETE ON snippets BEGIN
+    INSERT INTO snippets_fts (snippets_fts, rowid, name, code) VALUES ('delete', old.id, old.name, old.code);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_au AFTER UPDATE OF name, code ON snippets BEGIN
+    INSERT INTO snippets_fts (snippets_fts, rowid, name, code) VALUES ('delete', old.id, old.name, old.code);
+    INSERT INTO snippets_fts (rowid, name, code) VALUES (new.id, new.name, new.code);
+END;
+"""
+
+# Snippet fields kept in their own columns, anything else goes to extra
+COLUMNS = ('name', 'code', 'trigger', 'hotkey')
+
+# PRAGMA user_version once the config snippets have been imported
+IMPORTED_VERSION = 1
+
+# Most used first, then most recently used, then oldest first
+USAGE_ORDER = "ORDER BY uses DESC, last_used DESC, id"
+
+
+def fts5_available():
+    """Check whether the sqlite3 module was built with FTS5"""
+    try:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def match_expression(query):
+    """Turn a search box query into an FTS5 prefix match on every word"""
+    words = query.split()
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+class SnippetIds:
+    """Lazy, read-only sequence of the snippet ids in the store
+
+    Supports ``len`` and indexing like a list, but only fetches the page
+    of ids around the requested positions, so a virtualized list over a
+    large library never holds more than a page in memory.  The cached
+    length and page are dropped whenever the store changes, since a use
+    or an edit can move rows.
+    """
+
+    PAGE_SIZE = 256
+
+    def __init__(self, store):
+        """Initialize the sequence over the store in usage order"""
+        self.store = store
+        self.version = store.version
+        self.length = None
+        self.page_start = None
+        self.page = []
+
+    def _check(self):
+        """Drop the cached length and page if the store changed since"""
+        if self.version != self.store.version:
+            self.version = self.store.version
+            self.length = None
+            self.page_start = None
+            self.page = []
+
+    def __len__(self):
+        self._check()
+        if self.length is None:
+            self.length = self.store.conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        self._check()
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start = index - index % self.PAGE_SIZE
+        if start != self.page_start:
+            rows = self.store.conn.execute(
+                f"SELECT id FROM snippets {USAGE_ORDER} LIMIT ? OFFSET ?", (self.PAGE_SIZE, start)
+            ).fetchall()
+            self.page_start = start
+            self.page = [row[0] for row in rows]
+        return self.page[index - start]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class SnippetStore:
+    """Snippet library in an SQLite database with FTS5 search
+
+    Offers the lookups of SnippetIndex (``get``, ``find``, ``search``,
+    ``ids``) without keeping the library in memory: searches return ids
+    and rows are read one at a time as they are displayed.  Each insert
+    through ``record_use`` bumps the snippet's use count and timestamp,
+    and both searches and the full listing rank the most used snippets
+    first.  Snippets returned by ``get`` carry their ``id``.  ``version``
+    goes up on every change so lazy id sequences know to refetch.
+    """
+
+    def __init__(self, path):
+        """Open or create the store at path"""
+        self.path = path
+        self.created = path == ':memory:' or not os.path.exists(path)
+        self.version = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def import_snippets(self, snippets):
+        """Add snippets from a config list, skipping ones already stored
+
+        A snippet is already stored when one with the same name and code
+        exists, so importing the same list twice is harmless.  Returns the
+        number of snippets added.
+        """
+        existing = {tuple(row) for row in self.conn.execute("SELECT name, code FROM snippets")}
+        rows = []
+        for snippet in snippets:
+            key = (snippet.get('name', ''), snippet.get('code', ''))
+            if key in existing:
+                continue
+            existing.add(key)
+            rows.append(self._row(snippet))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO snippets (name, code, trigger, hotkey, extra) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        self.version += 1
+        return len(rows)
+
+    def import_pending(self):
+        """Check whether the first import of config snippets has not succeeded yet"""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0] < IMPORTED_VERSION
+
+    def import_initial(self, snippets):
+        """Import config snippets into a store that has not had them yet
+
+        The store is only marked as imported once the snippets are in, so
+        a failed import is tried again on the next start.  Returns the
+        number of snippets added, or None when the import was done before.
+        """
+        if not self.import_pending():
+            return None
+        imported = self.import_snippets(snippets)
+        with self.conn:
+            self.conn.execute(f"PRAGMA user_version = {IMPORTED_VERSION}")
+        return imported
+
+    def hotkeys(self):
+        """Return (name, hotkey) pairs of the snippets that have a hotkey"""
+        rows = self.conn.execute(
+            f"SELECT name, hotkey FROM snippets WHERE hotkey IS NOT NULL AND hotkey != '' {USAGE_ORDER}"
+        )
+        return [(row['name'], row['hotkey']) for row in rows]
+
+    def add(self, snippet):
+        """Add a snippet dict and return its id"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO snippets (name, code, trigger, hotkey, extra) VALUES (?, ?, ?, ?, ?)",
+                self._row(snippet)
+            )
+        self.version += 1
+        return cursor.lastrowid
+
+    def update(self, snippet_id, snippet):
+        """Replace the fields of a stored snippet, keeping its usage"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE snippets SET name = ?, code = ?, trigger = ?, hotkey = ?, extra = ? WHERE id = ?",
+                self._row(snippet) + (snippet_id,)
+            )
+        self.version += 1
+
+    def remove(self, snippet_id):
+        """Remove a snippet by id, returning the removed snippet or None"""
+        snippet = self.get(snippet_id)
+        if snippet is not None:
+            with self.conn:
+                self.conn.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
+            self.version += 1
+        return snippet
+
+    def get(self, snippet_id):
+        """Get a snippet by id"""
+        row = self.conn.execute("SELECT * FROM snippets WHERE id = ?", (snippet_id,)).fetchone()
+        return self._snippet(row) if row is not None else None
+
+    def find(self, name):
+        """Return the id of the snippet with this name, ignoring case, or None"""
+        row = self.conn.execute(
+            f"SELECT id FROM snippets WHERE name = ? COLLATE NOCASE {USAGE_ORDER} LIMIT 1", (name.strip(),)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def ids(self):
+        """Return all snippet ids, most used first, as a lazy sequence"""
+        return SnippetIds(self)
+
+    def items(self):
+        """Return (id, snippet) pairs for building triggers
+
+        The snippets only carry ``name``, ``trigger`` and ``hotkey``; use
+        ``get`` for the code.
+        """
+        rows = self.conn.execute(f"SELECT id, name, trigger, hotkey FROM snippets {USAGE_ORDER}")
+        return [
+            (row['id'], {key: row[key] for key in ('name', 'trigger', 'hotkey') if row[key] is not None})
+            for row in rows
+        ]
+
+    def search(self, query, limit=50):
+        """Return up to ``limit`` ids of snippets matching every query word
+
+        Words match as prefixes of words in the name or code.  Results are
+        ranked by use count, then by recency, then by FTS relevance with
+        name hits weighted above code hits.
+        """
+        expression = match_expression(query)
+        if not expression:
+            return SnippetIds(self)[:limit]
+        rows = self.conn.execute(
+            "SELECT s.id FROM snippets_fts JOIN snippets s ON s.id = snippets_fts.rowid "
+            "WHERE snippets_fts MATCH ? "
+            "ORDER BY s.uses DESC, s.last_used DESC, bm25(snippets_fts, 10.0, 1.0), s.id LIMIT ?",
+            (expression, limit)
+        )
+        return [row[0] for row in rows]
+
+    def record_use(self, snippet_id, when=None):
+        """Count one use of a snippet"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE snippets SET uses = uses + 1, last_used = ? WHERE id = ?",
+                (time.time() if when is None else when, snippet_id)
+            )
+        self.version += 1
+
+    def usage(self, snippet_id):
+        """Return (uses, last_used) for a snippet"""
+        row = self.conn.execute("SELECT uses, last_used FROM snippets WHERE id = ?", (snippet_id,)).fetchone()
+        return (row['uses'], row['last_used']) if row is not None else (0, 0)
+
+    @staticmethod
+    def _row(snippet):
+        """Split a snippet dict into column values"""
+        extra = {key: value for key, value in snippet.items() if key not in COLUMNS and key != 'id'}
+        return (
+            snippet.get('name', ''),
+            snippet.get('code', ''),
+            snippet.get('trigger'),
+            snippet.get('hotkey'),
+            json.dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def _snippet(row):
+        """Build a snippet dict from a database row"""
+        snippet = json.loads(row['extra']) if row['extra'] else {}
+        snippet['name'] = row['name']
+        snippet['code'] = row['code']
+        for key in ('trigger', 'hotkey'):
+            if row[key] is not None:
+                snippet[key] = row[key]
+        snippet['id'] = row['id']
+        return snippet
@@ -0,0 +1,190 @@
+"""
+Snippet templates for AicodeX
+Compiles snippet bodies with placeholders, variables and tab stops into cached render plans
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# $$, $1, $name, ${1}, ${name} and ${1:default} / ${name:default}
+TOKEN = re.compile(r'\$(?:(\$)|(\d+)|([A-Za-z_]\w*)|\{(\d+|[A-Za-z_]\w*)(?::((?:[^\\}]|\\.)*))?\})', re.DOTALL)
+ESCAPE = re.compile(r'\\([\\}])')
+# A file name with an extension inside a window title
+FILENAME = re.compile(r'[\w.-]*\w\.\w{1,8}\b')
+
+# Names resolved from the environment rather than typed by the user
+VARIABLES = frozenset(('DATE', 'TIME', 'YEAR', 'CLIPBOARD', 'FILENAME'))
+
+# Compiled templates kept by source text
+CACHE_SIZE = 512
+
+Field = namedtuple('Field', 'key default variable')
+
+
+class Expansion(namedtuple('Expansion', 'text stops')):
+    """Rendered text and the (start, end) offsets of its tab stops in order"""
+
+    __slots__ = ()
+
+
+class Template:
+    """Snippet body compiled into a render plan
+
+    Syntax, close to editor snippet formats:
+
+    - ``$1``, ``${1}``, ``${1:default}`` - numbered tab stop; ``$0`` is
+      the final cursor position
+    - ``$name``, ``${name:default}`` - named placeholder, filled from
+      the values passed to ``render`` or its default
+    - ``$DATE``, ``${CLIPBOARD:default}`` - variable, see ``VARIABLES``
+    - ``$$`` - a literal dollar sign; ``\\}`` inside a default is a brace
+
+    A ``$`` that starts none of these is kept as written.  A placeholder
+    used more than once mirrors the first value given for it.  Tab stops
+    are ordered by number, then named placeholders in order of first
+    use, then ``$0``.
+
+    Parsing happens once in ``__init__``; ``render`` only looks up the
+    field values and joins the pieces, and templates without fields
+    return their precomputed text.
+    """
+
+    def __init__(self, source):
+        """Compile source into literal pieces and fields"""
+        self.source = source
+        segments = []
+        literal = []
+        defaults = {}
+        variables = set()
+        numbered = set()
+        named = []
+        position = 0
+        for match in TOKEN.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            dollar, number, name, braced, default = match.groups()
+            if dollar:
+                literal.append('$')
+                continue
+            key = number or name or braced
+            default = ESCAPE.sub(r'\1', default) if default is not None else None
+            is_variable = key in VARIABLES
+            if key.isdigit():
+                key = int(key)
+                numbered.add(key)
+            elif is_variable:
+                variables.add(key)
+            elif key not in defaults:
+                named.append(key)
+            if default and not defaults.get(key):
+                defaults[key] = default
+            else:
+                defaults.setdefault(key, default or '')
+            if literal:
+                segments.append(''.join(literal))
+                literal = []
+            segments.append(Field(key, None, is_variable))
+        literal.append(source[position:])
+        if ''.join(literal):
+            segments.append(''.join(literal))
+
+        self.segments = tuple(
+            segment._replace(default=defaults[segment.key]) if isinstance(segment, Field) else segment
+            for segment in segments
+        )
+        self.variables = frozenset(variables)
+        self.stop_order = tuple(sorted(numbered - {0})) + tuple(named) + ((0,) if 0 in numbered else ())
+        self.static = len(self.segments) <= 1 and not self.stop_order and not self.variables
+        self.text = ''.join(self.segments) if self.static else None
+
+    def __repr__(self):
+        return f"Template({self.source!r})"
+
+    def render(self, values=None, variables=None):
+        """Expand the template and return an ``Expansion``
+
+        ``values`` maps tab stop numbers, as ints or digit strings, and
+        placeholder names to text.
+        ``variables`` maps variable names to text or to callables
+        returning text; only the variables the template uses are
+        resolved, and a missing or empty one falls back to its default.
+        """
+        if self.static:
+            return Expansion(self.text, ())
+        resolved = {}
+        for name in self.variables:
+            value = variables.get(name) if variables else None
+            if callable(value):
+                value = value()
+            if value:
+                resolved[name] = value
+        if values:
+            for key, value in values.items():
+                if isinstance(key, str) and key.isdigit():
+                    key = int(key)
+                if key not in self.variables:
+                    resolved[key] = str(value)
+
+        pieces = []
+        stops = {}
+        offset = 0
+        for segment in self.segments:
+            if segment.__class__ is str:
+                pieces.append(segment)
+                offset += len(segment)
+                continue
+            key = segment.key
+            text = resolved.get(key)
+            if text is None:
+                text = resolved[key] = segment.default
+            if not segment.variable and key not in stops:
+                stops[key] = (offset, offset + len(text))
+            pieces.append(text)
+            offset += len(text)
+        return Expansion(''.join(pieces), tuple(stops[key] for key in self.stop_order))
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_template(source):
+    """Return the compiled template for source, compiling it on first use"""
+    with _cache_lock:
+        template = _cache.get(source)
+        if template is not None:
+            _cache.move_to_end(source)
+            return template
+    template = Template(source)
+    with _cache_lock:
+        _cache[source] = template
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return template
+
+
+def expand_snippet(snippet, values=None, variables=None):
+    """Expand a snippet dict's code, as a template when it is marked as one"""
+    code = snippet.get('code', '')
+    if not snippet.get('template'):
+        return Expansion(code, ())
+    return compile_template(code).render(values, variables)
+
+
+def filename_from_title(title):
+    """Return the first file name in a window title, or None"""
+    match = FILENAME.search(title or '')
+    return match.group(0) if match else None
+
+
+def standard_variables(clipboard=None, filename=None):
+    """Return resolvers for ``VARIABLES``; clipboard and filename are callables"""
+    return {
+        'DATE': lambda: time.strftime('%Y-%m-%d'),
+        'TIME': lambda: time.strftime('%H:%M:%S'),
+        'YEAR': lambda: time.strftime('%Y'),
+        'CLIPBOARD': clipboard,
+        'FILENAME': filename,
+    }
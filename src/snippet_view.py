@@ -0,0 +1,203 @@
+"""
+Virtualized snippet list for AicodeX
+Renders only the visible rows of a large snippet library
+"""
+
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+import tkinter.font as tkfont
+
+
+class VirtualSnippetList:
+    """Snippet list that only fills the rows currently on screen
+
+    The list holds a sequence of item ids and a ``label`` callback that
+    maps an id to its row text.  The Listbox only ever contains the
+    visible window of rows and the scrollbar is driven from the item
+    count, so build time and Tk memory do not grow with the library.
+    Snippet bodies are fetched through ``load_body`` when a row is
+    selected and shown in a preview pane.
+
+    Scrolling, resizing and selection only update the offset and the
+    selected index at once; refilling the rows and loading the preview
+    go through the UIScheduler ``ui`` under keys starting with ``key``,
+    so a burst of wheel or scrollbar events renders once per frame.
+    ``on_activate``, if given, runs through the scheduler when a row is
+    double-clicked or Return is pressed.
+    """
+
+    def __init__(self, parent, label, load_body, ui, key='list', on_activate=None, preview_height=8):
+        """Initialize the list inside parent"""
+        self.label = label
+        self.load_body = load_body
+        self.ui = ui
+        self.key = key
+        self.items = []
+        self.offset = 0
+        self.visible_rows = 1
+        self.selected_index = None
+
+        list_frame = ttk.Frame(parent)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.listbox = tk.Listbox(list_frame, activestyle=tk.NONE, exportselection=False)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.preview = scrolledtext.ScrolledText(parent, height=preview_height, wrap=tk.WORD)
+        self.preview.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.preview.config(state=tk.DISABLED)
+        self.preview.tag_configure('tab_stop', underline=True)
+
+        font = tkfont.nametofont(self.listbox.cget('font'))
+        self.row_height = font.metrics('linespace') + 1
+
+        self.listbox.bind('<<ListboxSelect>>', ui.wrap(f"{key}_select", self.on_select))
+        # Wheel steps and resizes must not be dropped or run after the held
+        # render, so they only update the window and schedule the render
+        self.listbox.bind('<Configure>', self.on_resize)
+        self.listbox.bind('<MouseWheel>', self.on_mousewheel)
+        self.listbox.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.listbox.bind('<Button-5>', lambda e: self.scroll(3))
+        self.listbox.bind('<Up>', lambda e: self.move_selection(-1))
+        self.listbox.bind('<Down>', lambda e: self.move_selection(1))
+        self.listbox.bind('<Prior>', lambda e: self.move_selection(-self.visible_rows))
+        self.listbox.bind('<Next>', lambda e: self.move_selection(self.visible_rows))
+        if on_activate is not None:
+            activate = ui.wrap(f"{key}_activate", lambda e: on_activate())
+            self.listbox.bind('<Double-Button-1>', activate)
+            self.listbox.bind('<Return>', activate)
+
+    def set_items(self, items):
+        """Replace the list contents with a new sequence of item ids"""
+        self.items = items
+        self.offset = 0
+        if self.selected_index is not None:
+            self.selected_index = None
+            self.request_body(None)
+        self.request_render()
+
+    def request_render(self):
+        """Render the visible rows, at most once per frame"""
+        self.ui.schedule(f"{self.key}_render", self.render)
+
+    def request_body(self, item):
+        """Show an item's body in the preview, at most once per frame"""
+        self.ui.schedule(f"{self.key}_body", self.show_body, item)
+
+    def render(self):
+        """Fill the listbox with the rows in the visible window"""
+        end = min(self.offset + self.visible_rows, len(self.items))
+        window = self.items[self.offset:end]
+
+        self.listbox.delete(0, tk.END)
+        if window:
+            self.listbox.insert(tk.END, *(self.label(item) for item in window))
+        if self.selected_index is not None and self.offset <= self.selected_index < end:
+            self.listbox.selection_set(self.selected_index - self.offset)
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, end / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, offset):
+        """Move the visible window to start at offset"""
+        max_offset = max(0, len(self.items) - self.visible_rows)
+        offset = max(0, min(int(offset), max_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self.request_render()
+
+    def scroll(self, rows):
+        """Scroll the visible window by a number of rows"""
+        self.scroll_to(self.offset + rows)
+        return 'break'
+
+    def move_selection(self, delta):
+        """Move the selection by delta rows, scrolling to keep it visible"""
+        if not self.items:
+            return 'break'
+        if self.selected_index is None:
+            index = self.offset
+        else:
+            index = self.selected_index + delta
+        index = max(0, min(index, len(self.items) - 1))
+
+        self.selected_index = index
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible_rows:
+            self.offset = index - self.visible_rows + 1
+        self.request_render()
+        self.request_body(self.items[index])
+        return 'break'
+
+    def on_scrollbar(self, *args):
+        """Handle scrollbar drags and clicks"""
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        """Handle mouse wheel scrolling"""
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        """Recompute how many rows fit when the listbox is resized"""
+        rows = max(1, event.height // self.row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.scroll_to(self.offset)
+            self.request_render()
+
+    def on_select(self, event):
+        """Load the body of the selected snippet into the preview"""
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        index = self.offset + selection[0]
+        if index < len(self.items):
+            self.selected_index = index
+            self.request_body(self.items[index])
+
+    def view_state(self):
+        """Return the scroll offset and selected index"""
+        return {'offset': self.offset, 'selected': self.selected_index}
+
+    def restore_view(self, state):
+        """Restore a scroll offset and selection saved with view_state"""
+        selected = state.get('selected')
+        if selected is not None and selected < len(self.items):
+            self.selected_index = selected
+            self.request_body(self.items[selected])
+        self.scroll_to(state.get('offset', 0))
+        self.request_render()
+
+    def selected_item(self):
+        """Return the id of the selected item, or None"""
+        if self.selected_index is None:
+            return None
+        return self.items[self.selected_index]
+
+    def show_body(self, item):
+        """Show the body of an item in the preview pane
+
+        ``load_body`` may return text, or an expanded template whose tab
+        stops are then highlighted.
+        """
+        self.preview.config(state=tk.NORMAL)
+        self.preview.delete('1.0', tk.END)
+        if item is not None:
+            body = self.load_body(item)
+            if isinstance(body, str):
+                self.preview.insert(tk.END, body)
+            else:
+                self.preview.insert(tk.END, body.text)
+                for start, end in body.stops:
+                    self.preview.tag_add('tab_stop', f"1.0 + {start} chars", f"1.0 + {max(end, start + 1)} chars")
+        self.preview.config(state=tk.DISABLED)
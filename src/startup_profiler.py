@@ -0,0 +1,55 @@
+"""
+Startup profiling for AicodeX
+Times the phases of application startup against a budget
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Collects wall-clock timings of named startup phases"""
+
+    def __init__(self, budget_ms=500, started=None):
+        """Initialize the profiler, optionally from an earlier start time"""
+        self.budget_ms = budget_ms
+        self.started = time.perf_counter() if started is None else started
+        self.phases = {}
+        self.total_ms = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with-block as a named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Record time spent in a phase, accumulating repeated phases"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds * 1000
+
+    def finish(self, ended=None):
+        """Mark startup as complete and return the total time in ms"""
+        ended = time.perf_counter() if ended is None else ended
+        self.total_ms = (ended - self.started) * 1000
+        return self.total_ms
+
+    def over_budget(self):
+        """Check whether the finished startup exceeded the budget"""
+        return self.total_ms is not None and self.total_ms > self.budget_ms
+
+    def report(self):
+        """Format the phase timings as a table"""
+        width = max([len(name) for name in self.phases] + [len("first frame")])
+        lines = ["Startup profile:"]
+        for name, ms in self.phases.items():
+            lines.append(f"  {name:<{width}}  {ms:8.1f} ms")
+        if self.total_ms is not None:
+            other = self.total_ms - sum(self.phases.values())
+            lines.append(f"  {'other':<{width}}  {other:8.1f} ms")
+            lines.append(f"  {'first frame':<{width}}  {self.total_ms:8.1f} ms")
+            status = "OVER BUDGET" if self.over_budget() else "within budget"
+            lines.append(f"Budget: {self.budget_ms} ms ({status})")
+        return "\n".join(lines)
@@ -0,0 +1,79 @@
+"""
+Suggestion popup for AicodeX
+Lists snippets matching the word being typed next to the overlay
+"""
+
+import tkinter as tk
+from snippet_insert import foreground_window
+
+
+class SuggestionPopup:
+    """Small borderless list of suggested snippets
+
+    The window is built once and only shown, hidden and refilled, so
+    updating it while typing creates no widgets.  It never takes focus
+    when shown; the window that was focused when it appeared is kept in
+    ``target_window`` so a clicked suggestion can be pasted there.
+    Clicks go through the UIScheduler ``ui``.
+    """
+
+    def __init__(self, root, label, on_pick, ui, rows=5):
+        """Initialize the hidden popup"""
+        self.root = root
+        self.label = label
+        self.on_pick = on_pick
+        self.items = ()
+        self.visible = False
+        self.target_window = None
+
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.attributes('-topmost', True)
+
+        self.listbox = tk.Listbox(self.window, height=rows, activestyle=tk.NONE, exportselection=False)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        self.listbox.bind('<ButtonRelease-1>', ui.wrap('suggestion_click', self.on_click))
+
+    def show(self, items):
+        """Show the suggested item ids, or hide the popup when there are none"""
+        self.items = items
+        if not items:
+            self.hide()
+            return
+        self.listbox.delete(0, tk.END)
+        for item in items:
+            self.listbox.insert(tk.END, self.label(item))
+        self.listbox.selection_set(0)
+
+        if not self.visible:
+            self.target_window = foreground_window()
+            x, y = self._position()
+            self.window.geometry(f"+{x}+{y}")
+            self.window.deiconify()
+            self.visible = True
+
+    def hide(self):
+        """Hide the popup"""
+        if self.visible:
+            self.window.withdraw()
+            self.visible = False
+
+    def selected(self):
+        """Return the highlighted item id, or None"""
+        current = self.listbox.curselection()
+        if not current or not self.items:
+            return None
+        return self.items[current[0]]
+
+    def on_click(self, event):
+        """Pick the clicked suggestion"""
+        item = self.selected()
+        if item is not None:
+            self.on_pick(item)
+
+    def _position(self):
+        """Place the popup under the overlay, or at the pointer when it is hidden"""
+        if self.root.winfo_viewable():
+            return self.root.winfo_rootx(), self.root.winfo_rooty() + self.root.winfo_height()
+        return self.root.winfo_pointerxy()
@@ -0,0 +1,132 @@
+"""
+Snippet suggestions for AicodeX
+Matches the word being typed against snippet triggers one key at a time
+"""
+
+import re
+
+_WORD = re.compile(r'[a-z0-9_]+')
+
+
+def snippet_triggers(snippet):
+    """Return the words that suggest a snippet
+
+    A snippet's ``trigger`` field is used when present, otherwise every
+    word of three or more characters in its name.
+    """
+    trigger = snippet.get('trigger')
+    if trigger:
+        return [trigger.lower()]
+    return [word for word in _WORD.findall(snippet.get('name', '').lower()) if len(word) >= 3]
+
+
+class _Node:
+    """Trie node holding the best matches for its prefix"""
+
+    __slots__ = ('children', 'matches')
+
+    def __init__(self):
+        self.children = {}
+        self.matches = []
+
+
+class TriggerTrie:
+    """Prefix trie of snippet triggers
+
+    Every node keeps the first ``max_matches`` values whose trigger has
+    the node's prefix, so looking up suggestions never walks a subtree.
+    """
+
+    def __init__(self, max_matches=5):
+        """Initialize an empty trie"""
+        self.root = _Node()
+        self.max_matches = max_matches
+        self.size = 0
+
+    def add(self, trigger, value):
+        """Add a trigger for a value"""
+        node = self.root
+        for char in trigger:
+            node = node.children.setdefault(char, _Node())
+            if len(node.matches) < self.max_matches and value not in node.matches:
+                node.matches.append(value)
+        self.size += 1
+
+    @classmethod
+    def from_snippets(cls, items, max_matches=5):
+        """Build a trie from (snippet_id, snippet) pairs"""
+        trie = cls(max_matches)
+        for snippet_id, snippet in items:
+            for trigger in snippet_triggers(snippet):
+                trie.add(trigger, snippet_id)
+        return trie
+
+
+class SuggestionEngine:
+    """Follows the key stream through a TriggerTrie
+
+    Word characters extend the current token and step one node down the
+    trie, backspace steps back up, anything else ends the token.  The
+    path of visited nodes is kept, so every key costs a single dict
+    lookup or list pop and the token is never rescanned.  ``feed`` runs
+    on the keyboard hook thread and returns True only when the
+    suggestions changed, so callers can skip redrawing otherwise.
+    """
+
+    def __init__(self, trie=None, min_length=2, max_token=64):
+        """Initialize the engine with an optional trie"""
+        self.trie = trie or TriggerTrie()
+        self.min_length = min_length
+        self.max_token = max_token
+        self.chars = []
+        self.path = [self.trie.root]
+        self.matches = ()
+
+    @property
+    def token(self):
+        """The word currently being typed"""
+        return ''.join(self.chars)
+
+    def set_trie(self, trie):
+        """Switch to a rebuilt trie and start over with the next word"""
+        self.trie = trie
+        self.reset()
+
+    def reset(self):
+        """Forget the current token; returns True if suggestions changed"""
+        self.chars = []
+        self.path = [self.trie.root]
+        return self._update(())
+
+    def feed(self, key, modifiers=()):
+        """Advance by one normalized key name; returns True if suggestions changed"""
+        if len(key) == 1 and (key.isalnum() or key == '_') and not self._has_shortcut_modifier(modifiers):
+            if len(self.chars) >= self.max_token:
+                return False
+            node = self.path[-1]
+            self.chars.append(key)
+            self.path.append(node.children.get(key) if node is not None else None)
+        elif key == 'backspace' and not self._has_shortcut_modifier(modifiers):
+            if self.chars:
+                self.chars.pop()
+                self.path.pop()
+        else:
+            return self.reset()
+
+        node = self.path[-1]
+        if node is None or len(self.chars) < self.min_length:
+            return self._update(())
+        return self._update(node.matches)
+
+    def _update(self, matches):
+        """Store new matches and report whether they differ"""
+        matches = tuple(matches)
+        if matches == self.matches:
+            return False
+        self.matches = matches
+        return True
+
+    @staticmethod
+    def _has_shortcut_modifier(modifiers):
+        """Check whether keys are part of a shortcut rather than typing"""
+        return 'ctrl' in modifiers or 'alt' in modifiers or 'win' in modifiers
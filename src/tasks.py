@@ -0,0 +1,213 @@
+"""
+Background tasks for AicodeX
+Runs slow overlay actions on a worker pool and reports back on the Tk thread
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from metrics import metrics
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that noticed it was cancelled"""
+
+
+class Task:
+    """A unit of work running on the TaskExecutor
+
+    The task function receives the Task as its first argument.  It can
+    call ``report`` to publish progress and ``check`` between steps to
+    stop early once cancelled; work that cannot check, such as a
+    blocking call into another library, can register an ``on_cancel``
+    callback that interrupts it.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, executor, action, label, on_done=None, on_error=None):
+        """Initialize a pending task"""
+        self.executor = executor
+        self.action = action
+        self.label = label
+        self.on_done = on_done
+        self.on_error = on_error
+        self.state = self.PENDING
+        self.progress = None
+        self.message = None
+        self.error = None
+        self.future = None
+        self.cancel_event = threading.Event()
+        self.cancel_callbacks = []
+
+    @property
+    def cancelled(self):
+        """Whether cancellation was requested"""
+        return self.cancel_event.is_set()
+
+    @property
+    def finished(self):
+        """Whether the task has stopped running"""
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def check(self):
+        """Raise TaskCancelled if cancellation was requested"""
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report(self, progress=None, message=None):
+        """Publish progress as a fraction from 0 to 1 and/or a status message"""
+        self.executor.events.append((self, 'progress', (progress, message)))
+
+    def on_cancel(self, callback):
+        """Run callback on the Tk thread if the task is cancelled"""
+        self.cancel_callbacks.append(callback)
+
+
+class TaskExecutor:
+    """Bounded worker pool whose results are delivered on the Tk thread
+
+    Worker threads only append to an event deque; ``drain`` runs from a
+    Tk ``after`` pump, updates task state, calls ``on_done`` or
+    ``on_error`` and notifies listeners, so all of those can touch
+    widgets.  Each action may only have ``limit`` tasks queued or running
+    at once; further submits are refused.
+    """
+
+    def __init__(self, max_workers=4, interval_ms=50):
+        """Initialize the executor"""
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='action')
+        self.interval_ms = interval_ms
+        self.events = deque()
+        self.active = {}
+        self.listeners = []
+        self.root = None
+
+    def add_listener(self, listener):
+        """Call listener(task) on the Tk thread whenever a task changes"""
+        self.listeners.append(listener)
+
+    def submit(self, action, fn, *args, label=None, limit=1, on_done=None, on_error=None):
+        """Run fn(task, *args) in the background; returns the Task, or None if at the limit"""
+        tasks = self.active.setdefault(action, [])
+        if len(tasks) >= limit:
+            return None
+        task = Task(self, action, label or action, on_done, on_error)
+        tasks.append(task)
+        task.future = self.pool.submit(self._run, task, fn, args)
+        self._notify(task)
+        return task
+
+    def running(self, action=None):
+        """Return the unfinished tasks, optionally for one action"""
+        if action is not None:
+            return list(self.active.get(action, []))
+        return [task for tasks in self.active.values() for task in tasks]
+
+    def cancel(self, task):
+        """Request cancellation of a task"""
+        if task.finished or task.cancelled:
+            return
+        task.cancel_event.set()
+        for callback in task.cancel_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error cancelling {task.label}: {e}")
+        if task.future.cancel():
+            # Never started, so no worker will report it
+            self._finish(task, Task.CANCELLED)
+
+    def cancel_all(self):
+        """Request cancellation of every unfinished task"""
+        for task in self.running():
+            self.cancel(task)
+
+    def shutdown(self):
+        """Cancel all tasks and stop the worker pool without waiting"""
+        self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def drain(self):
+        """Apply queued task events on the Tk thread"""
+        changed = {}
+        while self.events:
+            task, kind, value = self.events.popleft()
+            if task.finished:
+                continue
+            if kind == 'progress':
+                progress, message = value
+                if progress is not None:
+                    task.progress = progress
+                if message is not None:
+                    task.message = message
+            elif kind == 'running':
+                task.state = Task.RUNNING
+            else:
+                self._finish(task, kind, value)
+                changed.pop(task, None)
+                continue
+            changed[task] = True
+        for task in changed:
+            self._notify(task)
+        return len(changed)
+
+    def start(self, root):
+        """Start draining events from root's event loop"""
+        self.root = root
+        self._pump()
+
+    def _pump(self):
+        """Drain events and schedule the next pump"""
+        self.drain()
+        self.root.after(self.interval_ms, self._pump)
+
+    def _run(self, task, fn, args):
+        """Run a task on a worker thread and queue its outcome"""
+        if task.cancelled:
+            self.events.append((task, Task.CANCELLED, None))
+            return
+        self.events.append((task, 'running', None))
+        started = time.perf_counter()
+        try:
+            result = fn(task, *args)
+        except TaskCancelled:
+            self.events.append((task, Task.CANCELLED, None))
+        except Exception as e:
+            self.events.append((task, Task.CANCELLED if task.cancelled else Task.FAILED, e))
+        else:
+            self.events.append((task, Task.CANCELLED if task.cancelled else Task.DONE, result))
+        if metrics.enabled:
+            metrics.observe(f"action.{task.action}", time.perf_counter() - started)
+
+    def _finish(self, task, state, value=None):
+        """Record a task's outcome and run its callbacks"""
+        task.state = state
+        metrics.incr(f"actions.{state}")
+        tasks = self.active.get(task.action, [])
+        if task in tasks:
+            tasks.remove(task)
+        if state == Task.DONE and task.on_done is not None:
+            self._call(task, task.on_done, value)
+        elif state == Task.FAILED:
+            task.error = value
+            if task.on_error is not None:
+                self._call(task, task.on_error, value)
+        self._notify(task)
+
+    def _call(self, task, callback, value):
+        """Run a completion callback, reporting its errors"""
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Error completing {task.label}: {e}")
+
+    def _notify(self, task):
+        """Tell listeners a task changed"""
+        for listener in self.listeners:
+            listener(task)
@@ -0,0 +1,78 @@
+"""
+UI update scheduling for AicodeX
+Throttles high-frequency widget callbacks to at most one update per frame
+"""
+
+import time
+from metrics import metrics
+
+
+class UIScheduler:
+    """Coalesces widget updates per key on the Tk loop
+
+    An update for a key that has not run during the last frame is applied
+    at once, so single clicks and keystrokes see no delay.  Updates that
+    arrive faster are held, and a newer update for the same key replaces
+    the held one, which counts as dropped.  Held updates are applied
+    together on the next frame, so each key runs at most once per
+    ``frame_ms``.
+    """
+
+    def __init__(self, root, frame_ms=16, clock=time.perf_counter):
+        """Initialize the scheduler on a Tk root"""
+        self.root = root
+        self.frame = frame_ms / 1000
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self.pending = {}
+        self.last_applied = {}
+        self.flush_job = None
+        self.applied = 0
+        self.dropped = 0
+
+    def schedule(self, key, callback, *args):
+        """Request callback(*args) for key, replacing any held update"""
+        now = self.clock()
+        if key in self.pending:
+            self.dropped += 1
+            metrics.incr('ui.dropped')
+        elif now - self.last_applied.get(key, float('-inf')) >= self.frame:
+            self._apply(key, callback, args, now)
+            return
+        self.pending[key] = (callback, args)
+        if self.flush_job is None:
+            self.flush_job = self.root.after(self.frame_ms, self.flush)
+
+    def wrap(self, key, callback, result=None):
+        """Return a widget callback that schedules callback under key
+
+        The callback returns ``result`` to Tk, e.g. 'break' to stop the
+        widget's class bindings from handling the event as well.
+        """
+        def scheduled(*args):
+            self.schedule(key, callback, *args)
+            return result
+        return scheduled
+
+    def flush(self):
+        """Apply all held updates"""
+        self.flush_job = None
+        pending, self.pending = self.pending, {}
+        now = self.clock()
+        for key, (callback, args) in pending.items():
+            self._apply(key, callback, args, now)
+
+    def stats(self):
+        """Return the counts of applied and dropped updates"""
+        return {'applied': self.applied, 'dropped': self.dropped}
+
+    def _apply(self, key, callback, args, now):
+        """Run one update"""
+        self.last_applied[key] = now
+        self.applied += 1
+        metrics.incr('ui.applied')
+        try:
+            with metrics.timer('ui.update'):
+                callback(*args)
+        except Exception as e:
+            print(f"Error updating {key}: {e}")
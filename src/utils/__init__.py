@@ -2,4 +2,4 @@
 Utility modules for AicodeX
 """
 
-__all__ = ['handbrake_checker']
+__all__ = ['checksum', 'downloader', 'handbrake_checker', 'release_metadata']
@@ -0,0 +1,168 @@
+"""
+Checksum utilities for AicodeX
+Large-buffer and memory-mapped SHA256 hashing with a verification cache
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BUFFER_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 16 * 1024 * 1024
+# Files modified this recently may still change within the same mtime tick
+RACY_SECONDS = 2.0
+
+
+def file_key(path):
+    """Return the (size, mtime_ns, inode) of a file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def hash_file(path, buffer_size=BUFFER_SIZE, mmap_threshold=MMAP_THRESHOLD):
+    """Return the SHA256 hex digest of a file
+
+    Large files are memory-mapped and hashed in a single update, smaller
+    ones are read into one reused buffer.  hashlib releases the GIL while
+    hashing, so several files can be hashed in parallel on threads.
+    """
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        else:
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                hasher.update(view[:count])
+    return hasher.hexdigest()
+
+
+class ChecksumCache:
+    """Remembers file digests until a file's size, mtime or inode changes
+
+    With a ``path`` the cache is loaded from and saved to a JSON file, so
+    files verified by an earlier run are not hashed again.  Entries are
+    only stored for files that did not change while being hashed and
+    were not modified in the last ``RACY_SECONDS``, when a later write
+    could keep the same mtime.
+    """
+
+    def __init__(self, path=None):
+        """Initialize the cache, loading it from path if given"""
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        if path is not None:
+            self.load()
+
+    def load(self):
+        """Load cached digests from the cache file"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.entries = {
+            file_path: (tuple(entry[:3]), entry[3])
+            for file_path, entry in data.items()
+            if isinstance(entry, list) and len(entry) == 4
+        }
+
+    def save(self):
+        """Write the cache file if entries changed; returns True if written"""
+        if self.path is None or not self.dirty:
+            return False
+        with self.lock:
+            data = {file_path: list(key) + [digest] for file_path, (key, digest) in self.entries.items()}
+            self.dirty = False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+            temp_path = None
+            return True
+        except OSError as e:
+            print(f"Error saving checksum cache: {e}")
+            self.dirty = True
+            return False
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def digest(self, path):
+        """Return a file's SHA256 digest, hashing it only if it changed
+
+        Returns (digest, hashed) where hashed tells whether the file was
+        read.  Raises OSError if the file cannot be read.
+        """
+        path = os.path.abspath(path)
+        key = file_key(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if key is not None and entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1], False
+            self.misses += 1
+
+        digest = hash_file(path)
+        if key is not None and file_key(path) == key and time.time() - key[1] / 1e9 > RACY_SECONDS:
+            with self.lock:
+                self.entries[path] = (key, digest)
+                self.dirty = True
+        return digest, True
+
+
+def verify_many(items, cache=None, workers=None):
+    """Verify many (path, expected_sha256) pairs in parallel
+
+    Files are hashed on a thread pool, skipping those the cache already
+    knows.  Returns ({path: verified}, stats) where stats has the number
+    of files, files hashed, bytes hashed, seconds and MB/s.
+    """
+    cache = cache if cache is not None else ChecksumCache()
+    items = list(items)
+
+    def verify(item):
+        path, expected = item
+        try:
+            digest, hashed = cache.digest(path)
+        except OSError as e:
+            print(f"Error verifying checksum of {path}: {e}")
+            return path, False, False, 0
+        size = os.path.getsize(path) if hashed else 0
+        return path, digest.lower() == expected.lower(), hashed, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as pool:
+        outcomes = list(pool.map(verify, items))
+    seconds = time.perf_counter() - started
+
+    hashed_bytes = sum(size for _, _, _, size in outcomes)
+    stats = {
+        'files': len(items),
+        'hashed_files': sum(1 for _, _, hashed, _ in outcomes if hashed),
+        'bytes': hashed_bytes,
+        'seconds': seconds,
+        'mb_per_s': hashed_bytes / (1024 * 1024) / seconds if seconds > 0 else 0.0,
+    }
+    return {path: verified for path, verified, _, _ in outcomes}, stats
@@ -0,0 +1,214 @@
+"""
+Streaming downloader for AicodeX utilities
+Hashes downloads as they arrive, resumes partial files over HTTP Range
+and fetches large files as parallel ranged segments
+"""
+
+import hashlib
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)')
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed"""
+
+
+class ChecksumError(DownloadError):
+    """Raised when a downloaded file does not match its expected hash"""
+
+
+def partial_path(destination):
+    """Return the path a download is written to until it completes"""
+    return destination + '.part'
+
+
+def probe(url, timeout=30):
+    """Return (size, accepts_ranges) for a URL using a HEAD request"""
+    request = urllib.request.Request(url, method='HEAD')
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        length = response.headers.get('Content-Length')
+        accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        return (int(length) if length is not None else None), accepts_ranges
+
+
+def download(url, destination, expected_sha256=None, segments=1, chunk_size=CHUNK_SIZE,
+             min_segment_size=MIN_SEGMENT_SIZE, timeout=30, progress=None):
+    """Download url to destination and return its SHA256 hex digest
+
+    Data is written to ``destination + '.part'`` and hashed as it
+    arrives, so the file is never read back just to be verified.  An
+    existing partial file is resumed with a Range request; if the server
+    ignores the range the download starts over.  With ``segments`` > 1 a
+    fresh download of a file at least two segments large is fetched as
+    that many parallel ranged requests, hashed in order as the segments
+    fill in.  A failed download keeps its partial file so the next call
+    resumes it.  The partial file is renamed to ``destination`` only once
+    the hash matches ``expected_sha256``; on a mismatch it is removed and
+    ChecksumError is raised.  ``progress(done, total)`` is called after
+    each chunk, with total None when the size is unknown; an exception it
+    raises aborts the download like any other failure.
+    """
+    part = partial_path(destination)
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+
+    hasher = None
+    if offset == 0 and segments > 1:
+        size, accepts_ranges = probe(url, timeout)
+        if accepts_ranges and size and size >= 2 * min_segment_size:
+            hasher = _download_segments(url, part, size, segments, chunk_size, timeout, progress)
+    if hasher is None:
+        hasher = _download_stream(url, part, offset, chunk_size, timeout, progress)
+
+    digest = hasher.hexdigest()
+    if expected_sha256 and digest.lower() != expected_sha256.lower():
+        os.remove(part)
+        raise ChecksumError(f"SHA256 mismatch: expected {expected_sha256}, got {digest}")
+    os.replace(part, destination)
+    return digest
+
+
+def _hash_prefix(path, length, chunk_size):
+    """Hash the first length bytes of a partial file"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        remaining = length
+        while remaining:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _download_stream(url, part, offset, chunk_size, timeout, progress=None):
+    """Stream url into part, appending from offset when the server allows"""
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header('Range', f'bytes={offset}-')
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not offset:
+            raise
+        # The partial file is already complete, or longer than the remote file
+        match = _CONTENT_RANGE.match(e.headers.get('Content-Range', ''))
+        if match and match.group(3) == str(offset):
+            return _hash_prefix(part, offset, chunk_size)
+        os.remove(part)
+        return _download_stream(url, part, 0, chunk_size, timeout, progress)
+
+    with response:
+        if offset and response.status == 206:
+            match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+            if not match or match.group(1) is None or int(match.group(1)) != offset:
+                raise DownloadError("Server returned an unexpected range")
+            hasher = _hash_prefix(part, offset, chunk_size)
+            mode = 'ab'
+        else:
+            hasher = hashlib.sha256()
+            mode = 'wb'
+
+        length = response.headers.get('Content-Length')
+        start = offset if mode == 'ab' else 0
+        total = start + int(length) if length is not None else None
+        received = 0
+        with open(part, mode) as f:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+                hasher.update(chunk)
+                received += len(chunk)
+                if progress is not None:
+                    progress(start + received, total)
+        if length is not None and received < int(length):
+            raise DownloadError("Connection closed before the download was complete")
+    return hasher
+
+
+def _download_segments(url, part, size, segments, chunk_size, timeout, progress=None):
+    """Fetch url as parallel ranged segments, hashing them in order
+
+    Each worker writes its segment in place in a preallocated file and
+    publishes how far it got.  The calling thread hashes the file front
+    to back as data becomes available, reading from the page cache.  On
+    failure the file is cut back to the hashed, contiguous prefix so a
+    later call can resume it with a single stream.
+    """
+    segment_size = -(-size // segments)
+    ranges = [(start, min(start + segment_size, size)) for start in range(0, size, segment_size)]
+    written = [start for start, _ in ranges]
+    errors = []
+    condition = threading.Condition()
+
+    with open(part, 'wb') as f:
+        f.truncate(size)
+
+    def fetch(index):
+        start, end = ranges[index]
+        request = urllib.request.Request(url, headers={'Range': f'bytes={start}-{end - 1}'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response, \
+                    open(part, 'r+b', buffering=0) as f:
+                if response.status != 206:
+                    raise DownloadError("Server ignored the range request")
+                f.seek(start)
+                while written[index] < end and not errors:
+                    chunk = response.read(min(chunk_size, end - written[index]))
+                    if not chunk:
+                        raise DownloadError("Connection closed before the segment was complete")
+                    f.write(chunk)
+                    with condition:
+                        written[index] += len(chunk)
+                        condition.notify_all()
+        except Exception as e:
+            with condition:
+                errors.append(e)
+                condition.notify_all()
+
+    hasher = hashlib.sha256()
+    hashed = 0
+    with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='download') as pool:
+        for index in range(len(ranges)):
+            pool.submit(fetch, index)
+        try:
+            # Unbuffered, a read-ahead buffer would hold bytes not yet written
+            with open(part, 'rb', buffering=0) as reader:
+                for index, (_, end) in enumerate(ranges):
+                    while hashed < end:
+                        with condition:
+                            while written[index] <= hashed and not errors:
+                                condition.wait()
+                            available = written[index]
+                        if available <= hashed:
+                            break
+                        reader.seek(hashed)
+                        while hashed < available:
+                            block = reader.read(min(chunk_size, available - hashed))
+                            hasher.update(block)
+                            hashed += len(block)
+                        if progress is not None:
+                            progress(hashed, size)
+                    if hashed < end:
+                        break
+        except Exception as e:
+            with condition:
+                errors.append(e)
+                condition.notify_all()
+
+    if errors:
+        with open(part, 'r+b') as f:
+            f.truncate(hashed)
+        raise errors[0]
+    return hasher
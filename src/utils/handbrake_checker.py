@@ -3,9 +3,8 @@ HandBrake version checker utility
 Checks and downloads the latest HandBrake version
 """
 
-import hashlib
-import urllib.request
-import os
+from utils.checksum import ChecksumCache, verify_many
+from utils.downloader import ChecksumError, download
 
 
 class HandBrakeChecker:
@@ -15,32 +14,50 @@ class HandBrakeChecker:
     DOWNLOAD_URL = "https://github.com/HandBrake/HandBrake/releases/download/1.10.2/HandBrake-1.10.2-x86_64-Win_GUI.exe"
     EXPECTED_SHA256 = "ff868bb43c19a4fd8bec8f4b9d83a756f6818cf4b229012715f35eb2416673cd"
     
-    def __init__(self):
-        """Initialize HandBrake checker"""
+    def __init__(self, checksum_cache=None, metadata=None):
+        """Initialize HandBrake checker
+        
+        ``checksum_cache`` remembers verified files so unchanged installers
+        are not hashed again; pass a ChecksumCache with a path to keep it
+        across runs.  ``metadata`` is a ReleaseMetadataProvider for the
+        latest release; without one, or while it has nothing to offer, the
+        class constants are used.
+        """
         self.version = self.LATEST_VERSION
+        self.checksum_cache = checksum_cache if checksum_cache is not None else ChecksumCache()
+        self.metadata = metadata
         
     def check_version(self):
         """Check the latest HandBrake version"""
-        return f"Latest HandBrake version: {self.LATEST_VERSION}\nDownload URL: {self.DOWNLOAD_URL}"
+        info = self.get_info()
+        self.version = info['version']
+        message = f"Latest HandBrake version: {info['version']}\nDownload URL: {info['download_url']}"
+        if self.metadata is not None and self.metadata.offline:
+            message += "\n(offline, showing the last known release)"
+        return message
+        
+    def download(self, destination_path=None, segments=1, progress=None):
+        """Download HandBrake installer
         
-    def download(self, destination_path=None):
-        """Download HandBrake installer"""
+        The checksum is computed while downloading and an interrupted
+        download is resumed on the next call.  ``segments`` > 1 fetches
+        the installer as that many parallel ranged requests.
+        ``progress(done, total)`` is called as bytes arrive.
+        """
+        info = self.get_info()
         if destination_path is None:
-            destination_path = f"HandBrake-{self.LATEST_VERSION}-x86_64-Win_GUI.exe"
+            destination_path = f"HandBrake-{info['version']}-x86_64-Win_GUI.exe"
             
         try:
-            print(f"Downloading HandBrake {self.LATEST_VERSION}...")
-            urllib.request.urlretrieve(self.DOWNLOAD_URL, destination_path)
-            
-            # Verify SHA256 checksum
-            if self.verify_checksum(destination_path):
-                print(f"Download complete: {destination_path}")
-                print("SHA256 checksum verified successfully!")
-                return True
-            else:
-                print("SHA256 checksum verification failed!")
-                os.remove(destination_path)
-                return False
+            print(f"Downloading HandBrake {info['version']}...")
+            download(info['download_url'], destination_path, info['sha256'],
+                     segments=segments, progress=progress)
+            print(f"Download complete: {destination_path}")
+            print("SHA256 checksum verified successfully!")
+            return True
+        except ChecksumError:
+            print("SHA256 checksum verification failed!")
+            return False
         except Exception as e:
             print(f"Error downloading HandBrake: {e}")
             return False
@@ -48,20 +65,38 @@ class HandBrakeChecker:
     def verify_checksum(self, file_path):
         """Verify SHA256 checksum of downloaded file"""
         try:
-            sha256_hash = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                # Read file in chunks to handle large files
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            
-            calculated_hash = sha256_hash.hexdigest()
-            return calculated_hash.lower() == self.EXPECTED_SHA256.lower()
+            calculated_hash, _ = self.checksum_cache.digest(file_path)
+            return calculated_hash.lower() == self.get_info()['sha256'].lower()
         except Exception as e:
             print(f"Error verifying checksum: {e}")
             return False
             
+    def verify_many(self, file_paths, workers=None):
+        """Verify many installer copies in parallel
+        
+        Returns {path: verified} and prints the hashing throughput.
+        """
+        expected = self.get_info()['sha256']
+        results, stats = verify_many(
+            ((path, expected) for path in file_paths),
+            cache=self.checksum_cache,
+            workers=workers
+        )
+        print(f"Verified {stats['files']} files, hashed {stats['hashed_files']} "
+              f"({stats['bytes'] / (1024 * 1024):.1f} MB) at {stats['mb_per_s']:.1f} MB/s")
+        self.checksum_cache.save()
+        return results
+        
     def get_info(self):
         """Get HandBrake information"""
+        if self.metadata is not None:
+            metadata = self.metadata.get()
+            if metadata is not None:
+                return {
+                    "version": metadata['version'],
+                    "download_url": metadata['download_url'],
+                    "sha256": metadata['sha256']
+                }
         return {
             "version": self.LATEST_VERSION,
             "download_url": self.DOWNLOAD_URL,
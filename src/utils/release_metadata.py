@@ -0,0 +1,154 @@
+"""
+Release metadata provider for AicodeX utilities
+Fetches release info from a JSON endpoint with conditional requests,
+an on-disk cache with a TTL and an offline fallback
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+
+REQUIRED_FIELDS = ('version', 'download_url', 'sha256')
+
+
+class ReleaseMetadataProvider:
+    """Release metadata fetched from ``url`` and cached for ``ttl`` seconds
+
+    The endpoint returns a JSON object with at least ``version``,
+    ``download_url`` and ``sha256``.  Once the TTL has passed the cached
+    ETag and Last-Modified values are sent back, so an unchanged release
+    costs a 304 response without a body.  When the endpoint cannot be
+    reached the last known metadata is returned and ``offline`` is set,
+    and no new request is made for ``retry_after`` seconds, so repeated
+    calls while offline do not each wait for the timeout.
+    Callers arriving while a request is in flight wait for that request
+    instead of starting their own.  ``get`` returns None when no URL is
+    configured and nothing has been cached.
+    """
+
+    def __init__(self, url=None, cache_path=None, ttl=3600, timeout=10, retry_after=300):
+        """Initialize the provider, loading the on-disk cache if present"""
+        self.url = url
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.entry = None
+        self.offline = False
+        self.failed_at = None
+        self.fetches = 0
+        self.lock = threading.Lock()
+        self.inflight = None
+        self._load()
+
+    def get(self):
+        """Return the release metadata dict, refreshing it when stale"""
+        if not self.url:
+            return None
+        with self.lock:
+            if self._fresh():
+                return self.entry['metadata']
+            if self.failed_at is not None and time.time() - self.failed_at < self.retry_after:
+                return self.entry['metadata'] if self.entry is not None else None
+            future = self.inflight
+            owner = future is None
+            if owner:
+                future = self.inflight = Future()
+
+        if not owner:
+            return future.result()
+        try:
+            metadata = self._refresh()
+            future.set_result(metadata)
+            return metadata
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight = None
+
+    def _fresh(self):
+        """Check whether the cached entry is within its TTL"""
+        return self.entry is not None and time.time() - self.entry['fetched_at'] < self.ttl
+
+    def _refresh(self):
+        """Fetch the metadata, revalidating the cached entry if there is one"""
+        request = urllib.request.Request(self.url, headers={'Accept': 'application/json'})
+        if self.entry is not None:
+            if self.entry.get('etag'):
+                request.add_header('If-None-Match', self.entry['etag'])
+            if self.entry.get('last_modified'):
+                request.add_header('If-Modified-Since', self.entry['last_modified'])
+
+        self.fetches += 1
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                metadata = json.loads(response.read().decode('utf-8'))
+                missing = [field for field in REQUIRED_FIELDS if not metadata.get(field)]
+                if missing:
+                    raise ValueError(f"release metadata is missing {', '.join(missing)}")
+                entry = {
+                    'url': self.url,
+                    'metadata': metadata,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or self.entry is None:
+                return self._offline(e)
+            entry = dict(self.entry)
+        except Exception as e:
+            return self._offline(e)
+
+        entry['fetched_at'] = time.time()
+        self.entry = entry
+        self.offline = False
+        self.failed_at = None
+        self._save()
+        return entry['metadata']
+
+    def _offline(self, error):
+        """Fall back to the last known metadata after a failed fetch"""
+        print(f"Could not fetch release metadata: {error}")
+        self.offline = True
+        self.failed_at = time.time()
+        return self.entry['metadata'] if self.entry is not None else None
+
+    def _load(self):
+        """Load the cached entry for this URL from disk"""
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(entry, dict) and entry.get('url') == self.url and 'metadata' in entry:
+            self.entry = entry
+
+    def _save(self):
+        """Write the cached entry to disk atomically"""
+        if self.cache_path is None:
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.cache_path)),
+                prefix=f"{os.path.basename(self.cache_path)}.",
+                suffix=".tmp"
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.entry, f)
+            os.replace(temp_path, self.cache_path)
+            temp_path = None
+        except OSError as e:
+            print(f"Error saving release metadata cache: {e}")
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
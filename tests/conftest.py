@@ -0,0 +1,109 @@
+"""
+Shared fixtures for AicodeX tests
+"""
+
+import email.utils
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    """Serves the stand-in server's files with Range and ETag support"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def do_GET(self):
+        self.respond(body=True)
+
+    def respond(self, body):
+        server = self.server
+        server.requests.append((self.command, self.path, dict(self.headers)))
+        if server.delay:
+            time.sleep(server.delay)
+        entry = server.files.get(self.path)
+        if entry is None:
+            self.send_error(404)
+            return
+        data, etag, modified = entry
+
+        if (self.headers.get('If-None-Match') == etag
+                or self.headers.get('If-Modified-Since') == modified):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        start, end, status = 0, len(data), 200
+        requested = self.headers.get('Range')
+        if requested and server.ranges:
+            first, _, last = requested[len('bytes='):].partition('-')
+            start = int(first)
+            end = min(int(last) + 1, len(data)) if last else len(data)
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.end_headers()
+                return
+            status = 206
+
+        payload = data[start:end]
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', modified)
+        if server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{len(data)}')
+        self.end_headers()
+        if body:
+            if server.truncate_after is not None and len(payload) > server.truncate_after:
+                # Simulate a dropped connection
+                self.wfile.write(payload[:server.truncate_after])
+                server.truncate_after = None
+                self.close_connection = True
+                return
+            self.wfile.write(payload)
+
+
+class StaticServer(ThreadingHTTPServer):
+    """Local HTTP stand-in serving in-memory files"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StaticHandler)
+        self.files = {}
+        self.requests = []
+        self.ranges = True
+        self.truncate_after = None
+        self.delay = 0
+
+    def add(self, path, data, modified=0):
+        """Serve data at path, returning its URL"""
+        etag = '"' + hashlib.sha256(data).hexdigest()[:16] + '"'
+        self.files[path] = (data, etag, email.utils.formatdate(modified, usegmt=True))
+        return self.url(path)
+
+    def url(self, path):
+        """Return the URL of a path on this server"""
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+@pytest.fixture
+def http_server():
+    """Run a local HTTP stand-in for the duration of a test"""
+    server = StaticServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
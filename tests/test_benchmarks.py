@@ -0,0 +1,88 @@
+"""
+Tests for the AicodeX benchmark suite runner
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Add benchmarks to path for imports
+BENCHMARK_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+sys.path.insert(0, BENCHMARK_DIR)
+
+from run_benchmarks import compare, format_results
+
+
+def result(value, better='lower'):
+    return {'value': value, 'unit': 'ms', 'better': better}
+
+
+def test_compare_flags_slowdowns_past_threshold():
+    """Test that only changes in the bad direction beyond the threshold fail"""
+    baseline = {
+        'fast': result(10.0),
+        'slow': result(10.0),
+        'throughput': result(100.0, 'higher'),
+        'dropped': result(1.0),
+        'rounded': result(0.0),
+        'idle': result(0.0),
+    }
+    results = {
+        'fast': result(8.0),
+        'slow': result(13.0),
+        'throughput': result(70.0, 'higher'),
+        'added': result(5.0),
+        'rounded': result(0.004),
+        'idle': result(0.0),
+    }
+    rows, regressions = compare(baseline, results, threshold=0.25)
+
+    assert regressions == ['rounded', 'slow', 'throughput']
+    changes = {name: slowdown for name, _, _, slowdown in rows}
+    assert round(changes['fast'], 3) == -0.2
+    assert round(changes['throughput'], 3) == 0.429
+    assert changes['added'] is None
+    assert changes['idle'] == 0.0
+    assert 'dropped' not in changes
+    assert "new" in format_results(results, rows)
+
+
+def test_suite_runs_headless_and_compares(tmp_path):
+    """Test a quick run without a display, then a failing comparison"""
+    output = tmp_path / "results.json"
+    command = [sys.executable, os.path.join(BENCHMARK_DIR, 'run_benchmarks.py'),
+               '--quick', '--repeat', '1', '--tk', 'stub', '--only', 'hotkeys,overlay']
+    run = subprocess.run(command + ['--output', str(output)], capture_output=True, text=True, timeout=120)
+    assert run.returncode == 0, run.stdout + run.stderr
+
+    data = json.loads(output.read_text())
+    assert data['tk'] == 'stub'
+    assert {'hotkey.keystroke', 'hotkey.dispatch_p99', 'overlay.construct[1000]',
+            'overlay.rebuild[1000]'} <= set(data['results'])
+
+    # A baseline ten times faster than anything measured must fail
+    for entry in data['results'].values():
+        entry['value'] /= 10
+    output.write_text(json.dumps(data))
+    run = subprocess.run(command + ['--compare', str(output)], capture_output=True, text=True, timeout=120)
+    assert run.returncode == 1
+    assert "Regressed by more than 25%" in run.stdout
+
+
+def test_compare_checks_baseline_before_running(tmp_path):
+    """Test that a missing baseline or one with other settings fails up front"""
+    command = [sys.executable, os.path.join(BENCHMARK_DIR, 'run_benchmarks.py'),
+               '--quick', '--tk', 'stub', '--only', 'hotkeys']
+    run = subprocess.run(command + ['--compare', str(tmp_path / "missing.json")],
+                         capture_output=True, text=True, timeout=60)
+    assert run.returncode == 2
+    assert "cannot read baseline" in run.stderr
+    assert "Traceback" not in run.stderr
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({'format': 1, 'quick': False, 'tk': 'stub', 'results': {}}))
+    run = subprocess.run(command + ['--compare', str(baseline)], capture_output=True, text=True, timeout=60)
+    assert run.returncode == 2
+    assert "quick=False vs True" in run.stderr
+    assert "hotkeys:" not in run.stderr
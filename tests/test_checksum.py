@@ -0,0 +1,118 @@
+"""
+Tests for AicodeX checksum hashing and verification cache
+"""
+
+import hashlib
+import os
+import sys
+import time
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import utils.checksum as checksum
+from utils.checksum import ChecksumCache, hash_file, verify_many
+from utils.handbrake_checker import HandBrakeChecker
+
+
+def write_file(path, data, age=60):
+    """Write a file with an mtime old enough to be cached"""
+    path.write_bytes(data)
+    past = time.time() - age
+    os.utime(path, (past, past))
+    return str(path)
+
+
+@pytest.fixture
+def count_hashes(monkeypatch):
+    """Count calls to hash_file"""
+    calls = []
+    original = checksum.hash_file
+
+    def counting(path, *args, **kwargs):
+        calls.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(checksum, 'hash_file', counting)
+    return calls
+
+
+def test_hash_file_buffered_and_mmap(tmp_path):
+    """Test that both hashing paths match hashlib"""
+    data = os.urandom(3 * 1024 * 1024 + 5)
+    path = write_file(tmp_path / 'file.bin', data)
+    expected = hashlib.sha256(data).hexdigest()
+
+    assert hash_file(path, buffer_size=64 * 1024) == expected
+    assert hash_file(path, mmap_threshold=1024) == expected
+    assert hash_file(write_file(tmp_path / 'empty.bin', b'')) == hashlib.sha256(b'').hexdigest()
+
+
+def test_cache_skips_unchanged_files(tmp_path, count_hashes):
+    """Test that an unchanged file is hashed once"""
+    path = write_file(tmp_path / 'installer.exe', b'installer')
+    cache = ChecksumCache()
+
+    assert cache.digest(path) == (hashlib.sha256(b'installer').hexdigest(), True)
+    assert cache.digest(path)[1] is False
+    assert len(count_hashes) == 1
+
+    # Same size, new mtime
+    write_file(tmp_path / 'installer.exe', b'INSTALLER', age=30)
+    assert cache.digest(path) == (hashlib.sha256(b'INSTALLER').hexdigest(), True)
+
+
+def test_recently_modified_files_not_cached(tmp_path, count_hashes):
+    """Test that files modified within the racy window are always hashed"""
+    path = write_file(tmp_path / 'installer.exe', b'installer', age=0)
+    cache = ChecksumCache()
+
+    cache.digest(path)
+    cache.digest(path)
+    assert len(count_hashes) == 2
+
+
+def test_cache_persists(tmp_path, count_hashes):
+    """Test that a saved cache is reused by a new instance"""
+    path = write_file(tmp_path / 'installer.exe', b'installer')
+    cache_path = str(tmp_path / 'checksums.json')
+
+    cache = ChecksumCache(cache_path)
+    cache.digest(path)
+    assert cache.save() is True
+    assert cache.save() is False
+
+    assert ChecksumCache(cache_path).digest(path)[1] is False
+    assert len(count_hashes) == 1
+
+
+def test_verify_many(tmp_path):
+    """Test parallel batch verification and its throughput report"""
+    good = hashlib.sha256(b'good').hexdigest()
+    paths = [write_file(tmp_path / f'copy{i}.exe', b'good') for i in range(6)]
+    bad = write_file(tmp_path / 'bad.exe', b'bad')
+    items = [(path, good) for path in paths + [bad, str(tmp_path / 'missing.exe')]]
+    cache = ChecksumCache()
+
+    results, stats = verify_many(items, cache=cache, workers=4)
+    assert [results[path] for path in paths] == [True] * 6
+    assert results[bad] is False
+    assert results[str(tmp_path / 'missing.exe')] is False
+    assert stats['files'] == 8 and stats['hashed_files'] == 7
+    assert stats['bytes'] == 6 * 4 + 3
+    assert stats['mb_per_s'] >= 0
+
+    _, stats = verify_many(items[:-1], cache=cache)
+    assert stats['hashed_files'] == 0
+
+
+def test_handbrake_verify_checksum(tmp_path):
+    """Test HandBrakeChecker verification through the cache"""
+    checker = HandBrakeChecker()
+    checker.EXPECTED_SHA256 = hashlib.sha256(b'installer').hexdigest()
+    path = write_file(tmp_path / 'HandBrake.exe', b'installer')
+
+    assert checker.verify_checksum(path) is True
+    assert checker.verify_many([path, path]) == {path: True}
+    assert checker.verify_checksum(str(tmp_path / 'missing.exe')) is False
@@ -0,0 +1,131 @@
+"""
+Tests for AicodeX clipboard history
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from clipboard_history import ClipboardHistory
+
+
+def texts(entries):
+    return [entry.text() for entry in entries]
+
+
+def test_duplicates_move_to_newest():
+    """Test that copying a text again moves it instead of storing it twice"""
+    history = ClipboardHistory()
+    history.add("first")
+    history.add("second")
+    history.add("first")
+
+    assert texts(history.newest()) == ["first", "second"]
+    assert history.add("first") is history.newest()[0]
+    assert history.add("") is None
+
+
+def test_capped_by_total_bytes():
+    """Test that the oldest entries go once the stored bytes pass the cap"""
+    history = ClipboardHistory(max_bytes=1000, max_entry_bytes=600, compress_threshold=10**6)
+    for i in range(10):
+        history.add(f"{i}" * 200)
+
+    assert history.total_bytes <= 1000
+    assert texts(history.newest())[0] == "9" * 200
+    assert len(history) == 2
+    assert history.add("x" * 700) is None
+
+
+def test_large_entries_compressed():
+    """Test that large texts are stored compressed and read back intact"""
+    history = ClipboardHistory(compress_threshold=1024)
+    text = "def handler(request):\n    return respond(request)\n" * 200
+    entry = history.add(text)
+
+    assert entry.compressed
+    assert len(entry.data) < len(text) // 10
+    assert entry.text() == text
+    assert not history.add("short").compressed
+
+
+def test_search_matches_every_word_newest_first():
+    """Test case-insensitive filtering on all query words"""
+    history = ClipboardHistory()
+    history.add("import os")
+    history.add("SELECT name FROM users")
+    history.add("select id from orders")
+
+    assert texts(history.search("select FROM")) == ["select id from orders", "SELECT name FROM users"]
+    assert texts(history.search("users select")) == ["SELECT name FROM users"]
+    assert len(history.search("", limit=2)) == 2
+    assert history.newest()[1].label() == "SELECT name FROM users"
+
+
+def test_log_replayed_across_restarts(tmp_path):
+    """Test that adds, re-copies and removals survive a restart"""
+    path = str(tmp_path / "history")
+    history = ClipboardHistory(path)
+    history.add("one")
+    history.add("two")
+    history.add("three")
+    history.add("one")
+    history.remove(history.newest()[1].digest)
+    history.close()
+
+    reloaded = ClipboardHistory(path)
+    assert texts(reloaded.newest()) == ["one", "two"]
+    reloaded.add("four")
+    reloaded.close()
+    assert texts(ClipboardHistory(path).newest()) == ["four", "one", "two"]
+
+
+def test_log_only_appends_and_drops_old_segments(tmp_path):
+    """Test that segments are appended to and deleted whole, never rewritten"""
+    path = str(tmp_path / "history")
+    history = ClipboardHistory(path, max_bytes=4000, segment_bytes=1000, compress_threshold=10**6)
+    sizes = {}
+    for i in range(100):
+        history.add(f"entry {i} " + "x" * 300)
+        for name in os.listdir(path):
+            size = os.path.getsize(os.path.join(path, name))
+            assert size >= sizes.get(name, 0)
+            sizes[name] = size
+    history.close()
+
+    # Only the segments holding the newest entries are left on disk
+    assert len(os.listdir(path)) <= 6
+    reloaded = ClipboardHistory(path, max_bytes=4000, segment_bytes=1000)
+    assert texts(reloaded.newest()) == texts(history.newest())
+
+
+def test_torn_record_cut_off(tmp_path):
+    """Test that a partly written last record is dropped on replay"""
+    path = str(tmp_path / "history")
+    history = ClipboardHistory(path)
+    history.add("kept")
+    history.add("torn")
+    history.close()
+    segment = os.path.join(path, os.listdir(path)[0])
+    with open(segment, 'r+b') as f:
+        f.truncate(os.path.getsize(segment) - 2)
+
+    reloaded = ClipboardHistory(path)
+    assert texts(reloaded.newest()) == ["kept"]
+    reloaded.add("after")
+    reloaded.close()
+    assert texts(ClipboardHistory(path).newest()) == ["after", "kept"]
+
+
+def test_clear_deletes_log(tmp_path):
+    """Test that clearing drops every entry and segment"""
+    path = str(tmp_path / "history")
+    history = ClipboardHistory(path)
+    history.add("secret")
+    history.clear()
+    history.add("public")
+    history.close()
+
+    assert texts(ClipboardHistory(path).newest()) == ["public"]
@@ -6,12 +6,13 @@ import os
 import sys
 import json
 import tempfile
+import time
 import pytest
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from config import Config
+from config import Config, diff_settings, merge_settings, find_project_config, PROJECT_CONFIG_NAME
 
 
 def test_config_initialization():
@@ -80,3 +81,212 @@ def test_default_snippets():
     assert isinstance(snippets, list)
     assert len(snippets) >= 2
     assert any(s['name'] == 'Python Function' for s in snippets)
+
+
+def test_diff_settings():
+    """Test that only changed sections are reported"""
+    old = {"window": {"width": 400}, "hotkeys": {"a": "b"}, "gone": 1}
+    new = {"window": {"width": 500}, "hotkeys": {"a": "b"}, "added": 2}
+    assert diff_settings(old, new) == {"window": {"width": 500}, "gone": None, "added": 2}
+
+
+def test_config_reload_applies_changed_sections():
+    """Test that reload keeps unchanged sections and notifies listeners"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
+        json.dump({"window": {"width": 400}, "hotkeys": {"toggle_overlay": "ctrl+o"}}, f)
+        temp_config_path = f.name
+    
+    try:
+        config = Config(temp_config_path)
+        hotkeys = config.get('hotkeys')
+        received = []
+        config.add_listener(received.append)
+        
+        with open(temp_config_path, 'w') as f:
+            json.dump({"window": {"width": 500}, "hotkeys": {"toggle_overlay": "ctrl+o"}}, f)
+        changes = config.reload()
+        
+        assert changes == {"window": config.get('window')}
+        assert received == [changes]
+        assert config.get('window.width') == 500
+        assert config.get('hotkeys') is hotkeys
+    finally:
+        if os.path.exists(temp_config_path):
+            os.remove(temp_config_path)
+
+
+def test_config_reload_keeps_settings_on_invalid_json():
+    """Test that a half-written file does not clobber settings"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
+        json.dump({"window": {"width": 400}}, f)
+        temp_config_path = f.name
+    
+    try:
+        config = Config(temp_config_path)
+        with open(temp_config_path, 'w') as f:
+            f.write('{"window": ')
+        assert config.reload() == {}
+        assert config.settings['window'] == {"width": 400}
+        assert config.get('window.width') == 400
+    finally:
+        if os.path.exists(temp_config_path):
+            os.remove(temp_config_path)
+
+
+def test_config_save_skips_unchanged_content():
+    """Test that saving identical settings does not rewrite the file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = Config(os.path.join(temp_dir, "settings.json"))
+        assert config.save() is True
+        assert config.save() is False
+        
+        config.set('custom_key', 'custom_value')
+        assert config.save() is True
+        assert os.listdir(temp_dir) == ["settings.json"]
+
+
+def test_config_save_replaces_atomically(monkeypatch):
+    """Test that a failed write leaves the existing file intact"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "settings.json")
+        config = Config(config_path)
+        config.save()
+        
+        def failing_fsync(fd):
+            raise OSError("disk full")
+        monkeypatch.setattr(os, 'fsync', failing_fsync)
+        
+        config.set('custom_key', 'custom_value')
+        assert config.save() is False
+        assert config.dirty is True
+        with open(config_path, 'r', encoding='utf-8') as f:
+            assert 'custom_key' not in json.load(f)
+        assert os.listdir(temp_dir) == ["settings.json"]
+
+
+def test_config_write_behind_coalesces_sets():
+    """Test that a burst of set() calls results in a single write"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "settings.json")
+        config = Config(config_path)
+        config.enable_write_behind(delay=0.05)
+        
+        writes = []
+        original_write = config._write
+        config._write = lambda content: writes.append(content) or original_write(content)
+        
+        for i in range(20):
+            config.set('window', {'opacity': i / 100})
+        assert writes == []
+        
+        deadline = time.monotonic() + 2
+        while not writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert len(writes) == 1
+        assert json.loads(writes[0])['window'] == {'opacity': 0.19}
+
+
+def test_config_flush_writes_pending_changes():
+    """Test that flush writes immediately and cancels the timer"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "settings.json")
+        config = Config(config_path)
+        config.enable_write_behind(delay=60)
+        config.set('custom_key', 'custom_value')
+        
+        config.flush()
+        assert config.flush_timer is None
+        assert Config(config_path).get('custom_key') == 'custom_value'
+
+
+def test_merge_settings_is_deep():
+    """Test that nested dicts merge while other values replace"""
+    base = {"window": {"width": 400, "height": 600}, "snippets": [1, 2], "debug": False}
+    override = {"window": {"width": 800}, "snippets": [3]}
+    merged = merge_settings(base, override)
+    
+    assert merged == {"window": {"width": 800, "height": 600}, "snippets": [3], "debug": False}
+    assert base["window"] == {"width": 400, "height": 600}
+
+
+def test_config_layers_merge_with_dotted_lookup(tmp_path):
+    """Test that defaults, user and project layers merge deep"""
+    user_path = tmp_path / "settings.json"
+    user_path.write_text(json.dumps({"window": {"width": 500}, "theme": {"accent": "#ff0000"}}))
+    project_path = tmp_path / PROJECT_CONFIG_NAME
+    project_path.write_text(json.dumps({"window": {"opacity": 0.5}, "formatter": {"timeout": 2}}))
+    
+    config = Config(str(user_path), project_path=str(project_path))
+    
+    assert config.get('window.width') == 500
+    assert config.get('window.height') == 600
+    assert config.get('window.opacity') == 0.5
+    assert config.get('theme.accent') == "#ff0000"
+    assert config.get('theme.background') == "#2b2b2b"
+    assert config.get('formatter') == {"timeout": 2}
+    assert config.get('window.missing', 'fallback') == 'fallback'
+    assert config.settings == {"window": {"width": 500}, "theme": {"accent": "#ff0000"}}
+
+
+def test_config_view_memoized_until_layer_changes(tmp_path):
+    """Test that the flat view is only rebuilt after a change"""
+    config = Config(str(tmp_path / "settings.json"))
+    view = config._view()
+    window = config.get('window')
+    assert config._view() is view
+    
+    config.set('theme.accent', '#00ff00')
+    assert config.view is None
+    assert config.get('theme.accent') == '#00ff00'
+    assert config.get('window') is window
+
+
+def test_config_set_dotted_key_copies_section(tmp_path):
+    """Test that dotted sets only touch the user layer and copy sections"""
+    user_path = tmp_path / "settings.json"
+    user_path.write_text(json.dumps({"window": {"width": 500}}))
+    config = Config(str(user_path))
+    window = config.settings['window']
+    
+    config.set('window.opacity', 0.8)
+    config.set('new.nested.key', 1)
+    
+    assert window == {"width": 500}
+    assert config.settings['window'] == {"width": 500, "opacity": 0.8}
+    assert config.get('new.nested.key') == 1
+    config.save()
+    assert json.loads(user_path.read_text()) == {"window": {"width": 500, "opacity": 0.8}, "new": {"nested": {"key": 1}}}
+
+
+def test_config_poll_reloads_project_layer(tmp_path):
+    """Test that edits to the project file are picked up and reported"""
+    user_path = tmp_path / "settings.json"
+    user_path.write_text(json.dumps({"window": {"width": 500}}))
+    project_path = tmp_path / PROJECT_CONFIG_NAME
+    project_path.write_text(json.dumps({"window": {"width": 700}}))
+    config = Config(str(user_path), project_path=str(project_path))
+    hotkeys = config.get('hotkeys')
+    assert config.get('window.width') == 700
+    
+    project_path.write_text(json.dumps({"window": {"width": 900}, "extra": True}))
+    config.project_watcher.debounce = 0
+    config.poll()
+    changes = config.poll()
+    
+    assert set(changes) == {"window", "extra"}
+    assert config.get('window.width') == 900
+    assert config.get('hotkeys') is hotkeys
+    
+    project_path.unlink()
+    assert set(config.reload()) == {"window", "extra"}
+    assert config.get('window.width') == 500
+
+
+def test_find_project_config_searches_parents(tmp_path):
+    """Test that the nearest project file above a directory is found"""
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    (nested / "settings.json").write_text("{}")
+    (tmp_path / PROJECT_CONFIG_NAME).write_text("{}")
+    assert find_project_config(str(nested)) == str(tmp_path / PROJECT_CONFIG_NAME)
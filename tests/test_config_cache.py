@@ -0,0 +1,113 @@
+"""
+Tests for AicodeX compiled configuration cache
+"""
+
+import os
+import sys
+import json
+import tempfile
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+from config_cache import LazySnippets, cache_path_for
+from snippet_index import SnippetIndex
+
+
+SETTINGS = {
+    "window": {"width": 400, "opacity": 0.95},
+    "snippets": [
+        {"name": "Python Function", "code": "def function_name(param):\n    pass"},
+        {"name": "Unicode", "code": "print('héllo wörld ✓')", "trigger": "uni"},
+    ],
+}
+
+
+@pytest.fixture
+def config_path():
+    """Write a config file in a temporary directory"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "settings.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(SETTINGS, f)
+        yield path
+
+
+def build_cache(path):
+    """Load a config cold and wait for its cache to be written"""
+    config = Config(path, use_cache=True)
+    assert config.cache_stale
+    config.refresh_cache()
+    config.cache_thread.join()
+    assert not config.cache_stale
+    return config
+
+
+def test_warm_start_uses_cache(config_path):
+    """Test that a warm start reads settings from the cache"""
+    build_cache(config_path)
+    assert os.path.exists(cache_path_for(config_path))
+
+    config = Config(config_path, use_cache=True)
+    assert not config.cache_stale
+    assert config.settings['window'] == SETTINGS['window']
+
+    snippets = config.get('snippets')
+    assert isinstance(snippets, LazySnippets)
+    assert snippets == SETTINGS['snippets']
+    assert snippets[1]['code'] == "print('héllo wörld ✓')"
+    assert snippets[1]['trigger'] == "uni"
+
+
+def test_snippet_bodies_decoded_lazily(config_path):
+    """Test that snippet bodies are only decoded when accessed"""
+    build_cache(config_path)
+    snippets = Config(config_path, use_cache=True).get('snippets')
+
+    assert snippets[0]['name'] == "Python Function"
+    assert snippets[0]._code is None
+    assert snippets[0]['code'].startswith("def ")
+    assert snippets[1]._code is None
+
+
+def test_cached_index_postings(config_path):
+    """Test that the pre-built index answers searches without rebuilding"""
+    build_cache(config_path)
+    config = Config(config_path, use_cache=True)
+    index = SnippetIndex(config.get('snippets'), postings=config.snippet_postings)
+
+    assert [index.get(i)['name'] for i in index.search('python')] == ["Python Function"]
+    assert [index.get(i)['name'] for i in index.search('wörld')] == ["Unicode"]
+    assert all(snippet._code is None for snippet in config.get('snippets'))
+
+
+def test_cache_rebuilt_when_source_changes(config_path):
+    """Test that a modified source invalidates the cache"""
+    build_cache(config_path)
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({"window": {"width": 800}}, f)
+
+    config = Config(config_path, use_cache=True)
+    assert config.cache_stale
+    assert config.settings == {"window": {"width": 800}}
+    assert config.get('window.width') == 800
+
+    config.refresh_cache()
+    config.cache_thread.join()
+    assert Config(config_path, use_cache=True).settings == {"window": {"width": 800}}
+
+
+def test_save_from_cached_settings(config_path):
+    """Test that cache-backed snippets are written back as plain JSON"""
+    build_cache(config_path)
+    config = Config(config_path, use_cache=True)
+    config.set('window', {"width": 500})
+    assert config.save()
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['snippets'] == SETTINGS['snippets']
+    assert saved['window'] == {"width": 500}
+    assert Config(config_path, use_cache=True).cache_stale
@@ -0,0 +1,59 @@
+"""
+Tests for AicodeX configuration file watcher
+"""
+
+import os
+import sys
+import tempfile
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config_watcher import ConfigWatcher, file_signature
+
+
+@pytest.fixture
+def watched_file():
+    """Create a temporary file to watch"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
+        f.write('{}')
+        path = f.name
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def test_missing_file_signature():
+    """Test that a missing file has no signature"""
+    assert file_signature("non_existent_config.json") is None
+
+
+def test_no_change_is_quiet(watched_file):
+    """Test that an untouched file never reports a change"""
+    watcher = ConfigWatcher(watched_file, debounce=0.3)
+    assert not watcher.poll(now=0.0)
+    assert not watcher.poll(now=10.0)
+
+
+def test_change_reported_after_debounce(watched_file):
+    """Test that a change is reported once it has settled"""
+    watcher = ConfigWatcher(watched_file, debounce=0.3)
+    with open(watched_file, 'w') as f:
+        f.write('{"window": {}}')
+
+    assert not watcher.poll(now=0.0)
+    assert not watcher.poll(now=0.1)
+    assert watcher.poll(now=0.4)
+    assert not watcher.poll(now=1.0)
+
+
+def test_acknowledge_ignores_own_write(watched_file):
+    """Test that acknowledged writes are not reported"""
+    watcher = ConfigWatcher(watched_file, debounce=0.0)
+    with open(watched_file, 'w') as f:
+        f.write('{"written": "by us"}')
+    watcher.acknowledge()
+
+    assert not watcher.poll(now=0.0)
+    assert not watcher.poll(now=1.0)
@@ -0,0 +1,116 @@
+"""
+Tests for AicodeX hotkey dispatch queue
+"""
+
+import os
+import sys
+import threading
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from dispatch import HotkeyDispatcher, LatencyRecorder
+
+
+def test_events_run_on_drain_only():
+    """Test that posting never runs the handler directly"""
+    dispatcher = HotkeyDispatcher()
+    calls = []
+    dispatcher.register('format_code', lambda: calls.append('format'))
+
+    dispatcher.post('format_code')
+    assert calls == []
+    assert dispatcher.drain() == 1
+    assert calls == ['format']
+
+
+def test_toggle_coalescing():
+    """Test that paired toggles cancel out and odd counts run once"""
+    dispatcher = HotkeyDispatcher()
+    calls = []
+    dispatcher.register('toggle_overlay', lambda: calls.append('toggle'), HotkeyDispatcher.COALESCE_TOGGLE)
+
+    for _ in range(4):
+        dispatcher.post('toggle_overlay', hotkey=True)
+    dispatcher.drain()
+    assert calls == []
+
+    for _ in range(3):
+        dispatcher.post('toggle_overlay', hotkey=True)
+    dispatcher.drain()
+    assert calls == ['toggle']
+    assert dispatcher.latency.count == 7
+
+
+def test_last_coalescing_uses_latest_args():
+    """Test that repeated events run once with the latest arguments"""
+    dispatcher = HotkeyDispatcher()
+    calls = []
+    dispatcher.register('insert_snippet', calls.append)
+
+    dispatcher.post('insert_snippet', 'first')
+    dispatcher.post('insert_snippet', 'second')
+    dispatcher.drain()
+    assert calls == ['second']
+
+
+def test_uncoalesced_events_all_run_in_order():
+    """Test that two different inserts in one drain both run"""
+    dispatcher = HotkeyDispatcher()
+    calls = []
+    dispatcher.register('insert_snippet', lambda name: calls.append(name), HotkeyDispatcher.COALESCE_NONE)
+    dispatcher.register('toggle_overlay', lambda: calls.append('toggle'), HotkeyDispatcher.COALESCE_TOGGLE)
+
+    dispatcher.post('insert_snippet', 'A')
+    dispatcher.post('toggle_overlay')
+    dispatcher.post('insert_snippet', 'B', hotkey=True)
+    dispatcher.post('insert_snippet', 'A')
+    assert dispatcher.drain() == 4
+    assert calls == ['A', 'toggle', 'B', 'A']
+    assert dispatcher.latency.count == 1
+
+
+def test_posting_from_hook_threads():
+    """Test that events posted from other threads are all drained"""
+    dispatcher = HotkeyDispatcher()
+    calls = []
+    dispatcher.register('format_code', lambda: calls.append(1))
+
+    threads = [threading.Thread(target=lambda: [dispatcher.post('format_code', hotkey=True) for _ in range(100)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    dispatcher.drain()
+    assert calls == [1]
+    assert dispatcher.latency.count == 400
+
+
+def test_handler_errors_do_not_stop_drain():
+    """Test that a failing handler does not block other actions"""
+    dispatcher = HotkeyDispatcher()
+    calls = []
+    dispatcher.register('format_code', lambda: 1 / 0)
+    dispatcher.register('insert_snippet', lambda: calls.append('snippet'))
+
+    dispatcher.post('format_code')
+    dispatcher.post('insert_snippet')
+    dispatcher.drain()
+    assert calls == ['snippet']
+
+
+def test_latency_percentiles():
+    """Test percentile reporting"""
+    recorder = LatencyRecorder()
+    assert recorder.percentiles() == {}
+    assert recorder.summary() == "no samples"
+
+    for ms in range(1, 101):
+        recorder.record(ms / 1000)
+    values = recorder.percentiles()
+    assert values[50] == pytest.approx(51, abs=1)
+    assert values[99] == pytest.approx(99, abs=1)
+    assert "p90" in recorder.summary()
@@ -0,0 +1,150 @@
+"""
+Tests for the streaming downloader against a local HTTP stand-in
+"""
+
+import hashlib
+import os
+import sys
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.downloader import ChecksumError, DownloadError, download, partial_path
+from utils.handbrake_checker import HandBrakeChecker
+
+DATA = os.urandom(300 * 1024 + 17)
+DIGEST = hashlib.sha256(DATA).hexdigest()
+
+
+def get_requests(server):
+    """Return the GET requests the server received"""
+    return [(path, headers) for command, path, headers in server.requests if command == 'GET']
+
+
+def test_download_hashes_while_streaming(http_server, tmp_path):
+    """Test a plain download returns the digest and leaves no partial file"""
+    url = http_server.add('/installer.exe', DATA)
+    destination = str(tmp_path / 'installer.exe')
+
+    assert download(url, destination, DIGEST, chunk_size=64 * 1024) == DIGEST
+    with open(destination, 'rb') as f:
+        assert f.read() == DATA
+    assert not os.path.exists(partial_path(destination))
+
+
+def test_resume_from_partial(http_server, tmp_path):
+    """Test that an existing partial file is resumed with a Range request"""
+    url = http_server.add('/installer.exe', DATA)
+    destination = str(tmp_path / 'installer.exe')
+    with open(partial_path(destination), 'wb') as f:
+        f.write(DATA[:100000])
+
+    assert download(url, destination, DIGEST) == DIGEST
+    (path, headers), = get_requests(http_server)
+    assert headers['Range'] == 'bytes=100000-'
+
+
+def test_resume_complete_partial(http_server, tmp_path):
+    """Test that a complete partial file is verified without refetching"""
+    url = http_server.add('/installer.exe', DATA)
+    destination = str(tmp_path / 'installer.exe')
+    with open(partial_path(destination), 'wb') as f:
+        f.write(DATA)
+
+    assert download(url, destination, DIGEST) == DIGEST
+    assert os.path.getsize(destination) == len(DATA)
+
+
+def test_restart_when_ranges_ignored(http_server, tmp_path):
+    """Test that a server ignoring Range restarts the download"""
+    url = http_server.add('/installer.exe', DATA)
+    http_server.ranges = False
+    destination = str(tmp_path / 'installer.exe')
+    with open(partial_path(destination), 'wb') as f:
+        f.write(b'stale bytes')
+
+    assert download(url, destination, DIGEST, segments=4, min_segment_size=1024) == DIGEST
+
+
+def test_interrupted_download_resumes(http_server, tmp_path):
+    """Test that a dropped connection keeps the partial file for the next call"""
+    url = http_server.add('/installer.exe', DATA)
+    http_server.truncate_after = 50000
+    destination = str(tmp_path / 'installer.exe')
+
+    with pytest.raises(Exception):
+        download(url, destination, DIGEST, timeout=5)
+    assert os.path.getsize(partial_path(destination)) == 50000
+
+    assert download(url, destination, DIGEST) == DIGEST
+
+
+def test_parallel_segments(http_server, tmp_path):
+    """Test that a large file is fetched as parallel ranged segments"""
+    url = http_server.add('/installer.exe', DATA)
+    destination = str(tmp_path / 'installer.exe')
+
+    assert download(url, destination, DIGEST, segments=4, chunk_size=8192, min_segment_size=1024) == DIGEST
+    ranges = sorted(headers['Range'] for path, headers in get_requests(http_server))
+    assert len(ranges) == 4
+    with open(destination, 'rb') as f:
+        assert f.read() == DATA
+
+
+def test_failed_segment_keeps_contiguous_prefix(http_server, tmp_path):
+    """Test that a failed segment leaves a resumable prefix"""
+    url = http_server.add('/installer.exe', DATA)
+    http_server.truncate_after = 1000
+    destination = str(tmp_path / 'installer.exe')
+
+    with pytest.raises(DownloadError):
+        download(url, destination, DIGEST, segments=4, min_segment_size=1024, timeout=5)
+    partial = partial_path(destination)
+    with open(partial, 'rb') as f:
+        prefix = f.read()
+    assert prefix == DATA[:len(prefix)]
+
+    assert download(url, destination, DIGEST) == DIGEST
+
+
+def test_checksum_mismatch_removes_partial(http_server, tmp_path):
+    """Test that a hash mismatch discards the download"""
+    url = http_server.add('/installer.exe', DATA)
+    destination = str(tmp_path / 'installer.exe')
+
+    with pytest.raises(ChecksumError):
+        download(url, destination, '0' * 64)
+    assert not os.path.exists(destination)
+    assert not os.path.exists(partial_path(destination))
+
+
+def test_handbrake_download(http_server, tmp_path):
+    """Test HandBrakeChecker.download against the stand-in"""
+    checker = HandBrakeChecker()
+    checker.DOWNLOAD_URL = http_server.add('/HandBrake.exe', DATA)
+    checker.EXPECTED_SHA256 = DIGEST
+    destination = str(tmp_path / 'HandBrake.exe')
+
+    assert checker.download(destination) is True
+    checker.EXPECTED_SHA256 = '0' * 64
+    assert checker.download(str(tmp_path / 'other.exe')) is False
+
+
+def test_progress_callback(http_server, tmp_path):
+    """Test that progress is reported and can abort a download"""
+    url = http_server.add('/installer.exe', DATA)
+    destination = str(tmp_path / 'installer.exe')
+    seen = []
+
+    def stop(done, total):
+        seen.append((done, total))
+        raise RuntimeError("cancelled")
+
+    with pytest.raises(RuntimeError):
+        download(url, destination, DIGEST, chunk_size=65536, progress=stop)
+    assert seen == [(65536, len(DATA))]
+
+    seen.clear()
+    download(url, destination, DIGEST, chunk_size=65536, progress=lambda done, total: seen.append(done))
+    assert seen[0] == 131072 and seen[-1] == len(DATA)
@@ -0,0 +1,94 @@
+"""
+Tests for AicodeX code formatting engine
+"""
+
+import os
+import sys
+import threading
+import time
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from formatter import FormatEngine, FormatError
+
+
+def upper_formatter(code, options):
+    """Stand-in formatter that upper-cases code"""
+    if code == 'bad':
+        raise ValueError("cannot parse")
+    if code == 'slow':
+        time.sleep(10)
+    return code.upper() + options.get('suffix', '')
+
+
+@pytest.fixture
+def engine():
+    """Formatting engine running the stand-in formatter"""
+    engine = FormatEngine(upper_formatter, timeout=2.0)
+    yield engine
+    engine.close()
+
+
+def test_format_in_worker(engine):
+    """Test that code is formatted by the worker process"""
+    assert engine.format('x = 1') == 'X = 1'
+    assert engine.process.is_alive()
+    assert engine.process.pid != os.getpid()
+    # Spawned, not forked from the multithreaded overlay process
+    assert engine.process._start_method == 'spawn'
+
+
+def test_cache_by_content_and_options(engine):
+    """Test that repeated requests are served from the cache"""
+    engine.format('x = 1')
+    engine.format('x = 1')
+    assert (engine.hits, engine.misses) == (1, 1)
+
+    assert engine.format('x = 1', {'suffix': '!'}) == 'X = 1!'
+    assert engine.misses == 2
+
+    # Options loaded from JSON may hold lists
+    engine.format('x = 1', {'target_versions': ['py38', 'py39']})
+    engine.format('x = 1', {'target_versions': ['py38', 'py39']})
+    assert (engine.hits, engine.misses) == (2, 3)
+
+
+def test_formatter_error(engine):
+    """Test that formatter exceptions become FormatError"""
+    with pytest.raises(FormatError, match="cannot parse"):
+        engine.format('bad')
+    assert engine.format('ok') == 'OK'
+
+
+def test_timeout_restarts_worker(engine):
+    """Test that an overrunning request is killed and the next one works"""
+    engine.timeout = 0.5
+    with pytest.raises(FormatError, match="timed out"):
+        engine.format('slow')
+    assert engine.process is None
+    assert engine.format('fast') == 'FAST'
+
+
+def test_submit_and_cancel(engine):
+    """Test background requests and cancelling a running one"""
+    engine.start()
+    done = threading.Event()
+    results = []
+
+    def callback(result, error):
+        results.append((result, error))
+        done.set()
+
+    engine.submit('slow', callback)
+    deadline = time.monotonic() + 2
+    while not engine.busy and time.monotonic() < deadline:
+        time.sleep(0.01)
+    engine.cancel()
+    assert done.wait(2)
+    assert results == [(None, "Formatting cancelled")]
+
+    done.clear()
+    engine.submit('y', callback).result(timeout=5)
+    assert results[-1] == ('Y', None)
@@ -0,0 +1,193 @@
+"""
+Tests for AicodeX single-instance control
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import instance
+from instance import InstanceServer, send_command
+
+MAIN = os.path.join(os.path.dirname(__file__), '..', 'src', 'main.py')
+
+
+@pytest.fixture
+def runtime_dir(tmp_path, monkeypatch):
+    """Keep sockets and port files inside the test's temporary directory"""
+    monkeypatch.setenv('AICODEX_RUNTIME_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def server(runtime_dir):
+    """A bound and serving instance server recording posted actions"""
+    posted = []
+    server = InstanceServer()
+    assert server.bind() is True
+    server.serve(lambda action, *args: posted.append((action, args)))
+    server.posted = posted
+    yield server
+    server.close()
+
+
+def test_handle_validates_requests():
+    """Test that unknown commands and wrong arguments are refused"""
+    posted = []
+    server = InstanceServer()
+    server.post = lambda action, *args: posted.append((action, args))
+
+    assert server.handle({'command': 'toggle'}) == {'ok': True}
+    assert server.handle({'command': 'insert', 'args': ['Main']}) == {'ok': True}
+    assert server.handle({'command': 'insert'})['ok'] is False
+    assert server.handle({'command': 'insert', 'args': [1]})['ok'] is False
+    assert server.handle({'command': 'quit'})['error'] == "unknown command: quit"
+    assert server.handle(['toggle'])['ok'] is False
+    assert posted == [('toggle_overlay', ()), ('insert_snippet', ('Main',))]
+
+
+def test_handle_checks_token():
+    """Test that a server with a token refuses requests without it"""
+    server = InstanceServer()
+    server.post = lambda action, *args: None
+    server.token = 'secret'
+
+    assert server.handle({'command': 'ping'})['error'] == "invalid token"
+    assert server.handle({'command': 'ping', 'token': 'secret'}) == {'ok': True}
+
+
+def test_send_command_without_instance(runtime_dir):
+    """Test that sending to no running instance returns None"""
+    assert send_command('toggle') is None
+
+
+def test_commands_reach_post(server):
+    """Test that forwarded commands are posted as dispatcher actions"""
+    assert send_command('toggle') == {'ok': True}
+    assert send_command('insert', 'Main Function') == {'ok': True}
+    assert send_command('reload') == {'ok': True}
+    assert send_command('insert')['ok'] is False
+
+    assert server.posted == [
+        ('toggle_overlay', ()),
+        ('insert_snippet', ('Main Function',)),
+        ('reload_config', ()),
+    ]
+
+
+def test_second_bind_refused(server):
+    """Test that only one instance can claim the socket"""
+    other = InstanceServer()
+    assert other.bind() is False
+    assert send_command('toggle') == {'ok': True}
+
+
+def test_close_releases_instance(runtime_dir):
+    """Test that a closed server removes its file and can be replaced"""
+    server = InstanceServer()
+    assert server.bind() is True
+    server.serve(lambda action, *args: None)
+    path = server.path
+    server.close()
+
+    assert not os.path.exists(path)
+    assert send_command('toggle') is None
+    replacement = InstanceServer()
+    assert replacement.bind() is True
+    replacement.close()
+
+
+@pytest.mark.skipif(not instance.USE_UNIX_SOCKET, reason="Unix sockets only")
+def test_stale_socket_replaced(runtime_dir):
+    """Test that a socket left by a crashed instance is reclaimed"""
+    open(instance.runtime_path('sock'), 'w').close()
+
+    server = InstanceServer()
+    assert server.bind() is True
+    server.close()
+
+
+def test_lock_file_held_while_running(runtime_dir):
+    """Test that the lock file lives as long as the bound server"""
+    server = InstanceServer()
+    assert server.bind() is True
+    lock = instance.runtime_path('lock')
+    with open(lock) as f:
+        assert f.read() == str(os.getpid())
+
+    server.close()
+    assert not os.path.exists(lock)
+
+
+def test_lock_of_starting_instance_respected(runtime_dir):
+    """Test that a launch holding the lock blocks cleanup by another launch"""
+    with open(instance.runtime_path('lock'), 'w') as f:
+        f.write(str(os.getpid()))
+    open(instance.runtime_path('sock'), 'w').close()
+
+    assert InstanceServer().bind() is False
+    assert os.path.exists(instance.runtime_path('sock'))
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Lock owners are checked by pid on POSIX")
+def test_stale_lock_replaced(runtime_dir):
+    """Test that a lock left by an exited process is reclaimed"""
+    finished = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                              capture_output=True, text=True)
+    with open(instance.runtime_path('lock'), 'w') as f:
+        f.write(finished.stdout.strip())
+
+    server = InstanceServer()
+    assert server.bind() is True
+    with open(instance.runtime_path('lock')) as f:
+        assert f.read() == str(os.getpid())
+    server.close()
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Directory modes are checked on POSIX")
+def test_runtime_dir_is_private(runtime_dir):
+    """Test that runtime files go in a 0700 directory and an open one is refused"""
+    directory = instance.runtime_dir()
+    assert os.path.dirname(instance.runtime_path('lock')) == directory
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        InstanceServer().bind()
+    assert send_command('toggle') is None
+
+
+def _run_main(*args):
+    """Run the main entry point in a fresh interpreter"""
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', MAIN, *args],
+        capture_output=True, text=True, timeout=30, env=os.environ.copy()
+    )
+
+
+def test_main_forwards_without_gui_imports(server):
+    """Test that a second launch forwards its command and skips tkinter and keyboard"""
+    started = time.perf_counter()
+    result = _run_main('--insert', 'Main Function')
+    elapsed = time.perf_counter() - started
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert server.posted == [('insert_snippet', ('Main Function',))]
+    imported = [line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()]
+    assert 'tkinter' not in imported
+    assert 'keyboard' not in imported
+    assert elapsed < 10
+
+
+def test_main_command_without_instance(runtime_dir):
+    """Test that forwarding a command fails when nothing is running"""
+    result = _run_main('--toggle')
+
+    assert result.returncode == 1
+    assert "AicodeX is not running" in result.stdout
@@ -0,0 +1,144 @@
+"""
+Tests for AicodeX key bindings and chord matching
+"""
+
+import os
+import sys
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from keymap import (ActionRegistry, ChordMatcher, ChordTrie, KeyNames, make_stroke, parse_sequence,
+                    parse_stroke)
+
+
+def test_parse_stroke_normalizes():
+    """Test that modifier order, case and aliases are normalized"""
+    assert parse_stroke('Shift+Ctrl+O') == 'ctrl+shift+o'
+    assert parse_stroke('control+left alt+x') == 'ctrl+alt+x'
+    assert parse_stroke('cmd+k') == 'win+k'
+    assert make_stroke({'shift', 'ctrl'}, 'o') == 'ctrl+shift+o'
+
+
+def test_parse_sequence():
+    """Test multi-stroke chord parsing"""
+    assert parse_sequence('ctrl+k ctrl+s') == ('ctrl+k', 'ctrl+s')
+    assert parse_sequence('ctrl+k, ctrl+s') == ('ctrl+k', 'ctrl+s')
+    with pytest.raises(ValueError):
+        parse_stroke('ctrl+a+b')
+    with pytest.raises(ValueError):
+        parse_sequence('  ')
+
+
+def test_parse_sequence_multiword_and_comma_keys():
+    """Test that multi-word key names and the comma key stay in one stroke"""
+    assert parse_sequence('page up') == ('page up',)
+    assert parse_sequence('ctrl+page down ctrl+print screen') == ('ctrl+page down', 'ctrl+print screen')
+    assert parse_sequence('ctrl + shift + page up') == ('ctrl+shift+page up',)
+    assert parse_sequence('ctrl+,') == ('ctrl+,',)
+    assert parse_sequence('ctrl+k ctrl+,') == ('ctrl+k', 'ctrl+,')
+    assert parse_sequence('ctrl+k, ctrl+comma') == ('ctrl+k', 'ctrl+,')
+    assert parse_sequence('ctrl+k , alt+x') == ('ctrl+k', 'alt+x')
+    assert parse_sequence(',') == (',',)
+    assert parse_sequence('control+left alt+x') == ('ctrl+alt+x',)
+
+
+def test_shifted_keys_match_by_scan_code():
+    """Test that a shifted digit event matches a binding on the digit"""
+    codes = {'1': (2,), '!': (2,), 'a': (30,), 'page up': (73,), 'enter': (28, 156)}
+
+    def scan_codes(name):
+        if name not in codes:
+            raise ValueError(name)
+        return codes[name]
+
+    keys = KeyNames(scan_codes)
+    trie = ChordTrie(keys)
+    assert trie.add('ctrl+shift+1', 'one', "One") is None
+    assert trie.add('ctrl+enter', 'run', "Run") is None
+    assert 'conflicts with One' in trie.add('ctrl+shift+!', 'bang', "Bang")
+    matcher = ChordMatcher(trie)
+
+    assert keys.event_key('!', 2) == '1'
+    assert matcher.feed(make_stroke({'ctrl', 'shift'}, keys.event_key('!', 2)), now=0.0) == 'one'
+    assert matcher.feed(make_stroke({'ctrl'}, keys.event_key('enter', 156)), now=0.1) == 'run'
+    assert keys.event_key('Q', 16) == 'q'
+    assert parse_sequence('ctrl+page up', keys) == ('ctrl+page up',)
+
+
+def test_single_and_chord_matching():
+    """Test that single strokes and chords resolve to their values"""
+    trie = ChordTrie()
+    assert trie.add('ctrl+shift+o', 'toggle', "Toggle") is None
+    assert trie.add('ctrl+k ctrl+s', 'save', "Save") is None
+    matcher = ChordMatcher(trie)
+
+    assert matcher.feed('ctrl+shift+o', now=0.0) == 'toggle'
+    assert matcher.feed('ctrl+k', now=1.0) is None
+    assert matcher.feed('ctrl+s', now=1.5) == 'save'
+    assert matcher.feed('ctrl+s', now=2.0) is None
+
+
+def test_chord_timeout():
+    """Test that a partial chord is abandoned after the timeout"""
+    trie = ChordTrie()
+    trie.add('ctrl+k ctrl+s', 'save', "Save")
+    matcher = ChordMatcher(trie, timeout=1.0)
+
+    matcher.feed('ctrl+k', now=0.0)
+    assert matcher.feed('ctrl+s', now=2.0) is None
+
+
+def test_non_continuation_restarts():
+    """Test that a stroke breaking a chord is tried as a new chord"""
+    trie = ChordTrie()
+    trie.add('ctrl+k ctrl+s', 'save', "Save")
+    trie.add('ctrl+shift+o', 'toggle', "Toggle")
+    matcher = ChordMatcher(trie)
+
+    matcher.feed('ctrl+k', now=0.0)
+    assert matcher.feed('ctrl+shift+o', now=0.1) == 'toggle'
+    matcher.feed('ctrl+k', now=0.2)
+    matcher.feed('a', now=0.3)
+    assert matcher.feed('ctrl+s', now=0.4) is None
+
+
+def test_conflicts_reported():
+    """Test that duplicate and shadowing bindings are reported, first wins"""
+    trie = ChordTrie()
+    assert trie.add('ctrl+k', 'first', "First") is None
+
+    assert 'conflicts with First' in trie.add('Ctrl+K', 'dup', "Dup")
+    assert 'is shadowed by First' in trie.add('ctrl+k ctrl+s', 'long', "Long")
+    trie.add('ctrl+j ctrl+s', 'chord', "Chord")
+    assert 'would shadow Chord' in trie.add('ctrl+j', 'short', "Short")
+    assert 'Invalid binding' in trie.add('ctrl+a+b', 'bad', "Bad")
+    assert trie.size == 2
+
+    matcher = ChordMatcher(trie)
+    assert matcher.feed('ctrl+k', now=0.0) == 'first'
+
+
+def test_registry_bindings():
+    """Test that config bindings override defaults and empty ones unbind"""
+    registry = ActionRegistry()
+    registry.register('toggle_overlay', print, 'ctrl+shift+o', "Toggle Overlay")
+    registry.register('format_code', print, 'ctrl+shift+f')
+    registry.register('insert_snippet', print)
+
+    bindings = registry.bindings({'toggle_overlay': 'ctrl+alt+o', 'format_code': ''})
+    assert bindings == {'toggle_overlay': 'ctrl+alt+o'}
+    assert registry.get('format_code')[2] == 'format_code'
+
+
+def test_many_bindings():
+    """Test that hundreds of snippet shortcuts coexist in one trie"""
+    trie = ChordTrie()
+    for i in range(500):
+        assert trie.add(f"ctrl+alt+s {i // 26} {chr(97 + i % 26)}", i, f"Snippet {i}") is None
+    matcher = ChordMatcher(trie)
+
+    for stroke in ('ctrl+alt+s', '7', 'q'):
+        value = matcher.feed(stroke, now=0.0)
+    assert value == 7 * 26 + 16
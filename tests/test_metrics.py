@@ -0,0 +1,141 @@
+"""
+Tests for AicodeX runtime metrics
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from dispatch import HotkeyDispatcher
+from metrics import Histogram, Metrics, format_snapshot, metrics, resident_memory
+from ui_scheduler import UIScheduler
+
+
+@pytest.fixture
+def enabled():
+    """Enable the process-wide metrics for one test"""
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    """Test that counters, histograms and timers are no-ops by default"""
+    m = Metrics()
+    m.incr('keys')
+    m.observe('latency', 0.01)
+    with m.timer('block'):
+        pass
+    assert m.snapshot()['counters'] == {}
+    assert m.snapshot()['histograms'] == {}
+
+
+def test_histogram_percentiles_by_bucket():
+    """Test that percentiles land on bucket bounds and max is exact"""
+    h = Histogram()
+    for _ in range(90):
+        h.observe(0.0008)
+    for _ in range(10):
+        h.observe(0.2)
+
+    assert h.percentile(50) == 0.001
+    assert h.percentile(90) == 0.001
+    assert h.percentile(99) == 0.2
+    assert h.snapshot()['max_ms'] == 200.0
+    assert Histogram().snapshot()['p99_ms'] == 0.0
+
+
+def test_counters_and_timers(enabled):
+    """Test that enabled metrics count and time blocks"""
+    enabled.incr('keys')
+    enabled.incr('keys', 2)
+    with enabled.timer('block'):
+        pass
+
+    snapshot = enabled.snapshot()
+    assert snapshot['counters'] == {'keys': 3}
+    assert snapshot['histograms']['block']['count'] == 1
+
+
+def test_gauges_keep_the_latest_value(enabled):
+    """Test that gauges are overwritten and shown in the debug text"""
+    enabled.gauge('memory.hidden_mb', 80.0)
+    enabled.gauge('memory.hidden_mb', 42.5)
+
+    snapshot = enabled.snapshot()
+    assert snapshot['gauges'] == {'memory.hidden_mb': 42.5}
+    assert "42.5" in format_snapshot(snapshot)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="reads /proc")
+def test_resident_memory_tracks_allocations():
+    """Test that resident memory is reported and grows with a large allocation"""
+    before = resident_memory()
+    block = b'x' * (64 * 1024 * 1024)
+    after = resident_memory()
+    del block
+
+    assert before > 0
+    assert after - before >= 32 * 1024 * 1024
+
+
+def test_dispatcher_and_scheduler_report(enabled):
+    """Test that hotkey dispatch and UI updates feed the metrics"""
+    dispatcher = HotkeyDispatcher()
+    dispatcher.register('toggle', lambda: None)
+    dispatcher.register('format_result', lambda result: None)
+    dispatcher.post('toggle', hotkey=True)
+    dispatcher.post('toggle', hotkey=True)
+    dispatcher.post('format_result', 'code')
+    dispatcher.drain()
+
+    class Root:
+        def after(self, ms, callback):
+            return 'job'
+    scheduler = UIScheduler(Root(), clock=lambda: 0.0)
+    scheduler.schedule('list', lambda: None)
+    scheduler.schedule('list', lambda: None)
+    scheduler.schedule('list', lambda: None)
+
+    snapshot = enabled.snapshot()
+    assert snapshot['counters']['hotkey.events'] == 2
+    assert snapshot['histograms']['hotkey.latency']['count'] == 2
+    assert snapshot['histograms']['handler.toggle']['count'] == 1
+    assert snapshot['counters']['dispatch.events'] == 1
+    assert snapshot['histograms']['dispatch.format_result']['count'] == 1
+    assert dispatcher.latency.count == 2
+    assert snapshot['counters']['ui.applied'] == 1
+    assert snapshot['counters']['ui.dropped'] == 1
+
+
+def test_writer_appends_jsonl(enabled, tmp_path):
+    """Test that snapshots are appended as JSON lines"""
+    path = tmp_path / "metrics.jsonl"
+    enabled.incr('keys')
+    enabled.start_writer(str(path), interval=0.01)
+    enabled.incr('keys')
+    enabled.stop_writer()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines
+    assert lines[-1]['counters'] == {'keys': 2}
+
+
+def test_format_snapshot_shows_rates():
+    """Test that the debug text includes per-second counter rates"""
+    previous = {'time': 10.0, 'uptime_s': 5, 'counters': {'keys': 10}, 'histograms': {}}
+    current = {'time': 12.0, 'uptime_s': 7, 'counters': {'keys': 30}, 'histograms': {
+        'hotkey.latency': {'count': 4, 'mean_ms': 1, 'p50_ms': 1, 'p90_ms': 2.5, 'p99_ms': 2.5, 'max_ms': 2.1}
+    }}
+    text = format_snapshot(current, previous)
+
+    assert "10.0/s" in text
+    assert "hotkey.latency" in text
+    assert "/s" not in format_snapshot(current)
@@ -0,0 +1,86 @@
+"""
+Tests for AicodeX notification queue
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import stubs
+from notifier import NotificationQueue
+from ui_scheduler import UIScheduler
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    """A Notifier built on the stub Tk widgets instead of a real Toplevel"""
+    for name, module in stubs.tk_modules().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    # A fresh copy of the module on the stubs; the original is put back after
+    monkeypatch.delitem(sys.modules, 'notifier')
+    stubbed = importlib.import_module('notifier')
+    root = stubs.Tk()
+    return stubbed.Notifier(root, UIScheduler(root))
+
+
+def test_first_message_shown_immediately():
+    """Test that a message on an empty queue is shown at once"""
+    queue = NotificationQueue()
+    assert queue.push("Formatted") is True
+    assert (queue.current, queue.count) == ("Formatted", 1)
+
+
+def test_duplicates_coalesce():
+    """Test that repeated messages raise counts instead of queueing"""
+    queue = NotificationQueue()
+    queue.push("Checking")
+    assert queue.push("Checking") is True
+    assert queue.push("Done") is False
+    assert queue.push("Done") is False
+
+    assert queue.count == 2
+    assert dict(queue.pending) == {"Done": 2}
+    assert queue.coalesced == 2
+
+
+def test_advance_in_order():
+    """Test that waiting messages are shown in arrival order"""
+    queue = NotificationQueue()
+    for message in ("a", "b", "c"):
+        queue.push(message)
+
+    assert queue.advance() == "b"
+    assert queue.advance() == "c"
+    assert queue.advance() is None
+    assert queue.push("d") is True
+
+
+def test_bounded_pending():
+    """Test that the oldest waiting message is dropped when full"""
+    queue = NotificationQueue(max_pending=3)
+    for i in range(100):
+        queue.push(f"message {i}")
+
+    assert queue.current == "message 0"
+    assert list(queue.pending) == ["message 97", "message 98", "message 99"]
+    assert queue.dropped == 96
+
+
+def test_waiting_count_shown_while_message_visible(notifier):
+    """Test that a message queued behind the visible one updates the detail line"""
+    notifier.show("Formatted")
+    assert notifier.detail_var.get() == ""
+
+    notifier.show("Checked")
+    assert notifier.message_var.get() == "Formatted"
+    assert notifier.detail_var.get() == "1 more"
+
+    notifier.show("Formatted")
+    notifier.show("Saved")
+    assert notifier.detail_var.get() == "x2, 2 more"
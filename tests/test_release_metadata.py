@@ -0,0 +1,138 @@
+"""
+Tests for release metadata fetching against a local HTTP stand-in
+"""
+
+import json
+import os
+import sys
+import threading
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.handbrake_checker import HandBrakeChecker
+from utils.release_metadata import ReleaseMetadataProvider
+
+RELEASE = {
+    "version": "1.11.0",
+    "download_url": "https://example.invalid/HandBrake-1.11.0.exe",
+    "sha256": "a" * 64,
+}
+
+
+def serve_release(server, release=RELEASE):
+    """Serve release metadata and return its URL"""
+    return server.add('/release.json', json.dumps(release).encode('utf-8'))
+
+
+def test_no_url_uses_constants():
+    """Test that without an endpoint the constants are used"""
+    provider = ReleaseMetadataProvider()
+    assert provider.get() is None
+
+    checker = HandBrakeChecker(metadata=provider)
+    assert checker.get_info()['version'] == HandBrakeChecker.LATEST_VERSION
+    assert "1.10.2" in checker.check_version()
+
+
+def test_fetch_and_ttl(http_server):
+    """Test that metadata is fetched once and served from memory within the TTL"""
+    provider = ReleaseMetadataProvider(serve_release(http_server), ttl=3600)
+
+    assert provider.get() == RELEASE
+    assert provider.get() == RELEASE
+    assert len(http_server.requests) == 1
+
+
+def test_conditional_revalidation(http_server):
+    """Test that an expired entry is revalidated with ETag and If-Modified-Since"""
+    provider = ReleaseMetadataProvider(serve_release(http_server), ttl=0)
+
+    provider.get()
+    assert provider.get() == RELEASE
+    _, _, headers = http_server.requests[-1]
+    assert headers['If-None-Match'] == provider.entry['etag']
+    assert headers['If-Modified-Since'] == provider.entry['last_modified']
+    assert provider.offline is False
+    assert provider.fetches == 2
+
+
+def test_disk_cache(http_server, tmp_path):
+    """Test that a new provider reuses the on-disk cache for the same URL"""
+    url = serve_release(http_server)
+    cache_path = str(tmp_path / 'release.cache')
+    ReleaseMetadataProvider(url, cache_path=cache_path).get()
+
+    assert ReleaseMetadataProvider(url, cache_path=cache_path).get() == RELEASE
+    assert len(http_server.requests) == 1
+
+    other = ReleaseMetadataProvider(http_server.url('/other.json'), cache_path=cache_path)
+    assert other.entry is None
+
+
+def test_offline_fallback(http_server, tmp_path):
+    """Test that a failed fetch falls back to the last known metadata"""
+    url = serve_release(http_server)
+    cache_path = str(tmp_path / 'release.cache')
+    ReleaseMetadataProvider(url, cache_path=cache_path).get()
+    del http_server.files['/release.json']
+
+    provider = ReleaseMetadataProvider(url, cache_path=cache_path, ttl=0)
+    assert provider.get() == RELEASE
+    assert provider.offline is True
+
+    checker = HandBrakeChecker(metadata=provider)
+    assert "offline" in checker.check_version()
+
+    missing = ReleaseMetadataProvider(http_server.url('/missing.json'))
+    assert missing.get() is None
+    assert HandBrakeChecker(metadata=missing).get_info()['version'] == "1.10.2"
+
+
+def test_failed_fetch_not_retried_during_backoff(http_server):
+    """Test that calls after a failed fetch skip the network until the backoff ends"""
+    provider = ReleaseMetadataProvider(http_server.url('/missing.json'), ttl=0, retry_after=60)
+    assert provider.get() is None
+    assert provider.get() is None
+    assert len(http_server.requests) == 1
+    assert provider.offline is True
+
+    provider.failed_at -= 60
+    serve_release(http_server)
+    provider.url = http_server.url('/release.json')
+    assert provider.get() == RELEASE
+    assert provider.offline is False
+    assert len(http_server.requests) == 2
+
+
+def test_invalid_metadata_rejected(http_server):
+    """Test that metadata without required fields is not used"""
+    url = serve_release(http_server, {"version": "2.0"})
+    provider = ReleaseMetadataProvider(url)
+
+    assert provider.get() is None
+    assert provider.offline is True
+
+
+def test_concurrent_callers_share_one_request(http_server):
+    """Test that callers during a fetch wait for it instead of refetching"""
+    provider = ReleaseMetadataProvider(serve_release(http_server))
+    http_server.delay = 0.3
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [RELEASE] * 8
+    assert len(http_server.requests) == 1
+
+
+def test_checker_uses_metadata(http_server):
+    """Test that the checker reports the fetched release"""
+    checker = HandBrakeChecker(metadata=ReleaseMetadataProvider(serve_release(http_server)))
+
+    assert "1.11.0" in checker.check_version()
+    assert checker.version == "1.11.0"
+    assert checker.get_info()['sha256'] == "a" * 64
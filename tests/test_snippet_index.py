@@ -0,0 +1,166 @@
+"""
+Tests for AicodeX snippet search index
+"""
+
+import os
+import sys
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from snippet_index import SnippetIndex
+
+
+SNIPPETS = [
+    {"name": "Python Function", "code": "def function_name(param):\n    pass"},
+    {"name": "JavaScript Function", "code": "function functionName(param) {\n}"},
+    {"name": "Python Class", "code": "class ClassName:\n    pass"},
+    {"name": "Try-Except Block", "code": "try:\n    pass\nexcept Exception as e:\n    print(e)"},
+]
+
+
+def names(index, ids):
+    """Map snippet ids back to their names"""
+    return [index.get(snippet_id)['name'] for snippet_id in ids]
+
+
+def test_empty_query_returns_all_in_order():
+    """Test that an empty query lists every snippet"""
+    index = SnippetIndex(SNIPPETS)
+    assert names(index, index.search('')) == [s['name'] for s in SNIPPETS]
+
+
+def test_prefix_ranks_above_substring():
+    """Test that name prefix matches come before substring matches"""
+    index = SnippetIndex(SNIPPETS + [{"name": "My Python Helper", "code": ""}])
+    results = names(index, index.search('python'))
+    assert results[-1] == "My Python Helper"
+    assert set(results[:2]) == {"Python Function", "Python Class"}
+
+
+def test_short_query():
+    """Test one and two character queries"""
+    index = SnippetIndex(SNIPPETS)
+    assert names(index, index.search('t'))[0] == "Try-Except Block"
+    assert "JavaScript Function" in names(index, index.search('sc'))
+
+
+def test_code_matches_rank_after_names():
+    """Test that code-only hits follow name hits"""
+    index = SnippetIndex(SNIPPETS)
+    results = names(index, index.search('class'))
+    assert results == ["Python Class"]
+    assert names(index, index.search('except')) == ["Try-Except Block"]
+    assert names(index, index.search('exception')) == ["Try-Except Block"]
+
+
+def test_fuzzy_typo_and_abbreviation():
+    """Test that typos and abbreviations still find snippets"""
+    index = SnippetIndex(SNIPPETS)
+    assert "Python Function" in names(index, index.search('pythn funcion'))
+    assert names(index, index.search('pyfn')) == ["Python Function"]
+
+
+def test_incremental_add_and_remove():
+    """Test that the index updates without a rebuild"""
+    index = SnippetIndex(SNIPPETS)
+    assert index.search('rust') == []
+
+    snippet_id = index.add({"name": "Rust Struct", "code": "struct Name {}"})
+    assert index.search('rust') == [snippet_id]
+    assert index.search('struct') == [snippet_id]
+
+    removed = index.remove(snippet_id)
+    assert removed['name'] == "Rust Struct"
+    assert index.search('rust') == []
+    assert 'rus' not in index.name_postings
+    assert index.remove(snippet_id) is None
+
+
+def test_limit():
+    """Test that results are capped at the limit"""
+    index = SnippetIndex({"name": f"Snippet {i}", "code": ""} for i in range(100))
+    assert len(index.search('snippet', limit=10)) == 10
+    assert len(index) == 100
+
+
+def test_postings_built_on_first_search():
+    """Test that construction defers posting work to the first search"""
+    index = SnippetIndex(SNIPPETS)
+    assert index.name_postings == {}
+    assert len(index.pending) == len(SNIPPETS)
+
+    index.search('python')
+    assert index.pending == {}
+    assert 'pyt' in index.name_postings
+
+
+def test_background_build_keeps_first_search_bounded():
+    """Test that a search during a worker build scans names instead of indexing"""
+    snippets = [{"name": f"Snippet {i}", "code": f"value_{i}"} for i in range(10000)]
+    snippets[5000] = {"name": "Python Function", "code": "def f(): pass"}
+    index = SnippetIndex(snippets)
+    index.SCAN_BUDGET = 100
+    ids = index.start_build()
+    assert index.start_build() is None
+
+    assert index.search("snippet 1", limit=3) == [1, 10, 11]
+    assert index.search("python") == []
+    assert len(index.pending) == 10000
+    assert index.name_postings == {}
+
+    postings = index.build_postings(ids)
+    index.remove(10)
+    added = index.add({"name": "Python Class", "code": "class C: pass"})
+    assert index.adopt_postings(ids, postings) is True
+    assert index.search("python") == [5000, added]
+    assert 10 not in index.search("snippet 10")
+    assert 10 not in set().union(*index.name_postings.values())
+    assert index.adopt_postings(ids, postings) is False
+
+
+def test_sync_keeps_unchanged_ids():
+    """Test that syncing only adds and removes the differences"""
+    index = SnippetIndex(SNIPPETS)
+    index.search('python')
+    kept_ids = index.ids()[:3]
+
+    updated = SNIPPETS[:3] + [{"name": "Go Func", "code": "func name() {}"}]
+    added, removed = index.sync(updated)
+
+    assert len(added) == 1 and len(removed) == 1
+    assert index.ids()[:3] == kept_ids
+    assert names(index, index.search('go func')) == ["Go Func"]
+    assert index.search('try') == []
+
+
+def test_sync_takes_edited_fields_and_order():
+    """Test that a reload picks up edits to other fields and a new order"""
+    index = SnippetIndex([
+        {'name': 'Main Function', 'code': 'def main(): pass', 'trigger': 'mf'},
+        {'name': 'Python Class', 'code': 'class C: pass'},
+    ])
+    main_id, class_id = index.ids()
+
+    added, removed = index.sync([
+        {'name': 'Python Class', 'code': 'class C: pass', 'template': True},
+        {'name': 'Main Function', 'code': 'def main(): pass', 'trigger': 'zz'},
+    ])
+
+    assert added == [] and removed == []
+    assert index.ids() == [class_id, main_id]
+    assert index.get(main_id)['trigger'] == 'zz'
+    assert index.get(class_id)['template'] is True
+    assert [snippet.get('trigger') for _, snippet in index.items()] == [None, 'zz']
+
+
+def test_find_by_name():
+    """Test exact, case-insensitive lookup by snippet name"""
+    index = SnippetIndex([
+        {'name': 'Python Function', 'code': 'def f(): pass'},
+        {'name': 'Python Class', 'code': 'class C: pass'},
+    ])
+
+    assert index.get(index.find('python class'))['code'] == 'class C: pass'
+    assert index.find('Python') is None
@@ -0,0 +1,157 @@
+"""
+Tests for AicodeX snippet insertion
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from snippet_insert import SnippetInserter, clipboard_is_sensitive
+
+
+class FakeRoot:
+    """Clipboard and after() stand-in for a Tk root"""
+
+    def __init__(self, clipboard=None):
+        self.clipboard = clipboard
+        self.jobs = {}
+        self.next_job = 0
+
+    def clipboard_get(self, type='STRING'):
+        if type == 'TARGETS':
+            return getattr(self, 'targets', ('STRING',))
+        if self.clipboard is None:
+            raise tk.TclError("CLIPBOARD selection doesn't exist")
+        return self.clipboard
+
+    def clipboard_clear(self):
+        self.clipboard = None
+
+    def clipboard_append(self, text):
+        self.clipboard = (self.clipboard or '') + text
+
+    def update_idletasks(self):
+        pass
+
+    def after(self, delay, callback):
+        self.next_job += 1
+        self.jobs[self.next_job] = callback
+        return self.next_job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+def test_insert_pastes_once_and_restores_clipboard():
+    """Test that a long snippet is pasted in one keystroke"""
+    root = FakeRoot(clipboard="user text")
+    pasted = []
+    inserter = SnippetInserter(root, lambda: pasted.append(root.clipboard))
+    snippet = "\n".join(f"line {i}" for i in range(200))
+
+    inserter.insert(snippet)
+    assert pasted == [snippet]
+    assert root.clipboard == snippet
+
+    root.run_jobs()
+    assert root.clipboard == "user text"
+
+
+def test_back_to_back_inserts_keep_original_clipboard():
+    """Test that a second paste before the restore keeps the user's text"""
+    root = FakeRoot(clipboard="user text")
+    inserter = SnippetInserter(root, lambda: None)
+
+    inserter.insert("first")
+    inserter.insert("second")
+    assert len(root.jobs) == 1
+    root.run_jobs()
+    assert root.clipboard == "user text"
+
+
+def test_empty_clipboard_restored_empty():
+    """Test that an empty clipboard stays empty after inserting"""
+    root = FakeRoot()
+    inserter = SnippetInserter(root, lambda: None)
+
+    inserter.insert("snippet")
+    root.run_jobs()
+    assert root.clipboard is None
+
+
+def test_paste_failure_restores_immediately():
+    """Test that a failed paste does not leave the snippet on the clipboard"""
+    root = FakeRoot(clipboard="user text")
+
+    def fail():
+        raise OSError("no keyboard")
+
+    inserter = SnippetInserter(root, fail)
+    assert inserter.insert("snippet") is None
+    assert root.clipboard == "user text"
+    assert inserter.latency.count == 0
+
+
+def test_latency_measured_from_start():
+    """Test that latency is measured from the hotkey press against the target"""
+    root = FakeRoot()
+    inserter = SnippetInserter(root, lambda: None, target_ms=50)
+
+    assert inserter.insert("fast") < 50
+    assert inserter.insert("slow", started=time.perf_counter() - 0.1) >= 100
+    assert inserter.latency.count == 2
+    assert inserter.over_target == 1
+    assert "1 over 50 ms target" in inserter.summary()
+
+
+def test_save_before_insert_keeps_user_text():
+    """Test that an explicit save survives a copied selection"""
+    root = FakeRoot(clipboard="user text")
+    inserter = SnippetInserter(root, lambda: None)
+
+    inserter.save()
+    root.clipboard = "copied selection"
+    inserter.insert("formatted selection")
+    root.run_jobs()
+    assert root.clipboard == "user text"
+
+
+def test_selection_moves_cursor_to_tab_stop():
+    """Test that the first tab stop is selected after the paste"""
+    root = FakeRoot(clipboard="user text")
+    moves = []
+    inserter = SnippetInserter(root, lambda: None, send_cursor=lambda back, select: moves.append((back, select)))
+
+    inserter.insert("def name(args):", selection=(4, 8))
+    assert moves == [(11, 4)]
+    assert inserter.user_clipboard() == "user text"
+
+    inserter.insert("x" * 1000, selection=(0, 1))
+    assert moves == [(11, 4)]
+
+
+class EmptyClipboard:
+    """Root whose clipboard holds nothing, not even targets"""
+
+    def clipboard_get(self, type='STRING'):
+        raise tk.TclError("CLIPBOARD selection doesn't exist")
+
+
+def test_clipboard_marked_sensitive_by_password_manager(monkeypatch):
+    """Test that the password manager hint marks clipboard content as secret"""
+    monkeypatch.setattr('platform.system', lambda: 'Linux')
+    root = FakeRoot('hunter2')
+    assert not clipboard_is_sensitive(root)
+    root.targets = ('STRING', 'UTF8_STRING', 'x-kde-passwordManagerHint')
+    assert clipboard_is_sensitive(root)
+    assert not clipboard_is_sensitive(EmptyClipboard())
+
@@ -0,0 +1,177 @@
+"""
+Tests for AicodeX SQLite snippet store
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from snippet_store import SnippetStore, SnippetIds, fts5_available, match_expression
+
+pytestmark = pytest.mark.skipif(not fts5_available(), reason="SQLite without FTS5")
+
+SNIPPETS = [
+    {"name": "Python Function", "code": "def function_name(param):\n    pass"},
+    {"name": "JavaScript Function", "code": "function functionName(param) {}"},
+    {"name": "Python Class", "code": "class ClassName:\n    pass", "trigger": "cls"},
+    {"name": "Try-Except Block", "code": "try:\n    pass\nexcept Exception as e:\n    print(e)",
+     "hotkey": "ctrl+alt+t", "language": "python"},
+]
+
+
+@pytest.fixture
+def store():
+    """An in-memory store filled with the sample snippets"""
+    store = SnippetStore(':memory:')
+    store.import_snippets(SNIPPETS)
+    yield store
+    store.close()
+
+
+def test_match_expression_quotes_words():
+    """Test that query words become quoted prefix terms"""
+    assert match_expression('py "fn') == '"py"* """fn"*'
+    assert match_expression('   ') == ''
+
+
+def test_import_is_idempotent(store):
+    """Test that importing the same snippets again adds nothing"""
+    assert len(store) == 4
+    assert store.import_snippets(SNIPPETS + [{"name": "New", "code": "x"}]) == 1
+    assert len(store) == 5
+
+
+def test_get_round_trips_fields(store):
+    """Test that stored snippets keep their optional and extra fields"""
+    snippet = store.get(store.find("try-except block"))
+    assert snippet['hotkey'] == "ctrl+alt+t"
+    assert snippet['language'] == "python"
+    assert snippet['code'].startswith("try:")
+    assert store.get(12345) is None
+
+
+def test_search_matches_name_and_code_prefixes(store):
+    """Test that every query word must match a word prefix"""
+    names = lambda ids: {store.get(i)['name'] for i in ids}
+    assert names(store.search("func")) == {"Python Function", "JavaScript Function"}
+    assert names(store.search("py func")) == {"Python Function"}
+    assert names(store.search("exception")) == {"Try-Except Block"}
+    assert store.search("nomatch") == []
+
+
+def test_search_ranks_by_usage(store):
+    """Test that more used and more recently used snippets rank first"""
+    js = store.find("JavaScript Function")
+    py = store.find("Python Function")
+    store.record_use(js, when=100)
+
+    assert store.search("function") == [js, py]
+    assert store.ids()[0] == js
+
+    store.record_use(py, when=200)
+    assert store.search("function") == [py, js]
+    assert store.usage(py) == (1, 200)
+
+
+def test_name_hits_rank_above_code_hits(store):
+    """Test that relevance prefers name matches when usage is equal"""
+    cls = store.find("Python Class")
+    store.add({"name": "Dataclass Helper", "code": "class Point: pass"})
+    assert store.search("class")[0] == cls
+
+
+def test_update_and_remove_keep_search_in_sync(store):
+    """Test that edits and deletions update the full-text index"""
+    snippet_id = store.find("Python Class")
+    store.update(snippet_id, {"name": "Python Dataclass", "code": "@dataclass"})
+    assert store.search("dataclass") == [snippet_id]
+    assert store.search("classname") == []
+
+    assert store.remove(snippet_id)['name'] == "Python Dataclass"
+    assert store.search("dataclass") == []
+    assert store.remove(snippet_id) is None
+
+
+def test_ids_are_paged(store):
+    """Test that the lazy id sequence only fetches the requested page"""
+    store.import_snippets([{"name": f"Snippet {i}", "code": str(i)} for i in range(1000)])
+    ids = store.ids()
+
+    assert isinstance(ids, SnippetIds)
+    assert len(ids) == 1004
+    assert len(ids.page) == 0
+    window = ids[500:520]
+    assert len(window) == 20
+    assert len(ids.page) == SnippetIds.PAGE_SIZE
+    assert ids[-1] == list(ids)[-1]
+    with pytest.raises(IndexError):
+        ids[1004]
+
+
+def test_ids_refetch_after_changes(store):
+    """Test that a cached length and page are dropped when rows move or change"""
+    ids = store.ids()
+    assert list(ids) == [1, 2, 3, 4]
+
+    store.record_use(3)
+    assert ids[0] == 3
+    store.add({"name": "Extra", "code": "x"})
+    assert len(ids) == 5
+    store.remove(3)
+    assert list(ids) == [1, 2, 4, 5]
+
+
+def test_hotkeys_come_from_rows(store):
+    """Test that snippet hotkeys are read from the store"""
+    assert store.hotkeys() == [("Try-Except Block", "ctrl+alt+t")]
+    snippet_id = store.find("Python Class")
+    store.update(snippet_id, {"name": "Python Class", "code": "class C: pass", "hotkey": "ctrl+alt+c"})
+    assert ("Python Class", "ctrl+alt+c") in store.hotkeys()
+
+
+def test_first_import_retried_until_it_succeeds(tmp_path):
+    """Test that a failed first import is tried again on the next open"""
+    path = str(tmp_path / "snippets.db")
+    store = SnippetStore(path)
+    with pytest.raises(AttributeError):
+        store.import_initial([None])
+    store.close()
+
+    reopened = SnippetStore(path)
+    assert reopened.created is False
+    assert reopened.import_pending() is True
+    assert reopened.import_initial(SNIPPETS) == 4
+    assert reopened.import_initial(SNIPPETS) is None
+    reopened.close()
+
+    again = SnippetStore(path)
+    assert again.import_pending() is False
+    assert len(again) == 4
+    again.close()
+
+
+def test_items_leave_out_code(store):
+    """Test that trigger items carry names and triggers but no code"""
+    items = dict(store.items())
+    snippet = items[store.find("Python Class")]
+    assert snippet == {"name": "Python Class", "trigger": "cls"}
+
+
+def test_store_persists(tmp_path):
+    """Test that snippets and usage survive reopening the database"""
+    path = str(tmp_path / "snippets.db")
+    store = SnippetStore(path)
+    assert store.created is True
+    store.import_snippets(SNIPPETS)
+    store.record_use(store.find("Python Class"))
+    store.close()
+
+    reopened = SnippetStore(path)
+    assert reopened.created is False
+    assert len(reopened) == 4
+    assert reopened.usage(reopened.find("Python Class"))[0] == 1
+    reopened.close()
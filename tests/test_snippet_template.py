@@ -0,0 +1,88 @@
+"""
+Tests for AicodeX snippet templates
+"""
+
+import os
+import sys
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from snippet_template import (
+    Template, compile_template, expand_snippet, filename_from_title, standard_variables
+)
+
+
+def selected(expansion):
+    """Return the text of each tab stop in order"""
+    return [expansion.text[start:end] for start, end in expansion.stops]
+
+
+def test_tab_stops_ordered_with_final_cursor_last():
+    """Test numbered, named and final tab stops with their defaults"""
+    template = Template("def ${2:name}(${1:args}):\n    ${0:pass}  # ${owner:me}")
+    expansion = template.render()
+
+    assert expansion.text == "def name(args):\n    pass  # me"
+    assert selected(expansion) == ["args", "name", "me", "pass"]
+
+
+def test_values_fill_placeholders_and_mirror():
+    """Test that given values replace defaults in every occurrence"""
+    template = Template("class ${1:Name}:\n    def __repr__(self):\n        return '$1(${field})'")
+    expansion = template.render({'1': 'Point', 'field': 'x'})
+
+    assert expansion.text == "class Point:\n    def __repr__(self):\n        return 'Point(x)'"
+    assert selected(expansion) == ["Point", "x"]
+
+
+def test_variables_resolved_lazily_with_defaults():
+    """Test that only used variables are resolved and empty ones use defaults"""
+    calls = []
+    variables = standard_variables(
+        clipboard=lambda: calls.append('clipboard') or "copied",
+        filename=lambda: calls.append('filename') or None
+    )
+    expansion = Template("# ${FILENAME:untitled} $YEAR\n$CLIPBOARD").render(variables=variables)
+    assert expansion.text == f"# untitled {time.strftime('%Y')}\ncopied"
+    assert expansion.stops == ()
+    assert sorted(calls) == ['clipboard', 'filename']
+
+    calls.clear()
+    Template("$DATE").render(variables=variables)
+    assert calls == []
+
+
+def test_escapes_and_plain_dollars_kept():
+    """Test literal dollars, escaped braces and text that is not a field"""
+    template = Template("cost: $$5, ${1:a\\}b} and $ alone, ${not closed")
+    assert template.render().text == "cost: $5, a}b and $ alone, ${not closed"
+    assert Template("no fields here").static
+
+
+def test_compiled_once_and_snippets_opt_in():
+    """Test that templates are cached by source and only marked snippets expand"""
+    source = "print(${1:value})"
+    assert compile_template(source) is compile_template(source)
+
+    assert expand_snippet({'code': source}).text == source
+    assert expand_snippet({'code': source, 'template': True}).text == "print(value)"
+
+
+def test_large_template_renders_quickly():
+    """Test that expanding a large compiled template takes no more than a few milliseconds"""
+    source = "".join(f"line {i} = ${{{i % 50}:value{i}}}  # $DATE\n" for i in range(400))
+    template = compile_template(source)
+    variables = standard_variables()
+    started = time.perf_counter()
+    for _ in range(100):
+        template.render(variables=variables)
+    assert (time.perf_counter() - started) / 100 < 0.005
+
+
+def test_filename_from_title():
+    """Test that file names are found in editor window titles"""
+    assert filename_from_title("● overlay.py - AicodeX - Visual Studio Code") == "overlay.py"
+    assert filename_from_title("Untitled - Notepad") is None
+    assert filename_from_title(None) is None
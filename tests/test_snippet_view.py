@@ -0,0 +1,101 @@
+"""
+Tests for AicodeX virtualized snippet list
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import stubs
+from ui_scheduler import UIScheduler
+
+
+class FakeRoot:
+    """after() stand-in that runs jobs on demand"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, delay, callback):
+        self.jobs.append(callback)
+        return len(self.jobs)
+
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, []
+        for callback in jobs:
+            callback()
+
+
+@pytest.fixture
+def snippet_list(monkeypatch):
+    """A list of 1000 rows on stub Tk widgets, counting its renders"""
+    for name, module in stubs.tk_modules().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, 'snippet_view', raising=False)
+    snippet_view = importlib.import_module('snippet_view')
+
+    root = FakeRoot()
+    ui = UIScheduler(root, clock=lambda: 0.0)
+    view = snippet_view.VirtualSnippetList(stubs.Tk(), label=str, load_body=str, ui=ui)
+    view.visible_rows = 10
+    view.set_items(list(range(1000)))
+    assert view.listbox.rows[0] == '0'
+
+    renders = []
+    render = view.render
+    view.render = lambda: (renders.append(view.offset), render())
+    view.root, view.renders = root, renders
+    yield view
+    sys.modules.pop('snippet_view', None)
+
+
+def test_wheel_burst_renders_once(snippet_list):
+    """Test that a burst of wheel events moves by every step but renders once"""
+    wheel = snippet_list.listbox.bindings['<MouseWheel>']
+    for _ in range(20):
+        assert wheel(types.SimpleNamespace(delta=-120)) == 'break'
+
+    assert snippet_list.renders == []
+    snippet_list.root.run_jobs()
+    assert snippet_list.renders == [60]
+    assert snippet_list.listbox.rows[0] == '60'
+
+
+def test_scrollbar_and_resize_bursts_render_once(snippet_list):
+    """Test that scrollbar drags and resizes within a frame render once"""
+    drag = snippet_list.scrollbar.options['command']
+    for fraction in (0.1, 0.2, 0.3, 0.5):
+        drag('moveto', str(fraction))
+    resize = snippet_list.listbox.bindings['<Configure>']
+    for height in (200, 250, 320):
+        resize(types.SimpleNamespace(height=height))
+
+    snippet_list.root.run_jobs()
+    assert snippet_list.renders == [500]
+    assert snippet_list.visible_rows == 20
+    assert len(snippet_list.listbox.rows) == 20
+
+
+def test_activate_runs_through_scheduler(snippet_list):
+    """Test that double-click and Return activate once per frame"""
+    snippet_view = sys.modules['snippet_view']
+    activated = []
+    view = snippet_view.VirtualSnippetList(stubs.Tk(), label=str, load_body=str, ui=snippet_list.ui,
+                                           key='history_list', on_activate=lambda: activated.append(True))
+    assert view.listbox.bindings['<Return>'] is view.listbox.bindings['<Double-Button-1>']
+
+    activate = view.listbox.bindings['<Return>']
+    activate(types.SimpleNamespace())
+    assert activated == [True]
+    activate(types.SimpleNamespace())
+    activate(types.SimpleNamespace())
+    assert activated == [True]
+    snippet_list.root.run_jobs()
+    assert activated == [True, True]
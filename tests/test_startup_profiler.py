@@ -0,0 +1,56 @@
+"""
+Tests for AicodeX startup profiler
+"""
+
+import os
+import sys
+import time
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from startup_profiler import StartupProfiler
+
+
+def test_phase_records_time():
+    """Test that a phase records elapsed milliseconds"""
+    profiler = StartupProfiler()
+    with profiler.phase("Config.load"):
+        time.sleep(0.01)
+    assert profiler.phases["Config.load"] >= 10
+
+
+def test_record_accumulates():
+    """Test that repeated phases accumulate"""
+    profiler = StartupProfiler()
+    profiler.record("imports", 0.002)
+    profiler.record("imports", 0.003)
+    assert profiler.phases["imports"] == pytest.approx(5.0)
+
+
+def test_budget():
+    """Test budget checks against the finished total"""
+    started = time.perf_counter()
+    profiler = StartupProfiler(budget_ms=100, started=started)
+    assert not profiler.over_budget()
+
+    profiler.finish(started + 0.05)
+    assert not profiler.over_budget()
+    assert "within budget" in profiler.report()
+
+    profiler.finish(started + 0.2)
+    assert profiler.over_budget()
+    assert "OVER BUDGET" in profiler.report()
+
+
+def test_report_lists_phases():
+    """Test that the report names every phase"""
+    profiler = StartupProfiler()
+    profiler.record("imports", 0.01)
+    profiler.record("widget creation", 0.02)
+    profiler.finish()
+    report = profiler.report()
+    assert "imports" in report
+    assert "widget creation" in report
+    assert "first frame" in report
@@ -0,0 +1,99 @@
+"""
+Tests for AicodeX snippet suggestions
+"""
+
+import os
+import sys
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from suggestions import SuggestionEngine, TriggerTrie, snippet_triggers
+
+SNIPPETS = [
+    (1, {"name": "Python Function", "code": "def f(): pass"}),
+    (2, {"name": "Python Class", "code": "class C: pass"}),
+    (3, {"name": "Try-Except Block", "code": "try: pass", "trigger": "tryx"}),
+]
+
+
+def type_keys(engine, keys):
+    """Feed a sequence of key names and return the final matches"""
+    for key in keys:
+        engine.feed(key)
+    return engine.matches
+
+
+def test_snippet_triggers():
+    """Test that explicit triggers win over name words"""
+    assert snippet_triggers(SNIPPETS[0][1]) == ['python', 'function']
+    assert snippet_triggers(SNIPPETS[2][1]) == ['tryx']
+
+
+def test_prefix_matching():
+    """Test that matches narrow as the word is typed"""
+    engine = SuggestionEngine(TriggerTrie.from_snippets(SNIPPETS))
+
+    assert type_keys(engine, 'p') == ()
+    assert type_keys(engine, 'y') == (1, 2)
+    assert type_keys(engine, 'thon') == (1, 2)
+    assert engine.token == 'python'
+    assert type_keys(engine, 'x') == ()
+
+
+def test_backspace_steps_back():
+    """Test that backspace restores the previous matches"""
+    engine = SuggestionEngine(TriggerTrie.from_snippets(SNIPPETS))
+
+    assert type_keys(engine, ['c', 'l', 'x']) == ()
+    assert type_keys(engine, ['backspace']) == (2,)
+    assert type_keys(engine, ['backspace'] * 5) == ()
+    assert type_keys(engine, 'tr') == (3,)
+
+
+def test_separators_and_shortcuts_reset():
+    """Test that non-word keys and shortcut modifiers end the word"""
+    engine = SuggestionEngine(TriggerTrie.from_snippets(SNIPPETS))
+
+    type_keys(engine, 'cla')
+    assert engine.feed('space') is True
+    assert engine.matches == () and engine.token == ''
+
+    type_keys(engine, 'cla')
+    engine.feed('c', {'ctrl'})
+    assert engine.token == ''
+    type_keys(engine, 'cl')
+    engine.feed('a', {'shift'})
+    assert engine.matches == (2,)
+
+
+def test_feed_reports_changes_only():
+    """Test that feed returns True only when suggestions change"""
+    engine = SuggestionEngine(TriggerTrie.from_snippets(SNIPPETS))
+
+    assert engine.feed('p') is False
+    assert engine.feed('y') is True
+    assert engine.feed('t') is False
+
+
+def test_max_matches_per_prefix():
+    """Test that each prefix keeps a bounded list of matches"""
+    trie = TriggerTrie(max_matches=3)
+    for i in range(10):
+        trie.add(f"log{i}", i)
+    engine = SuggestionEngine(trie)
+    assert type_keys(engine, 'log') == (0, 1, 2)
+
+
+def test_keystroke_cost():
+    """Test that a keystroke costs microseconds on a large library"""
+    items = [(i, {"name": f"snippet {i} helper{i % 100}"}) for i in range(20000)]
+    engine = SuggestionEngine(TriggerTrie.from_snippets(items))
+    keys = list('helper42') + ['backspace', '3', 'space'] + list('snip') + ['space']
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        type_keys(engine, keys)
+    per_key = (time.perf_counter() - started) / (1000 * len(keys))
+    assert per_key < 50e-6
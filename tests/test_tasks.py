@@ -0,0 +1,130 @@
+"""
+Tests for AicodeX background task executor
+"""
+
+import os
+import sys
+import threading
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tasks import Task, TaskExecutor
+
+
+@pytest.fixture
+def executor():
+    """Executor drained manually instead of from a Tk loop"""
+    executor = TaskExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def finish(task):
+    """Wait for a task's worker and apply its events"""
+    task.future.result(timeout=5)
+    task.executor.drain()
+
+
+def test_results_delivered_on_drain(executor):
+    """Test that completion callbacks only run when drained"""
+    results = []
+    task = executor.submit('check', lambda task, x: x * 2, 21, on_done=results.append)
+
+    task.future.result(timeout=5)
+    assert results == []
+    executor.drain()
+    assert results == [42]
+    assert task.state == Task.DONE
+    assert executor.running() == []
+
+
+def test_per_action_limit(executor):
+    """Test that a busy action refuses further submits"""
+    release = threading.Event()
+    first = executor.submit('download', lambda task: release.wait(5))
+
+    assert executor.submit('download', lambda task: None) is None
+    other = executor.submit('format', lambda task: 'ok')
+    assert other is not None
+
+    release.set()
+    finish(first)
+    finish(other)
+    assert executor.submit('download', lambda task: None, limit=1) is not None
+
+
+def test_progress_and_listeners(executor):
+    """Test that progress reports reach listeners on drain"""
+    seen = []
+    executor.add_listener(lambda task: seen.append((task.state, task.progress, task.message)))
+    release = threading.Event()
+
+    def work(task):
+        task.report(0.25)
+        task.report(0.5, "halfway")
+        release.wait(5)
+        return 'done'
+
+    task = executor.submit('download', work)
+    while task.progress != 0.5:
+        executor.drain()
+    assert task.message == "halfway"
+    assert task.state == Task.RUNNING
+
+    release.set()
+    finish(task)
+    assert seen[-1] == (Task.DONE, 0.5, "halfway")
+
+
+def test_cancel_running_task(executor):
+    """Test that a task checking for cancellation stops early"""
+    started = threading.Event()
+    interrupted = []
+    results = []
+
+    def work(task):
+        task.on_cancel(lambda: interrupted.append(True))
+        started.set()
+        while True:
+            task.check()
+
+    task = executor.submit('download', work, on_done=results.append)
+    started.wait(5)
+    executor.cancel(task)
+    finish(task)
+
+    assert task.state == Task.CANCELLED
+    assert interrupted == [True]
+    assert results == []
+
+
+def test_cancel_pending_task():
+    """Test that a task cancelled before it starts is finished at once"""
+    executor = TaskExecutor(max_workers=1)
+    release = threading.Event()
+    busy = executor.submit('download', lambda task: release.wait(5))
+    queued = executor.submit('format', lambda task: 'never')
+
+    executor.cancel(queued)
+    assert queued.state == Task.CANCELLED
+    assert executor.running() == [busy]
+
+    release.set()
+    finish(busy)
+    executor.shutdown()
+
+
+def test_failure_calls_on_error(executor):
+    """Test that exceptions are reported through on_error"""
+    errors = []
+
+    def work(task):
+        raise ValueError("no network")
+
+    task = executor.submit('check', work, on_error=errors.append)
+    finish(task)
+
+    assert task.state == Task.FAILED
+    assert str(errors[0]) == "no network"
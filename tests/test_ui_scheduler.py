@@ -0,0 +1,102 @@
+"""
+Tests for AicodeX UI update scheduler
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui_scheduler import UIScheduler
+
+
+class FakeRoot:
+    """after() stand-in that runs jobs on demand"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, delay, callback):
+        self.jobs.append(callback)
+        return len(self.jobs)
+
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, []
+        for callback in jobs:
+            callback()
+
+
+class Clock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler():
+    root, clock = FakeRoot(), Clock()
+    return UIScheduler(root, frame_ms=16, clock=clock), root, clock
+
+
+def test_first_update_applied_immediately():
+    """Test that an isolated update runs without waiting for a frame"""
+    scheduler, root, clock = make_scheduler()
+    calls = []
+
+    scheduler.schedule('opacity', calls.append, 0.9)
+    assert calls == [0.9]
+    assert root.jobs == []
+
+
+def test_burst_coalesced_to_latest():
+    """Test that a burst within one frame applies only the latest value"""
+    scheduler, root, clock = make_scheduler()
+    calls = []
+
+    for value in range(100):
+        scheduler.schedule('opacity', calls.append, value)
+    assert calls == [0]
+    assert len(root.jobs) == 1
+
+    clock.now = 0.016
+    root.run_jobs()
+    assert calls == [0, 99]
+    assert scheduler.stats() == {'applied': 2, 'dropped': 98}
+
+
+def test_keys_independent():
+    """Test that different keys do not throttle each other"""
+    scheduler, root, clock = make_scheduler()
+    calls = []
+
+    scheduler.schedule('opacity', calls.append, 'opacity')
+    scheduler.schedule('search', calls.append, 'search')
+    assert calls == ['opacity', 'search']
+
+
+def test_update_after_quiet_frame_runs_immediately():
+    """Test that throttling only applies within a frame"""
+    scheduler, root, clock = make_scheduler()
+    calls = []
+
+    scheduler.schedule('search', calls.append, 'a')
+    clock.now = 0.5
+    scheduler.schedule('search', calls.append, 'ab')
+    assert calls == ['a', 'ab']
+
+
+def test_wrap_passes_widget_arguments():
+    """Test that wrapped callbacks receive the widget's arguments"""
+    scheduler, root, clock = make_scheduler()
+    calls = []
+
+    callback = scheduler.wrap('opacity', lambda value: calls.append(float(value)))
+    callback('75.0')
+    callback('80.0')
+    clock.now = 0.02
+    root.run_jobs()
+    assert calls == [75.0, 80.0]